@@ -0,0 +1,174 @@
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """Byte-oriented cache storage with tag based invalidation."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        ...
+
+
+class NullCache(CacheBackend):
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        pass
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, set()):
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCache(CacheBackend):
+    """Cache on any client exposing the redis.asyncio get/set/sadd/smembers/delete API."""
+
+    def __init__(self, client, prefix: str = "ems:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl)
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            await self.client.sadd(tag_key, key)
+            await self.client.expire(tag_key, ttl)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = await self.client.smembers(tag_key)
+            if keys:
+                await self.client.delete(*[self.prefix + (k.decode() if isinstance(k, bytes) else k) for k in keys])
+            await self.client.delete(tag_key)
+
+
+class ResponseCache:
+    """Caches pre-serialized response bodies and collapses concurrent misses.
+
+    Only one task per key recomputes a missing entry and every caller awaits
+    it through a shield, so a miss on a hot key costs a single query and a
+    caller that is cancelled does not fail the others.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[bytes]],
+        tags: Iterable[str] = (),
+        ttl: Optional[int] = None
+    ) -> bytes:
+        value = await self.backend.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute, tuple(tags), ttl or self.ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[bytes]], tags: Tuple[str, ...], ttl: int) -> bytes:
+        value = await compute()
+        await self.backend.set(key, value, ttl, tags)
+        return value
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark a failure as retrieved even when every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def invalidate(self, *tags: str) -> None:
+        await self.backend.invalidate_tags(tags)
+
+
+def pack(body: bytes, headers: Optional[Dict[str, str]] = None) -> bytes:
+    """Store response headers alongside the body in a single cache value."""
+    return json.dumps(headers or {}).encode() + b"\n" + body
+
+
+def unpack(value: bytes) -> Tuple[bytes, Dict[str, str]]:
+    header_line, _, body = value.partition(b"\n")
+    return body, json.loads(header_line)
+
+
+def _build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        import redis.asyncio as redis
+        return RedisCache(redis.from_url(settings.REDIS_URL))
+    if settings.CACHE_BACKEND == "none":
+        return NullCache()
+    return MemoryCache(settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(_build_backend(), settings.CACHE_TTL_SECONDS)
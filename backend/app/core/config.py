@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
 
@@ -20,9 +21,116 @@ class Settings:
     SQLALCHEMY_DATABASE_URL: str = (
         f"postgresql+psycopg2://{DB_USER}:{quote_plus(DB_PASSWORD)}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    SQLALCHEMY_ASYNC_DATABASE_URL: str = (
+        f"postgresql+asyncpg://{DB_USER}:{quote_plus(DB_PASSWORD)}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    )
+
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    # /health reports unhealthy once this share of the pool is checked out
+    DB_POOL_SATURATION_THRESHOLD: float = float(os.getenv("DB_POOL_SATURATION_THRESHOLD", "0.9"))
+    DB_HEALTH_CHECK_TIMEOUT: float = float(os.getenv("DB_HEALTH_CHECK_TIMEOUT", "2"))
+
+    # Comma-separated asyncpg URLs of read replicas for the GET /events* endpoints
+    DB_REPLICA_URLS: list = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+    DB_REPLICA_EJECT_SECONDS: int = int(os.getenv("DB_REPLICA_EJECT_SECONDS", "30"))
+    # A replica that cannot hand out a connection within this long is ejected
+    DB_REPLICA_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("DB_REPLICA_CONNECT_TIMEOUT_SECONDS", "1"))
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    # Response cache for hot event reads: "memory", "redis" or "none"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "30"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Serve cached list endpoints from column tuples encoded directly to JSON
+    FAST_JSON_LISTS: bool = os.getenv("FAST_JSON_LISTS", "true").lower() == "true"
+
+    # Poster uploads larger than this are rejected while streaming to disk
+    POSTER_MAX_BYTES: int = int(os.getenv("POSTER_MAX_BYTES", str(10 * 1024 * 1024)))
+    # Room for the form fields sent alongside the poster
+    UPLOAD_FORM_OVERHEAD_BYTES: int = int(os.getenv("UPLOAD_FORM_OVERHEAD_BYTES", str(256 * 1024)))
+
+    # Responsive poster widths generated after upload (requires Pillow)
+    POSTER_VARIANT_WIDTHS: tuple = tuple(
+        int(w) for w in os.getenv("POSTER_VARIANT_WIDTHS", "320,640,1280").split(",") if w.strip()
+    )
+    POSTER_WORKERS: int = int(os.getenv("POSTER_WORKERS", "2"))
+
+    # Poster storage: "local" (uploads/event_posters) or "s3"
+    POSTER_STORAGE: str = os.getenv("POSTER_STORAGE", "local")
+    POSTER_S3_BUCKET: str = os.getenv("POSTER_S3_BUCKET", "ems-posters")
+    POSTER_S3_ENDPOINT_URL: Optional[str] = os.getenv("POSTER_S3_ENDPOINT_URL") or None
+    POSTER_S3_PUBLIC_URL: str = os.getenv("POSTER_S3_PUBLIC_URL", "")
+    # Unreferenced posters are deleted this long after their last event let go of them
+    POSTER_GC_GRACE_SECONDS: int = int(os.getenv("POSTER_GC_GRACE_SECONDS", "3600"))
+    POSTER_GC_INTERVAL_SECONDS: int = int(os.getenv("POSTER_GC_INTERVAL_SECONDS", "300"))
+    POSTER_GC_BATCH_SIZE: int = int(os.getenv("POSTER_GC_BATCH_SIZE", "100"))
+
+    # Static serving of /uploads and /static; with a prefix set, nginx serves the
+    # bytes through X-Accel-Redirect to an internal location
+    STATIC_MAX_AGE_SECONDS: int = int(os.getenv("STATIC_MAX_AGE_SECONDS", "3600"))
+    UPLOADS_ACCEL_REDIRECT_PREFIX: Optional[str] = os.getenv("UPLOADS_ACCEL_REDIRECT_PREFIX") or None
+    FRONTEND_STATIC_DIR: str = os.getenv("FRONTEND_STATIC_DIR", "../frontend/static")
+
+    # Bulk event import: rows per validated COPY batch, and how many row errors are reported back
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+    # The stats refresher checks the admin dashboard's event_stats view every interval
+    # and refreshes it once it is older than the staleness limit
+    ADMIN_STATS_MAX_STALENESS_SECONDS: int = int(os.getenv("ADMIN_STATS_MAX_STALENESS_SECONDS", "60"))
+    ADMIN_STATS_REFRESH_INTERVAL_SECONDS: int = int(os.getenv("ADMIN_STATS_REFRESH_INTERVAL_SECONDS", "30"))
+
+    # count=auto switches to an exact count when the planner estimates at most this many rows
+    EXACT_COUNT_THRESHOLD: int = int(os.getenv("EXACT_COUNT_THRESHOLD", "10000"))
 
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    BOOKING_HOLD_MINUTES: int = int(os.getenv("BOOKING_HOLD_MINUTES", "10"))
+    HOLD_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", "30"))
+    HOLD_SWEEP_BATCH_SIZE: int = int(os.getenv("HOLD_SWEEP_BATCH_SIZE", "1000"))
+
+    # Responses are replayed for this long; a claim whose change never committed is taken over after the lock time
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_LOCK_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+    # Retry-After sent with the 409 for a duplicate of a request still in flight
+    IDEMPOTENCY_RETRY_AFTER_SECONDS: int = int(os.getenv("IDEMPOTENCY_RETRY_AFTER_SECONDS", "1"))
+    # Expired keys are deleted in batches of this size every interval
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = int(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "300"))
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = int(os.getenv("IDEMPOTENCY_PURGE_BATCH_SIZE", "1000"))
+
+    # Booking notifications, delivered from the outbox by python -m app.core.notification_dispatcher
+    NOTIFICATION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+    NOTIFICATION_CONCURRENCY: int = int(os.getenv("NOTIFICATION_CONCURRENCY", "10"))
+    NOTIFICATION_SEND_TIMEOUT_SECONDS: float = float(os.getenv("NOTIFICATION_SEND_TIMEOUT_SECONDS", "30"))
+    # A claimed message is retried after this long if its dispatcher died mid-send
+    NOTIFICATION_LEASE_SECONDS: int = int(os.getenv("NOTIFICATION_LEASE_SECONDS", "300"))
+    NOTIFICATION_MAX_ATTEMPTS: int = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "8"))
+    NOTIFICATION_RETRY_BASE_SECONDS: int = int(os.getenv("NOTIFICATION_RETRY_BASE_SECONDS", "30"))
+    NOTIFICATION_RETRY_MAX_SECONDS: int = int(os.getenv("NOTIFICATION_RETRY_MAX_SECONDS", "3600"))
+    NOTIFICATION_POLL_SECONDS: float = float(os.getenv("NOTIFICATION_POLL_SECONDS", "5"))
+    NOTIFICATION_RETENTION_DAYS: int = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "7"))
+
+    # "smtp" or "fake"; the fake sender only logs and records messages
+    EMAIL_BACKEND: str = os.getenv("EMAIL_BACKEND", "fake")
+    EMAIL_FROM: str = os.getenv("EMAIL_FROM", "no-reply@ems.local")
+    SMTP_HOST: str = os.getenv("SMTP_HOST", "localhost")
+    SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
+    SMTP_USERNAME: Optional[str] = os.getenv("SMTP_USERNAME")
+    SMTP_PASSWORD: Optional[str] = os.getenv("SMTP_PASSWORD")
+    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+
+    # "cloud" (WhatsApp Cloud API) or "fake"
+    WHATSAPP_BACKEND: str = os.getenv("WHATSAPP_BACKEND", "fake")
+    WHATSAPP_API_URL: str = os.getenv("WHATSAPP_API_URL", "https://graph.facebook.com/v19.0")
+    WHATSAPP_PHONE_NUMBER_ID: Optional[str] = os.getenv("WHATSAPP_PHONE_NUMBER_ID")
+    WHATSAPP_ACCESS_TOKEN: Optional[str] = os.getenv("WHATSAPP_ACCESS_TOKEN")
+
 settings = Settings()
\ No newline at end of file
@@ -1,14 +1,26 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
 from app.core.config import settings 
+from app.core.pool_metrics import (
+    InstrumentedQueuePool, InstrumentedAsyncQueuePool, engine_metrics, async_engine_metrics
+)
+
+POOL_OPTIONS = {
+    "echo": settings.DB_ECHO,
+    "pool_pre_ping": True,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+}
 
-# PostgreSQL engine - remove echo=True for production
+# PostgreSQL engine
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+    poolclass=InstrumentedQueuePool,
+    **POOL_OPTIONS,
     connect_args={
         "options": "-c timezone=utc"
     }
@@ -16,6 +28,19 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the request path; the sync engine above stays for scripts
+# such as reset_db.py and the background workers
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    **POOL_OPTIONS,
+    connect_args={
+        "server_settings": {"timezone": "utc"}
+    }
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -25,6 +50,23 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pool_status() -> dict:
+    return {
+        "sync": engine_metrics.snapshot(engine.pool, settings.DB_MAX_OVERFLOW),
+        "async": async_engine_metrics.snapshot(async_engine.sync_engine.pool, settings.DB_MAX_OVERFLOW),
+    }
+
+async def ping_database() -> float:
+    """Run a trivial query on the request-path pool and return its latency in ms."""
+    start = time.perf_counter()
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return (time.perf_counter() - start) * 1000
+
 def create_tables():
     import app.models  
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Bulk event import and export in CSV or NDJSON.
+
+Rows are streamed, validated against EventCreate and loaded in batches via
+PostgreSQL COPY. Bad rows are reported and skipped without aborting the
+file. From the command line:
+
+    python -m app.core.event_import import events.csv
+    python -m app.core.event_import export events.ndjson --format ndjson
+"""
+import argparse
+import asyncio
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud import event_crud, list_version_crud
+from app.schemas.event_schema import DataFormat, EventCreate, EventFilter, EventImportError, EventImportReport
+from app.utils.json_encoding import dumps
+
+EXPORT_HEADER = ("id", *event_crud.IMPORT_COLUMNS)
+
+# (row number, parsed row, parse error)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    header = None
+    number = 0
+    record = ""
+    async for line in _lines(chunks):
+        record += line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        number += 1
+        if len(values) != len(header):
+            yield number, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells fall back to the schema defaults
+        yield number, {k: v for k, v in zip(header, values) if v != ""}, None
+    if record.strip():
+        yield number + 1, None, "unterminated quoted field"
+
+
+async def _ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    number = 0
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "expected a JSON object"
+            continue
+        yield number, row, None
+
+
+class _Report:
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[EventImportError] = []
+
+    def fail(self, row: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(EventImportError(row=row, errors=messages))
+
+    def result(self) -> EventImportReport:
+        return EventImportReport(imported=self.imported, failed=self.failed, errors=self.errors)
+
+
+async def _load_batch(db: AsyncSession, batch: List[Tuple[int, EventCreate]], report: _Report) -> None:
+    known = await event_crud.get_existing_user_ids(db, {event.organizer_id for _, event in batch})
+    valid = []
+    for number, event in batch:
+        if event.organizer_id in known:
+            valid.append((number, event))
+        else:
+            report.fail(number, [f"organizer_id: user {event.organizer_id} does not exist"])
+    try:
+        await event_crud.copy_events(db, [event for _, event in valid])
+        await db.commit()
+    except Exception as e:
+        # Only this batch is lost; the rows already committed stay imported
+        await db.rollback()
+        for number, _ in valid:
+            report.fail(number, [f"batch rejected by the database: {e}"])
+        return
+    report.imported += len(valid)
+
+
+async def import_events(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    data_format: DataFormat = DataFormat.CSV,
+    batch_size: int = settings.IMPORT_BATCH_SIZE
+) -> EventImportReport:
+    rows = _csv_rows(chunks) if data_format == DataFormat.CSV else _ndjson_rows(chunks)
+    report = _Report()
+    batch: List[Tuple[int, EventCreate]] = []
+    async for number, row, error in rows:
+        if error:
+            report.fail(number, [error])
+            continue
+        try:
+            event = EventCreate.model_validate(row)
+        except ValidationError as e:
+            report.fail(number, [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()])
+            continue
+        if event.ends_at <= event.starts_at:
+            report.fail(number, ["ends_at must be after starts_at"])
+            continue
+        batch.append((number, event))
+        if len(batch) >= batch_size:
+            await _load_batch(db, batch, report)
+            batch = []
+    if batch:
+        await _load_batch(db, batch, report)
+    if report.imported:
+        await list_version_crud.events_changed(db)
+    return report.result()
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def export_events(db: AsyncSession, stmt: Select, data_format: DataFormat = DataFormat.CSV) -> AsyncIterator[bytes]:
+    """Stream everything stmt matches in a format import_events reads back."""
+    if data_format == DataFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_HEADER)
+        yield buffer.getvalue().encode()
+    async for rows in event_crud.stream_export_rows(db, stmt):
+        if data_format == DataFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([_csv_value(v) for v in row] for row in rows)
+            yield buffer.getvalue().encode()
+        else:
+            yield b"".join(dumps(row._asdict()) + b"\n" for row in rows)
+
+
+async def _read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            yield chunk
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        if args.command == "import":
+            report = await import_events(db, _read_file(args.path), args.format)
+            print(report.model_dump_json(indent=2))
+        else:
+            with open(args.path, "wb") as f:
+                async for chunk in export_events(db, event_crud.query_events_filtered(EventFilter()), args.format):
+                    f.write(chunk)
+            print(f"Exported events to {args.path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import or export events")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path")
+    parser.add_argument("--format", type=DataFormat, choices=list(DataFormat), default=DataFormat.CSV)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,37 @@
+import asyncio
+import logging
+from typing import Optional, Set
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import booking_crud
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_expired_holds(released_events: Optional[Set[int]] = None) -> int:
+    """Release expired seat holds batch by batch until none are left."""
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            released = booking_crud.release_expired_holds(db, settings.HOLD_SWEEP_BATCH_SIZE, released_events)
+            total += released
+            if released < settings.HOLD_SWEEP_BATCH_SIZE:
+                return total
+    finally:
+        db.close()
+
+
+async def run_hold_sweeper() -> None:
+    while True:
+        try:
+            released_events: Set[int] = set()
+            released = await run_in_threadpool(sweep_expired_holds, released_events)
+            if released:
+                logger.info("Released %d expired booking holds", released)
+                await response_cache.invalidate("events", *[f"event:{event_id}" for event_id in released_events])
+        except Exception:
+            logger.exception("Hold sweep failed")
+        await asyncio.sleep(settings.HOLD_SWEEP_INTERVAL_SECONDS)
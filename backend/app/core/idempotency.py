@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import logging
+from typing import Any, Callable, Optional, Type
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import idempotency_crud
+from app.crud.idempotency_crud import Claim
+from app.utils.json_encoding import dumps
+
+logger = logging.getLogger(__name__)
+
+
+def request_fingerprint(request: Request, body: bytes = b"") -> str:
+    return hashlib.sha256(f"{request.method} {request.url.path}\n".encode() + body).hexdigest()
+
+
+def _replay(status_code: int, body: bytes, replayed: bool = True) -> Response:
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _in_progress(detail: str) -> HTTPException:
+    # Answer at once rather than park a worker thread until the other request finishes
+    return HTTPException(status_code=409, detail=detail, headers={"Retry-After": str(settings.IDEMPOTENCY_RETRY_AFTER_SECONDS)})
+
+
+def _existing_response(
+    db: Session,
+    key: str,
+    fingerprint: str,
+    load: Callable[[int], Any],
+    schema: Type[BaseModel],
+    status_code: int
+) -> Response:
+    """Replay the response for a key another request has claimed."""
+    row = idempotency_crud.get_key(db, key)
+    if row is None:
+        # Released since the claim failed; the retry will claim it
+        raise _in_progress("A request with this Idempotency-Key is still in progress")
+    if row.fingerprint != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    if row.status_code is not None:
+        return _replay(row.status_code, row.response)
+    if row.resource_id is not None:
+        # The change committed but its response was never stored; rebuild it from the row
+        body = schema.model_validate(load(row.resource_id)).model_dump_json().encode()
+        idempotency_crud.complete_key(db, key, status_code, body)
+        return _replay(status_code, body)
+    raise _in_progress("A request with this Idempotency-Key is still in progress")
+
+
+def run_idempotent(
+    db: Session,
+    key: Optional[str],
+    fingerprint: str,
+    run: Callable[[Optional[Claim]], Any],
+    load: Callable[[int], Any],
+    schema: Type[BaseModel],
+    status_code: int = 200
+) -> Any:
+    """Run a mutation at most once per Idempotency-Key and replay its response to retries.
+
+    run receives the claim and must pass it to idempotency_crud.record_resource
+    in the transaction that makes its change; load fetches that row again if
+    the request died before its response was stored. Client errors raised by
+    run are stored and replayed as well; server errors drop the claim so that
+    the request can be retried.
+    """
+    if key is None:
+        return run(None)
+
+    claim = idempotency_crud.claim_key(
+        db, key, fingerprint, settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_LOCK_SECONDS
+    )
+    if claim is None:
+        return _existing_response(db, key, fingerprint, load, schema, status_code)
+
+    try:
+        result = run(claim)
+    except idempotency_crud.ClaimLostError:
+        # The key belongs to the request that took it over now
+        raise _in_progress("This request took too long and a retry with its Idempotency-Key has taken over")
+    except HTTPException as e:
+        if e.status_code >= 500:
+            _release(db, claim)
+            raise
+        idempotency_crud.complete_key(db, key, e.status_code, dumps({"detail": e.detail}), claim.token)
+        raise
+    except BaseException:
+        _release(db, claim)
+        raise
+    # If this fails the change has still committed, and retries rebuild the response from it
+    body = schema.model_validate(result).model_dump_json().encode()
+    idempotency_crud.complete_key(db, key, status_code, body, claim.token)
+    return _replay(status_code, body, replayed=False)
+
+
+def _release(db: Session, claim: Claim) -> None:
+    try:
+        db.rollback()
+        idempotency_crud.release_key(db, claim)
+    except Exception:
+        logger.exception("Could not release idempotency key %s", claim.key)
+
+
+def purge_idempotency_keys() -> int:
+    """Delete expired Idempotency-Key records batch by batch until none are left."""
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            purged = idempotency_crud.purge_expired_keys(db, settings.IDEMPOTENCY_PURGE_BATCH_SIZE)
+            total += purged
+            if purged < settings.IDEMPOTENCY_PURGE_BATCH_SIZE:
+                return total
+    finally:
+        db.close()
+
+
+async def run_idempotency_purge() -> None:
+    while True:
+        try:
+            purged = await run_in_threadpool(purge_idempotency_keys)
+            if purged:
+                logger.info("Purged %d expired idempotency keys", purged)
+        except Exception:
+            logger.exception("Idempotency key purge failed")
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,137 @@
+"""Delivers booking notifications from the outbox table.
+
+Runs as its own process, python -m app.core.notification_dispatcher, so that
+booking requests never wait on SMTP or WhatsApp.
+"""
+import argparse
+import asyncio
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.engine import Row
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud import outbox_crud
+from app.models import NotificationChannel
+from app.utils.email import SmtpEmailSender, FakeEmailSender
+from app.utils.whatsapp import CloudApiWhatsAppSender, FakeWhatsAppSender
+
+logger = logging.getLogger(__name__)
+
+# Subject and body per template, formatted with the message payload
+TEMPLATES = {
+    "booking_received": (
+        "Your tickets for {event_title} are on hold",
+        "Booking #{booking_id}: {quantity} ticket(s) for {event_title} are held for you until you pay {amount_total} {currency}.",
+    ),
+    "booking_confirmed": (
+        "Your booking for {event_title} is confirmed",
+        "Booking #{booking_id}: {quantity} ticket(s) for {event_title}, {amount_total} {currency} paid.",
+    ),
+    "booking_cancelled": (
+        "Your booking for {event_title} was cancelled",
+        "Booking #{booking_id} for {event_title} has been cancelled.",
+    ),
+}
+
+
+def build_senders() -> Dict[str, object]:
+    if settings.EMAIL_BACKEND == "smtp":
+        email = SmtpEmailSender(
+            settings.SMTP_HOST, settings.SMTP_PORT, settings.EMAIL_FROM,
+            settings.SMTP_USERNAME, settings.SMTP_PASSWORD, settings.SMTP_USE_TLS,
+            settings.NOTIFICATION_SEND_TIMEOUT_SECONDS,
+        )
+    else:
+        email = FakeEmailSender()
+    if settings.WHATSAPP_BACKEND == "cloud":
+        whatsapp = CloudApiWhatsAppSender(
+            settings.WHATSAPP_API_URL, settings.WHATSAPP_PHONE_NUMBER_ID, settings.WHATSAPP_ACCESS_TOKEN,
+            settings.NOTIFICATION_SEND_TIMEOUT_SECONDS,
+        )
+    else:
+        whatsapp = FakeWhatsAppSender()
+    return {NotificationChannel.EMAIL.value: email, NotificationChannel.WHATSAPP.value: whatsapp}
+
+
+def render(template: str, payload: dict) -> Tuple[str, str]:
+    subject, body = TEMPLATES[template]
+    return subject.format(**payload), body.format(**payload)
+
+
+def retry_delay(attempts: int) -> int:
+    """Exponential backoff with jitter, so messages that failed together don't retry together."""
+    delay = min(settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.NOTIFICATION_RETRY_MAX_SECONDS)
+    return int(delay * random.uniform(0.5, 1.0))
+
+
+async def _deliver(senders: Dict[str, object], message: Row, semaphore: asyncio.Semaphore) -> Optional[str]:
+    """Send one message, returning the error on failure."""
+    async with semaphore:
+        try:
+            subject, body = render(message.template, message.payload)
+            await asyncio.wait_for(
+                senders[message.channel].send(message.recipient, subject, body),
+                settings.NOTIFICATION_SEND_TIMEOUT_SECONDS,
+            )
+            return None
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"[:1000]
+
+
+async def dispatch_batch(senders: Dict[str, object]) -> int:
+    async with AsyncSessionLocal() as db:
+        messages = await outbox_crud.claim_due_messages(
+            db, settings.NOTIFICATION_BATCH_SIZE, settings.NOTIFICATION_LEASE_SECONDS
+        )
+    if not messages:
+        return 0
+
+    semaphore = asyncio.Semaphore(settings.NOTIFICATION_CONCURRENCY)
+    errors: List[Optional[str]] = await asyncio.gather(*(_deliver(senders, m, semaphore) for m in messages))
+
+    async with AsyncSessionLocal() as db:
+        await outbox_crud.mark_sent(db, [m.id for m, error in zip(messages, errors) if error is None])
+        for message, error in zip(messages, errors):
+            if error is None:
+                continue
+            give_up = message.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS
+            logger.warning("Notification %d attempt %d failed: %s", message.id, message.attempts, error)
+            await outbox_crud.mark_failed(db, message.id, error, None if give_up else retry_delay(message.attempts))
+        await db.commit()
+    return len(messages)
+
+
+async def dispatch_due(senders: Dict[str, object]) -> int:
+    """Drain due messages batch by batch until none are left."""
+    total = 0
+    while True:
+        claimed = await dispatch_batch(senders)
+        total += claimed
+        if claimed < settings.NOTIFICATION_BATCH_SIZE:
+            return total
+
+
+async def run_notification_dispatcher(senders: Optional[Dict[str, object]] = None) -> None:
+    senders = senders or build_senders()
+    while True:
+        try:
+            dispatched = await dispatch_due(senders)
+            if dispatched:
+                logger.info("Dispatched %d notifications", dispatched)
+            async with AsyncSessionLocal() as db:
+                await outbox_crud.purge_sent_messages(db, settings.NOTIFICATION_RETENTION_DAYS)
+        except Exception:
+            logger.exception("Notification dispatch failed")
+        await asyncio.sleep(settings.NOTIFICATION_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver queued booking notifications")
+    parser.add_argument("--once", action="store_true", help="Drain the due messages and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.once:
+        print(f"Dispatched {asyncio.run(dispatch_due(build_senders()))} notifications")
+    else:
+        asyncio.run(run_notification_dispatcher())
@@ -0,0 +1,78 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """Counters for one connection pool, updated on every checkout."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: QueuePool, max_overflow: int) -> dict:
+        """Live pool figures; max_overflow is the configured value, negative meaning unlimited.
+
+        utilization is the checked-out share of every connection the pool may
+        open, or None when overflow is unlimited and the pool cannot run out.
+        """
+        checked_out = pool.checkedout()
+        utilization = None if max_overflow < 0 else checked_out / max(pool.size() + max_overflow, 1)
+        with self._lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "size": pool.size(),
+                "max_overflow": max_overflow,
+                "checked_out": checked_out,
+                "utilization": None if utilization is None else round(utilization, 3),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+def instrumented_pool(pool_class: type, metrics: PoolMetrics) -> type:
+    """Subclass pool_class so that every checkout reports its wait time to metrics."""
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            overflow_before = self.overflow()
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record_timeout()
+                raise
+            metrics.record_checkout(time.perf_counter() - start, self.overflow() > max(overflow_before, 0))
+            return conn
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+engine_metrics = PoolMetrics()
+async_engine_metrics = PoolMetrics()
+
+InstrumentedQueuePool = instrumented_pool(QueuePool, engine_metrics)
+InstrumentedAsyncQueuePool = instrumented_pool(AsyncAdaptedQueuePool, async_engine_metrics)
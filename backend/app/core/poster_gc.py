@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.storage import poster_storage
+from app.crud import poster_crud
+
+logger = logging.getLogger(__name__)
+
+
+async def collect_poster_garbage() -> int:
+    """Delete unreferenced poster blobs batch by batch until none are due."""
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            deleted = await poster_crud.collect_garbage(
+                db, poster_storage, settings.POSTER_GC_GRACE_SECONDS, settings.POSTER_GC_BATCH_SIZE
+            )
+        total += deleted
+        if deleted < settings.POSTER_GC_BATCH_SIZE:
+            return total
+
+
+async def run_poster_gc() -> None:
+    while True:
+        try:
+            deleted = await collect_poster_garbage()
+            if deleted:
+                logger.info("Deleted %d unreferenced posters", deleted)
+        except Exception:
+            logger.exception("Poster garbage collection failed")
+        await asyncio.sleep(settings.POSTER_GC_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    print(f"Deleted {asyncio.run(collect_poster_garbage())} unreferenced posters")
@@ -0,0 +1,143 @@
+"""Responsive poster derivatives.
+
+After an upload, each poster is resized to POSTER_VARIANT_WIDTHS in WebP and
+in its original format. The resizing runs in a process pool, never on the
+request worker, and the results go to the poster storage. Run this module to
+backfill existing posters:
+
+    python -m app.core.poster_variants
+"""
+import asyncio
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.storage import key_from_url, poster_storage
+from app.crud import event_crud, poster_crud
+from app.models import Event
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - pinned in requirements.txt
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def build_variants(
+    source: str,
+    output_dir: str,
+    stem: str,
+    widths: Tuple[int, ...]
+) -> Tuple[str, int, List[Tuple[str, str, int]]]:
+    """Write the resized copies into output_dir.
+
+    Runs inside a worker process and returns the original format and width
+    plus a (filename, format, width) entry per derivative. Posters are never
+    upscaled.
+    """
+    outputs = []
+    with Image.open(source) as image:
+        image.load()
+        original_format = (image.format or "JPEG").upper()
+        suffix = Path(source).suffix
+        for width in sorted(w for w in widths if w < image.width):
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            for image_format, extension in (("WEBP", ".webp"), (original_format, suffix)):
+                frame = resized
+                if image_format == "JPEG" and frame.mode not in ("RGB", "L"):
+                    frame = frame.convert("RGB")
+                elif frame.mode == "P":
+                    frame = frame.convert("RGBA")
+                name = f"{stem}-{width}w{extension}"
+                frame.save(Path(output_dir) / name, format=image_format, optimize=True, quality=82)
+                outputs.append((name, image_format.lower(), width))
+        return original_format.lower(), image.width, outputs
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.POSTER_WORKERS)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _build_and_store(key: str, poster_url: str) -> Dict[str, str]:
+    loop = asyncio.get_running_loop()
+    with tempfile.TemporaryDirectory(dir=poster_storage.staging_dir) as workdir:
+        source = await poster_storage.fetch(key, Path(workdir) / key)
+        original_format, original_width, outputs = await loop.run_in_executor(
+            _get_pool(), build_variants, str(source), workdir, Path(key).stem, settings.POSTER_VARIANT_WIDTHS
+        )
+        srcsets = {}
+        for name, image_format, width in outputs:
+            await poster_storage.put(name, Path(workdir) / name)
+            srcsets.setdefault(image_format, []).append(f"{poster_storage.url(name)} {width}w")
+    srcsets.setdefault(original_format, []).append(f"{poster_url} {original_width}w")
+    return {image_format: ", ".join(entries) for image_format, entries in srcsets.items()}
+
+
+async def generate_poster_variants(event_id: int, poster_url: str) -> None:
+    """Build (or reuse) the derivatives of an event's poster off the event loop and record them."""
+    if Image is None:
+        logger.warning("Pillow is not installed; skipping poster variants for event %d", event_id)
+        return
+    key = key_from_url(poster_url)
+    async with AsyncSessionLocal() as db:
+        # Posters are content-addressed, so another event may already have built them
+        variants = await poster_crud.get_variants(db, key)
+    # No connection is held while the pool works
+    if variants is None:
+        try:
+            variants = await _build_and_store(key, poster_url)
+        except Exception:
+            logger.exception("Building poster variants failed for event %d", event_id)
+            return
+    async with AsyncSessionLocal() as db:
+        await poster_crud.set_variants(db, key, variants)
+        await event_crud.set_poster_variants(db, event_id, poster_url, variants)
+
+
+async def backfill(batch_size: int = 100) -> int:
+    """Build derivatives for every event with a poster but no variants yet."""
+    done = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Event.id, Event.poster_url)
+                .where(Event.poster_url.isnot(None), Event.poster_variants.is_(None), Event.id > last_id)
+                .order_by(Event.id)
+                .limit(batch_size)
+            )).all()
+        if not rows:
+            return done
+        # The whole batch is resized in parallel across the pool
+        await asyncio.gather(*[generate_poster_variants(row.id, row.poster_url) for row in rows])
+        done += len(rows)
+        last_id = rows[-1].id
+        print(f"Processed {done} posters")
+
+
+if __name__ == "__main__":
+    if Image is None:
+        raise SystemExit("Pillow is required: pip install Pillow")
+    try:
+        total = asyncio.run(backfill())
+        print(f"Poster variants built for {total} events")
+    finally:
+        shutdown_pool()
@@ -0,0 +1,52 @@
+"""Write .gz (and, with the brotli package, .br) siblings for static text assets.
+
+    python -m app.core.precompress ../frontend/static
+
+CachedStaticFiles serves these to clients that accept the encoding. Files
+are only recompressed when the source is newer than the existing sibling.
+"""
+import gzip
+import os
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - pinned in requirements.txt; gzip only without it
+    brotli = None
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".html", ".json", ".txt", ".map"}
+
+
+def _write_if_smaller(target: Path, data: bytes, original_size: int) -> bool:
+    if len(data) >= original_size:
+        return False
+    temp = target.with_name(target.name + ".part")
+    temp.write_bytes(data)
+    os.replace(temp, target)
+    return True
+
+
+def precompress(directory: Path) -> int:
+    written = 0
+    for path in directory.rglob("*"):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE:
+            continue
+        source = path.read_bytes()
+        mtime = path.stat().st_mtime
+        targets = [(path.with_name(path.name + ".gz"), lambda data: gzip.compress(data, 9, mtime=0))]
+        if brotli is not None:
+            targets.append((path.with_name(path.name + ".br"), lambda data: brotli.compress(data, quality=11)))
+        for target, compress in targets:
+            if target.exists() and target.stat().st_mtime >= mtime:
+                continue
+            if _write_if_smaller(target, compress(source), len(source)):
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    root = Path(sys.argv[1] if len(sys.argv) > 1 else "../frontend/static")
+    if brotli is None:
+        print("brotli is not installed; writing gzip only")
+    print(f"Wrote {precompress(root)} precompressed files under {root}")
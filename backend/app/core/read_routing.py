@@ -0,0 +1,81 @@
+import asyncio
+import itertools
+import threading
+import time
+from typing import List
+from fastapi import Request
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, POOL_OPTIONS
+
+# Set on the client after a successful mutation; while it is valid, that
+# client's reads go to the primary so it always sees its own writes.
+READ_YOUR_WRITES_COOKIE = "ems_primary_until"
+
+
+class ReplicaRouter:
+    """Round-robin over the read replicas, ejecting any that fail to connect."""
+
+    def __init__(self, urls: List[str]):
+        self.engines = [
+            create_async_engine(url, **POOL_OPTIONS, connect_args={"server_settings": {"timezone": "utc"}})
+            for url in urls
+        ]
+        self.sessionmakers = [
+            async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self._ejected_until = [0.0] * len(urls)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def _next_index(self) -> int:
+        with self._lock:
+            return next(self._counter) % len(self.sessionmakers)
+
+    async def session(self, use_primary: bool = False) -> AsyncSession:
+        if not use_primary:
+            for _ in range(len(self.sessionmakers)):
+                index = self._next_index()
+                if self._ejected_until[index] > time.monotonic():
+                    continue
+                db = self.sessionmakers[index]()
+                try:
+                    # Check out the connection now so a dead or hanging replica
+                    # is detected (and skipped) before the route runs
+                    await asyncio.wait_for(db.connection(), settings.DB_REPLICA_CONNECT_TIMEOUT_SECONDS)
+                    return db
+                except (exc.DBAPIError, OSError, asyncio.TimeoutError):
+                    await db.close()
+                    self._ejected_until[index] = time.monotonic() + settings.DB_REPLICA_EJECT_SECONDS
+        return AsyncSessionLocal()
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {"replica": index, "ejected": until > now}
+            for index, until in enumerate(self._ejected_until)
+        ]
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.DB_REPLICA_URLS)
+
+
+def wants_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_async_read_db(request: Request):
+    db = await replica_router.session(use_primary=wants_primary(request))
+    try:
+        yield db
+    finally:
+        await db.close()
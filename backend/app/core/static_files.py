@@ -0,0 +1,71 @@
+import os
+import re
+from mimetypes import guess_type
+from typing import Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# sha256-named posters and their derivatives never change once written
+CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}(-\d+w)?\.\w+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed siblings, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with caching headers, precompressed variants and proxy offload.
+
+    Content-addressed files are served as immutable. Others get a max-age
+    that is revalidated through ETag/Last-Modified. When a client accepts
+    br or gzip and a file.br / file.gz sits next to the file, that sibling
+    is served instead. Range requests and zero-copy sendfile (on servers
+    offering the extension) come from Starlette's FileResponse. With
+    accel_redirect_prefix set, only an X-Accel-Redirect header is sent and
+    the fronting proxy serves the bytes.
+    """
+
+    def __init__(self, *args, max_age: int = 3600, accel_redirect_prefix: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+        self.accel_redirect_prefix = accel_redirect_prefix
+
+    def cache_control(self, full_path: str) -> str:
+        if CONTENT_ADDRESSED.match(os.path.basename(full_path)):
+            return IMMUTABLE_CACHE_CONTROL
+        return f"public, max-age={self.max_age}"
+
+    def precompressed(self, full_path: str, request_headers: Headers) -> Optional[Tuple[str, str, os.stat_result]]:
+        accepted = {e.split(";")[0].strip() for e in request_headers.get("accept-encoding", "").split(",")}
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted:
+                try:
+                    return encoding, full_path + suffix, os.stat(full_path + suffix)
+                except OSError:
+                    continue
+        return None
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+        media_type = guess_type(full_path)[0] or "text/plain"
+        headers = {"Cache-Control": self.cache_control(full_path), "Vary": "Accept-Encoding"}
+
+        if self.accel_redirect_prefix:
+            relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = self.accel_redirect_prefix.rstrip("/") + "/" + relative
+            return Response(status_code=status_code, media_type=media_type, headers=headers)
+
+        encoded = self.precompressed(full_path, request_headers)
+        if encoded:
+            encoding, full_path, stat_result = encoded
+            headers["Content-Encoding"] = encoding
+        response = FileResponse(
+            full_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
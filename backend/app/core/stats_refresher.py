@@ -0,0 +1,26 @@
+import asyncio
+import logging
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud import admin_crud
+
+logger = logging.getLogger(__name__)
+
+
+async def run_stats_refresher() -> None:
+    """Keep the admin dashboard's event_stats view fresh without any request paying for the refresh."""
+    while True:
+        try:
+            # Every worker runs this loop; the advisory lock lets only one of them refresh
+            async with AsyncSessionLocal() as db:
+                await admin_crud.refresh_event_stats(db, settings.ADMIN_STATS_MAX_STALENESS_SECONDS)
+        except Exception:
+            logger.exception("Event stats refresh failed")
+        await asyncio.sleep(settings.ADMIN_STATS_REFRESH_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    async def _refresh():
+        async with AsyncSessionLocal() as db:
+            return await admin_crud.refresh_event_stats(db, settings.ADMIN_STATS_MAX_STALENESS_SECONDS, force=True)
+    print(f"event_stats refreshed at {asyncio.run(_refresh())}")
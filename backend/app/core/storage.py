@@ -0,0 +1,121 @@
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+
+def key_from_url(url: str) -> str:
+    """Storage key of a poster URL; keys are always the last path segment."""
+    return url.rsplit("/", 1)[-1]
+
+
+class PosterStorage:
+    """Where poster files live, addressed by key."""
+
+    # Uploads are staged here before being handed to put()
+    staging_dir: Path
+    base_url: str
+
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    async def put(self, key: str, path: Path) -> None:
+        """Store the file at path under key, unless the key already exists. path is consumed."""
+        raise NotImplementedError
+
+    async def fetch(self, key: str, destination: Path) -> Path:
+        """Make the stored file available locally, at destination if it has to be copied."""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def url(self, key: str) -> str:
+        raise NotImplementedError
+
+    def owns(self, url: str) -> bool:
+        """Whether url points at a file kept in this storage."""
+        return url.startswith(self.base_url + "/")
+
+
+class LocalStorage(PosterStorage):
+    def __init__(self, root: Path, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Same filesystem as root, so put() is an atomic rename
+        self.staging_dir = root
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_threadpool((self.root / key).exists)
+
+    async def put(self, key: str, path: Path) -> None:
+        def _put():
+            target = self.root / key
+            if target.exists():
+                path.unlink(missing_ok=True)
+            else:
+                os.replace(path, target)
+        await run_in_threadpool(_put)
+
+    async def fetch(self, key: str, destination: Path) -> Path:
+        return self.root / key
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool((self.root / key).unlink, missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3Storage(PosterStorage):
+    """Storage on any client exposing the boto3 S3 head/upload/download/delete API."""
+
+    def __init__(self, client, bucket: str, base_url: str):
+        self.client = client
+        self.bucket = bucket
+        self.base_url = base_url.rstrip("/")
+        self.staging_dir = Path(tempfile.gettempdir())
+
+    async def exists(self, key: str) -> bool:
+        def _exists():
+            try:
+                self.client.head_object(Bucket=self.bucket, Key=key)
+                return True
+            except Exception as e:
+                if getattr(e, "response", {}).get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    return False
+                raise
+        return await run_in_threadpool(_exists)
+
+    async def put(self, key: str, path: Path) -> None:
+        try:
+            if not await self.exists(key):
+                await run_in_threadpool(self.client.upload_file, str(path), self.bucket, key)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+    async def fetch(self, key: str, destination: Path) -> Path:
+        await run_in_threadpool(self.client.download_file, self.bucket, key, str(destination))
+        return destination
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+def _build_storage() -> PosterStorage:
+    if settings.POSTER_STORAGE == "s3":
+        import boto3
+        client = boto3.client("s3", endpoint_url=settings.POSTER_S3_ENDPOINT_URL)
+        base_url = settings.POSTER_S3_PUBLIC_URL or f"{settings.POSTER_S3_ENDPOINT_URL or 'https://s3.amazonaws.com'}/{settings.POSTER_S3_BUCKET}"
+        return S3Storage(client, settings.POSTER_S3_BUCKET, base_url)
+    return LocalStorage(Path("uploads/event_posters"), "/uploads/event_posters")
+
+
+poster_storage = _build_storage()
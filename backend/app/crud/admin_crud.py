@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import Float, cast, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.event_stats import StatsRefresh, event_stats
+from ..schemas.admin_schema import EventStatsSort
+
+EVENT_STATS = "event_stats"
+# Advisory lock taken by whichever worker refreshes the view
+EVENT_STATS_LOCK_ID = 74_201
+
+
+def _sell_through(sold, capacity):
+    return func.coalesce(cast(sold, Float) / func.nullif(capacity, 0), 0.0)
+
+
+BUCKET_COLUMNS = (
+    func.count().label("events"),
+    func.coalesce(func.sum(event_stats.c.confirmed_bookings), 0).label("confirmed_bookings"),
+    func.coalesce(func.sum(event_stats.c.revenue), 0).label("revenue"),
+    func.coalesce(func.sum(event_stats.c.tickets_sold), 0).label("tickets_sold"),
+    func.coalesce(func.sum(event_stats.c.capacity), 0).label("capacity"),
+    _sell_through(func.sum(event_stats.c.tickets_sold), func.sum(event_stats.c.capacity)).label("sell_through"),
+)
+
+EVENT_SORT_COLUMNS = {
+    EventStatsSort.REVENUE: event_stats.c.revenue,
+    EventStatsSort.BOOKINGS: event_stats.c.confirmed_bookings,
+    EventStatsSort.SELL_THROUGH: _sell_through(event_stats.c.tickets_sold, event_stats.c.capacity),
+}
+
+
+async def get_refreshed_at(db: AsyncSession) -> Optional[datetime]:
+    return await db.scalar(select(StatsRefresh.refreshed_at).where(StatsRefresh.name == EVENT_STATS))
+
+
+async def refresh_event_stats(db: AsyncSession, max_staleness: int, force: bool = False) -> Optional[datetime]:
+    """Refresh the event_stats view if it is older than max_staleness seconds.
+
+    The refresh runs concurrently, so readers keep seeing the previous
+    snapshot meanwhile. Only one worker refreshes at a time; the others
+    return the current refreshed_at straight away.
+    """
+    refreshed_at = await get_refreshed_at(db)
+    fresh_enough = refreshed_at and datetime.now(timezone.utc) - refreshed_at <= timedelta(seconds=max_staleness)
+    if fresh_enough and not force:
+        return refreshed_at
+    if not await db.scalar(select(func.pg_try_advisory_xact_lock(EVENT_STATS_LOCK_ID))):
+        await db.rollback()
+        return refreshed_at
+
+    await db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {EVENT_STATS}"))
+    stmt = insert(StatsRefresh).values(name=EVENT_STATS, refreshed_at=func.now())
+    refreshed_at = (await db.execute(
+        stmt.on_conflict_do_update(index_elements=[StatsRefresh.name], set_={"refreshed_at": func.now()})
+        .returning(StatsRefresh.refreshed_at)
+    )).scalar_one()
+    await db.commit()
+    return refreshed_at
+
+
+async def get_stats_overview(db: AsyncSession) -> Dict[str, object]:
+    totals = (await db.execute(select(*BUCKET_COLUMNS))).one()._asdict()
+    by_status = await db.execute(select(event_stats.c.status, *BUCKET_COLUMNS).group_by(event_stats.c.status))
+    by_category = await db.execute(select(event_stats.c.category, *BUCKET_COLUMNS).group_by(event_stats.c.category))
+    return {
+        "totals": totals,
+        "by_status": {row.status: row._asdict() for row in by_status},
+        "by_category": {row.category: row._asdict() for row in by_category},
+    }
+
+
+async def get_event_stats(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    sort: EventStatsSort = EventStatsSort.REVENUE
+) -> List[Dict[str, object]]:
+    stmt = (
+        select(event_stats, EVENT_SORT_COLUMNS[EventStatsSort.SELL_THROUGH].label("sell_through"))
+        .order_by(EVENT_SORT_COLUMNS[sort].desc(), event_stats.c.event_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [row._asdict() for row in await db.execute(stmt)]
@@ -1,22 +1,378 @@
-from sqlalchemy.orm import Session
-from ..models.booking import Booking
-from ..schemas.booking_schema import BookingCreate
-
-
-def create_booking(db: Session, booking: BookingCreate) -> Booking:
-    new_booking =BookingCreate(
-        event_id= BookingCreate.event_id,
-        quantity= BookingCreate.quantity,
-        attendee_name= BookingCreate.attendee_name,
-        attendee_email=BookingCreate.attendee_email,
-        attendee_phone= BookingCreate.attendee_phone,
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, select, tuple_, update, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, noload, selectinload
+from ..core.config import settings
+from . import idempotency_crud, list_version_crud
+from .idempotency_crud import Claim
+from ..models.booking import Booking, BookingItem, BookingStatus, PaymentStatus
+from ..models.event import Event, EventStatus
+from ..models.notification_outbox import NotificationChannel, OutboxMessage
+from ..models.ticket_inventory import TicketInventory
+from ..models.user import User
+from ..schemas.booking_schema import BookingCreate, BookingItemCreate, TicketTier
+from ..utils.pagination import encode_cursor, decode_cursor
+
+
+class EventNotFoundError(Exception):
+    pass
+
+
+class EventNotPublishedError(Exception):
+    pass
+
+
+class UserNotFoundError(Exception):
+    pass
+
+
+class SeatsUnavailableError(Exception):
+    pass
+
+
+class BookingStateError(Exception):
+    pass
+
+
+# Advisory lock held by whichever worker is sweeping holds
+HOLD_SWEEP_LOCK_ID = 74_202
+
+# Releasing a batch of expired holds takes three statements in one transaction:
+# the bookings are cancelled, then the tier and event counters are decremented.
+# Each statement locks its counter rows in key order, (event_id, tier) and then
+# event id, the same order the booking path uses, so that sweeps and bookings
+# cannot deadlock on each other.
+EXPIRE_HOLDS_SQL = text("""
+    UPDATE bookings
+    SET status = 'CANCELLED', hold_expires_at = NULL
+    WHERE id IN (
+        SELECT id FROM bookings
+        WHERE status = 'PENDING' AND hold_expires_at <= now()
+        ORDER BY hold_expires_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
     )
-    db.add(new_booking)
-    db.commit()
+    RETURNING id
+""")
+
+RELEASE_TIER_HOLDS_SQL = text("""
+    WITH totals AS (
+        SELECT bookings.event_id, booking_items.tier, SUM(booking_items.quantity) AS quantity
+        FROM bookings JOIN booking_items ON booking_items.booking_id = bookings.id
+        WHERE bookings.id = ANY(:ids)
+        GROUP BY bookings.event_id, booking_items.tier
+    ), locked AS (
+        SELECT ticket_inventory.id, totals.quantity
+        FROM ticket_inventory JOIN totals
+            ON ticket_inventory.event_id = totals.event_id AND ticket_inventory.tier = totals.tier
+        ORDER BY ticket_inventory.event_id, ticket_inventory.tier
+        FOR UPDATE OF ticket_inventory
+    )
+    UPDATE ticket_inventory
+    SET held = ticket_inventory.held - locked.quantity
+    FROM locked
+    WHERE ticket_inventory.id = locked.id
+""")
+
+RELEASE_EVENT_HOLDS_SQL = text("""
+    WITH totals AS (
+        SELECT event_id, SUM(quantity) AS quantity
+        FROM bookings
+        WHERE id = ANY(:ids)
+        GROUP BY event_id
+    ), locked AS (
+        SELECT events.id, totals.quantity
+        FROM events JOIN totals ON events.id = totals.event_id
+        ORDER BY events.id
+        FOR UPDATE OF events
+    )
+    UPDATE events
+    SET tickets_held = events.tickets_held - locked.quantity, updated_at = now()
+    FROM locked
+    WHERE events.id = locked.id
+    RETURNING events.id
+""")
+
+
+def _hold_seats(db: Session, event_id: int, quantity: int) -> Optional[float]:
+    # Single conditional UPDATE: the capacity check and the decrement happen
+    # atomically under the row lock, so concurrent bookings can never oversell.
+    stmt = (
+        update(Event)
+        .where(
+            Event.id == event_id,
+            Event.status == EventStatus.PUBLISHED.value,
+            Event.tickets_sold + Event.tickets_held + quantity <= Event.capacity,
+        )
+        .values(tickets_held=Event.tickets_held + quantity)
+        .returning(Event.ga_ticket_price)
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(stmt).first()
+    return None if row is None else (row.ga_ticket_price or 0.0)
+
+
+def _hold_tier_seats(db: Session, event_id: int, items: List[BookingItemCreate]) -> Optional[Dict[str, float]]:
+    # Tiers are always locked in the same (sorted) order so that concurrent
+    # multi-tier bookings cannot deadlock on each other.
+    prices = {}
+    for item in sorted(items, key=lambda i: i.tier.value):
+        stmt = (
+            update(TicketInventory)
+            .where(
+                TicketInventory.event_id == event_id,
+                TicketInventory.tier == item.tier.value,
+                TicketInventory.sold + TicketInventory.held + item.quantity <= TicketInventory.capacity,
+            )
+            .values(held=TicketInventory.held + item.quantity)
+            .returning(TicketInventory.price)
+            .execution_options(synchronize_session=False)
+        )
+        row = db.execute(stmt).first()
+        if row is None:
+            return None
+        prices[item.tier.value] = row.price or 0.0
+    return prices
+
+
+def _adjust_seats(db: Session, booking: Booking, held: int = 0, sold: int = 0) -> None:
+    """Shift a booking's seats between the held and sold counters.
+
+    held/sold are multipliers (+1, -1 or 0) applied to each quantity.
+    """
+    for item in sorted(booking.items, key=lambda i: i.tier):
+        db.execute(
+            update(TicketInventory)
+            .where(TicketInventory.event_id == booking.event_id, TicketInventory.tier == item.tier)
+            .values(
+                held=TicketInventory.held + held * item.quantity,
+                sold=TicketInventory.sold + sold * item.quantity,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    db.execute(
+        update(Event)
+        .where(Event.id == booking.event_id)
+        .values(
+            tickets_held=Event.tickets_held + held * booking.quantity,
+            tickets_sold=Event.tickets_sold + sold * booking.quantity,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _queue_notification(db: Session, booking: Booking, template: str) -> None:
+    """Add the booking's notifications to the outbox in its transaction.
+
+    Every booking is notified by email, and by WhatsApp too when the attendee
+    gave a phone number. The recipient and event title are filled in by the
+    INSERT itself, so this costs no extra round trip; the dispatcher sends the
+    messages once committed.
+    """
+    payload = func.jsonb_build_object(
+        "booking_id", booking.id,
+        "event_id", booking.event_id,
+        "event_title", select(Event.title).where(Event.id == booking.event_id).scalar_subquery(),
+        "quantity", booking.quantity,
+        "amount_total", booking.amount_total,
+        "currency", booking.currency,
+    )
+    recipients = [(NotificationChannel.EMAIL, select(User.email).where(User.id == booking.user_id).scalar_subquery())]
+    if booking.attendee_phone:
+        recipients.append((NotificationChannel.WHATSAPP, booking.attendee_phone))
+    db.add_all([
+        OutboxMessage(channel=channel.value, recipient=recipient, template=template, payload=payload)
+        for channel, recipient in recipients
+    ])
+
+
+def _has_ticket_tiers(db: Session, event_id: int) -> bool:
+    return db.query(TicketInventory.id).filter(TicketInventory.event_id == event_id).first() is not None
+
+
+def _hold_failed(db: Session, event_id: int, message: str) -> None:
+    """Roll back a failed hold and raise the error that explains it."""
+    db.rollback()
+    status = db.scalar(select(Event.status).where(Event.id == event_id))
+    if status is None:
+        raise EventNotFoundError(f"Event {event_id} not found")
+    if status != EventStatus.PUBLISHED.value:
+        raise EventNotPublishedError(f"Event {event_id} is {status} and not open for booking")
+    raise SeatsUnavailableError(message)
+
+
+def create_booking(db: Session, booking: BookingCreate, claim: Optional[Claim] = None) -> Booking:
+    items = booking.items
+    if items is None and _has_ticket_tiers(db, booking.event_id):
+        items = [BookingItemCreate(tier=TicketTier.GA, quantity=booking.quantity)]
+
+    try:
+        if items:
+            prices = _hold_tier_seats(db, booking.event_id, items)
+            if prices is None:
+                _hold_failed(db, booking.event_id, "Not enough seats available for the requested tiers")
+
+        # Take the hot event row lock last, so it is only held for the
+        # booking insert and the commit.
+        unit_price = _hold_seats(db, booking.event_id, booking.quantity)
+        if unit_price is None:
+            _hold_failed(db, booking.event_id, "Not enough seats available")
+
+        # Inserted only once the seats are held, so the event is known to exist
+        new_booking = Booking(
+            user_id=booking.user_id,
+            event_id=booking.event_id,
+            quantity=booking.quantity,
+            status=BookingStatus.PENDING.value,
+            hold_expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.BOOKING_HOLD_MINUTES),
+            attendee_phone=booking.attendee_phone,
+        )
+        if items:
+            new_booking.items = [
+                BookingItem(tier=item.tier.value, quantity=item.quantity, unit_price=prices[item.tier.value])
+                for item in items
+            ]
+            new_booking.amount_total = sum(
+                Decimal(str(prices[item.tier.value])) * item.quantity for item in items
+            )
+        else:
+            new_booking.amount_total = Decimal(str(unit_price)) * booking.quantity
+        db.add(new_booking)
+        try:
+            db.flush()
+        except IntegrityError:
+            raise UserNotFoundError(f"User {booking.user_id} not found")
+        _queue_notification(db, new_booking, "booking_received")
+        if claim is not None:
+            idempotency_crud.record_resource(db, claim, new_booking.id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
     db.refresh(new_booking)
+    list_version_crud.bump_version(db)
     return new_booking
 
 
+def cancel_booking(db: Session, booking_id: int) -> Optional[Booking]:
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
+    if not booking:
+        return None
+    if booking.status in {BookingStatus.CANCELLED.value, BookingStatus.REFUNDED.value}:
+        db.rollback()
+        raise BookingStateError(f"Booking {booking_id} is already {booking.status}")
+
+    if booking.status == BookingStatus.PENDING.value:
+        _adjust_seats(db, booking, held=-1)
+    else:
+        _adjust_seats(db, booking, sold=-1)
+    booking.status = BookingStatus.CANCELLED.value
+    booking.hold_expires_at = None
+    _queue_notification(db, booking, "booking_cancelled")
+    db.commit()
+    db.refresh(booking)
+    list_version_crud.bump_version(db)
+    return booking
+
+
+def confirm_booking(db: Session, booking_id: int, claim: Optional[Claim] = None) -> Optional[Booking]:
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
+    if not booking:
+        return None
+    if booking.status != BookingStatus.PENDING.value or booking.hold_expires_at is None:
+        db.rollback()
+        raise BookingStateError(f"Booking {booking_id} is {booking.status} and cannot be confirmed")
+    if booking.hold_expires_at <= datetime.now(timezone.utc):
+        db.rollback()
+        raise BookingStateError(f"Hold for booking {booking_id} has expired")
+
+    # Move the seats from held to sold
+    _adjust_seats(db, booking, held=-1, sold=1)
+    booking.status = BookingStatus.CONFIRMED.value
+    booking.payment_status = PaymentStatus.PAID.value
+    booking.hold_expires_at = None
+    _queue_notification(db, booking, "booking_confirmed")
+    if claim is not None:
+        try:
+            idempotency_crud.record_resource(db, claim, booking.id)
+        except idempotency_crud.ClaimLostError:
+            db.rollback()
+            raise
+    db.commit()
+    db.refresh(booking)
+    list_version_crud.bump_version(db)
+    return booking
+
+
+def release_expired_holds(db: Session, batch_size: int = 1000, released_events: Optional[Set[int]] = None) -> int:
+    """Release one batch of expired holds and return how many bookings expired.
+
+    The ids of the events whose seats came back are added to released_events,
+    so the caller can drop their cached pages once this has committed.
+    """
+    # One worker sweeps at a time; the others find the lock taken and skip this round
+    if not db.scalar(select(func.pg_try_advisory_xact_lock(HOLD_SWEEP_LOCK_ID))):
+        db.rollback()
+        return 0
+    ids = list(db.scalars(EXPIRE_HOLDS_SQL, {"batch_size": batch_size}))
+    if ids:
+        db.execute(RELEASE_TIER_HOLDS_SQL, {"ids": ids})
+        event_ids = db.scalars(RELEASE_EVENT_HOLDS_SQL, {"ids": ids}).all()
+        if released_events is not None:
+            released_events.update(event_ids)
+    db.commit()
+    if ids:
+        list_version_crud.bump_version(db)
+    return len(ids)
+
+
+HISTORY_SORT = "booked_at"
+
+# A page of bookings with their event and user costs two queries whatever
+# its size: one for the joined rows and one for all of the page's items.
+HISTORY_OPTIONS = (
+    selectinload(Booking.items),
+    joinedload(Booking.event).options(
+        load_only(Event.id, Event.title, Event.starts_at, Event.location, Event.status),
+        noload(Event.ticket_tiers),
+    ),
+    joinedload(Booking.user).load_only(User.id, User.first_name, User.last_name, User.email),
+)
+
+
+def list_bookings(
+    db: Session,
+    user_id: Optional[int] = None,
+    event_id: Optional[int] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[Booking], Optional[str]]:
+    """Newest-first page of bookings with their event and user, and the cursor of the next page.
+
+    Raises ValueError for an invalid cursor.
+    """
+    stmt = select(Booking).options(*HISTORY_OPTIONS)
+    if user_id is not None:
+        stmt = stmt.where(Booking.user_id == user_id)
+    if event_id is not None:
+        stmt = stmt.where(Booking.event_id == event_id)
+    if cursor:
+        stmt = stmt.where(
+            tuple_(Booking.booked_at, Booking.id) < tuple_(*decode_cursor(cursor, HISTORY_SORT, (datetime, int)))
+        )
+    stmt = stmt.order_by(Booking.booked_at.desc(), Booking.id.desc()).limit(limit)
+    bookings = list(db.scalars(stmt).all())
+
+    next_cursor = None
+    if len(bookings) == limit:
+        last = bookings[-1]
+        next_cursor = encode_cursor(HISTORY_SORT, [last.booked_at, last.id])
+    return bookings, next_cursor
+
+
 def booking_read(db: Session, booking_id: int) -> Booking:
     return db.query(Booking).filter(Booking.id == booking_id).first()
 
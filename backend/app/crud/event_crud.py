@@ -1,10 +1,78 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from collections import Counter
+from sqlalchemy import select, tuple_, func, or_, update, any_, bindparam, text, Integer, Select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, noload
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
-from app.models import Event, EventStatus, Category
-from app.schemas.event_schema import EventCreate, EventUpdate
+from pathlib import Path
+from app.core.storage import key_from_url, poster_storage
+from app.crud import list_version_crud, poster_crud
+from app.models import Event, EventStatus, Category, TicketInventory, User
+from app.core.config import settings
+from app.schemas.event_schema import EventCreate, EventUpdate, EventFilter, EventSort, CountMode
+from app.utils.explain import Explain, top_plan
+from app.utils.pagination import encode_cursor, decode_cursor
 
-def create_event(db: Session, event: EventCreate) -> Event:
+# Keyset sort orders (columns, cursor value types, descending), each backed
+# by a matching composite index on events
+SORT_KEYS = {
+    EventSort.ID: ((Event.id,), (int,), False),
+    EventSort.STARTS_AT: ((Event.starts_at, Event.id), (datetime, int), False),
+    EventSort.ENDS_AT_DESC: ((Event.ends_at, Event.id), (datetime, int), True),
+}
+
+STREAM_BATCH_SIZE = 500
+
+# Statuses a batch transition may move events out of, by target status;
+# cancelled and completed events are never reopened
+STATUS_TRANSITIONS = {
+    EventStatus.DRAFT: (),
+    EventStatus.PUBLISHED: (EventStatus.DRAFT,),
+    EventStatus.CANCELLED: (EventStatus.DRAFT, EventStatus.PUBLISHED),
+    EventStatus.COMPLETED: (EventStatus.PUBLISHED,),
+}
+
+# Columns of EventResponse, for list reads that skip the ORM and Pydantic
+EVENT_RESPONSE_COLUMNS = (
+    Event.id, Event.title, Event.description, Event.category, Event.status,
+    Event.location, Event.starts_at, Event.ends_at, Event.capacity, Event.organizer_id,
+    Event.created_at, Event.updated_at, Event.ga_ticket_price, Event.vip_ticket_price,
+    Event.pa_ticket_price, Event.poster_url, Event.poster_variants,
+    func.greatest(Event.capacity - Event.tickets_sold - Event.tickets_held, 0).label("tickets_available"),
+)
+
+# Columns written by a bulk import, in COPY order
+IMPORT_COLUMNS = (
+    "title", "description", "category", "status", "location", "starts_at", "ends_at",
+    "capacity", "organizer_id", "ga_ticket_price", "vip_ticket_price", "pa_ticket_price", "poster_url",
+)
+
+# Response fields backed by something other than the column of the same name
+FIELD_ATTRIBUTES = {
+    "tickets_available": ("capacity", "tickets_sold", "tickets_held"),
+    "ticket_tiers": (),
+}
+
+def _needed_keys(fields: Iterable[str], sort: Optional[EventSort] = None) -> set:
+    keys = {"id"}
+    if sort is not None:
+        keys.update(c.key for c in SORT_KEYS[sort][0])
+    return keys.union(fields)
+
+def load_fields(stmt: Select, fields: Iterable[str], sort: Optional[EventSort] = None) -> Select:
+    """Load only the columns behind the requested fields (plus id and the sort key)."""
+    fields = tuple(fields)
+    attributes = set()
+    for key in _needed_keys(fields, sort):
+        attributes.update(FIELD_ATTRIBUTES.get(key, (key,)))
+    options = [load_only(*[getattr(Event, a) for a in sorted(attributes)])]
+    if "ticket_tiers" not in fields:
+        options.append(noload(Event.ticket_tiers))
+    return stmt.options(*options)
+
+async def create_event(db: AsyncSession, event: EventCreate, poster_file: Optional[Path] = None) -> Event:
+    """Insert the event; poster_file, the staged upload behind poster_url, is stored before the commit."""
     db_event = Event(
         title=event.title,
         description=event.description,
@@ -21,99 +89,567 @@ def create_event(db: Session, event: EventCreate) -> Event:
         poster_url=event.poster_url,  # Added poster_url
     )
     db.add(db_event)
-    db.commit() 
-    db.refresh(db_event)
+    try:
+        await poster_crud.swap_poster(db, poster_storage, None, event.poster_url, poster_file)
+    except Exception:
+        await db.rollback()
+        raise
+    await db.commit()
+    await db.refresh(db_event)
+    # Load the tiers up front; lazy loads are not allowed on an async session
+    await db.refresh(db_event, ["ticket_tiers"])
+    await list_version_crud.events_changed(db)
     return db_event
 
-def list_events(db: Session, skip: int = 0, limit: int = 100) -> List[Event]:
-    return db.query(Event).offset(skip).limit(limit).all()
+def _order(stmt: Select, sort: EventSort) -> Select:
+    columns, _, descending = SORT_KEYS[sort]
+    return stmt.order_by(*[c.desc() if descending else c.asc() for c in columns])
 
-def get_event(db: Session, event_id: int) -> Optional[Event]:
-    return db.query(Event).filter(Event.id == event_id).first()
+def _seek(
+    stmt: Select,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.ID
+) -> Select:
+    """Order by the sort key and seek past the cursor, falling back to offset when no cursor is given."""
+    columns, types, descending = SORT_KEYS[sort]
+    stmt = _order(stmt, sort)
+    if cursor:
+        # Row-value comparison lets Postgres seek straight into the composite index
+        values = decode_cursor(cursor, sort.value, types)
+        if descending:
+            stmt = stmt.where(tuple_(*columns) < tuple_(*values))
+        else:
+            stmt = stmt.where(tuple_(*columns) > tuple_(*values))
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
 
-def get_events(
-    db: Session, 
-    skip: int = 0, 
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.ID
+) -> List[Event]:
+    result = await db.scalars(_seek(stmt, skip, limit, cursor, sort))
+    return list(result.all())
+
+async def get_event_rows(
+    db: AsyncSession,
+    stmt: Select,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.ID,
+    fields: Optional[Iterable[str]] = None
+) -> List[dict]:
+    """Like paginate, but select only the response columns and return plain dicts.
+
+    With fields, only those columns (plus id and the sort key) are selected.
+    The ticket tiers of the whole page are fetched with one extra query.
+    """
+    keys = _needed_keys(fields, sort) if fields is not None else None
+    columns = [c for c in EVENT_RESPONSE_COLUMNS if keys is None or c.key in keys]
+    stmt = _seek(stmt, skip, limit, cursor, sort).with_only_columns(*columns, maintain_column_froms=True)
+    rows = [row._asdict() for row in await db.execute(stmt)]
+    if keys is None or "ticket_tiers" in keys:
+        tiers = await get_ticket_tiers_by_event(db, [row["id"] for row in rows])
+        for row in rows:
+            row["ticket_tiers"] = tiers.get(row["id"], [])
+    return rows
+
+async def get_ticket_tiers_by_event(db: AsyncSession, event_ids: List[int]) -> Dict[int, List[dict]]:
+    if not event_ids:
+        return {}
+    result = await db.execute(
+        select(
+            TicketInventory.event_id,
+            TicketInventory.tier,
+            TicketInventory.price,
+            TicketInventory.capacity,
+            func.greatest(TicketInventory.capacity - TicketInventory.sold - TicketInventory.held, 0).label("available"),
+        )
+        .where(TicketInventory.event_id.in_(event_ids))
+        .order_by(TicketInventory.event_id, TicketInventory.tier)
+    )
+    tiers: Dict[int, List[dict]] = {}
+    for row in result:
+        tier = row._asdict()
+        tiers.setdefault(tier.pop("event_id"), []).append(tier)
+    return tiers
+
+async def stream_events(db: AsyncSession, stmt: Select, sort: EventSort = EventSort.ID) -> AsyncIterator[Event]:
+    """Iterate over every row of stmt through a server-side cursor, in constant memory."""
+    stmt = _order(stmt, sort).execution_options(yield_per=STREAM_BATCH_SIZE)
+    result = await db.stream_scalars(stmt)
+    async for event in result:
+        yield event
+
+def next_cursor(events: List[Event], limit: int, sort: EventSort = EventSort.ID) -> Optional[str]:
+    if len(events) < limit:
+        return None
+    last = events[-1]
+    columns, _, _ = SORT_KEYS[sort]
+    if isinstance(last, dict):
+        return encode_cursor(sort.value, [last[c.key] for c in columns])
+    return encode_cursor(sort.value, [getattr(last, c.key) for c in columns])
+
+async def list_events(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.ID
+) -> List[Event]:
+    return await paginate(db, select(Event), skip, limit, cursor, sort)
+
+async def get_event(db: AsyncSession, event_id: int, fields: Optional[Iterable[str]] = None) -> Optional[Event]:
+    stmt = select(Event).where(Event.id == event_id)
+    if fields is not None:
+        stmt = load_fields(stmt, fields)
+    return await db.scalar(stmt)
+
+async def get_event_version(db: AsyncSession, event_id: int) -> Optional[datetime]:
+    """Return updated_at for the event without loading it, or None if it does not exist."""
+    return await db.scalar(select(Event.updated_at).where(Event.id == event_id))
+
+def query_events(
     status: Optional[EventStatus] = None,
     category: Optional[Category] = None
-) -> List[Event]:
-    query = db.query(Event)
-    
+) -> Select:
+    stmt = select(Event)
+
     if status:
-        query = query.filter(Event.status == status.value)
-    
+        stmt = stmt.where(Event.status == status.value)
+
     if category:
-        query = query.filter(Event.category == category.value)
-    
-    return query.offset(skip).limit(limit).all()
+        stmt = stmt.where(Event.category == category.value)
 
-def update_event(db: Session, event_id: int, updated_event: EventUpdate) -> Optional[Event]:
-    db_event = get_event(db, event_id)
+    return stmt
+
+def query_events_filtered(filters: EventFilter) -> Select:
+    """Compile any combination of filters into a single statement."""
+    stmt = select(Event)
+
+    if filters.status:
+        stmt = stmt.where(Event.status == filters.status.value)
+    if filters.category:
+        stmt = stmt.where(Event.category == filters.category.value)
+    if filters.starts_after:
+        stmt = stmt.where(Event.starts_at >= filters.starts_after)
+    if filters.starts_before:
+        stmt = stmt.where(Event.starts_at < filters.starts_before)
+    if filters.min_capacity is not None:
+        stmt = stmt.where(Event.capacity >= filters.min_capacity)
+    if filters.max_capacity is not None:
+        stmt = stmt.where(Event.capacity <= filters.max_capacity)
+    if filters.min_price is not None:
+        stmt = stmt.where(Event.ga_ticket_price >= filters.min_price)
+    if filters.max_price is not None:
+        stmt = stmt.where(Event.ga_ticket_price <= filters.max_price)
+    if filters.organizer_id is not None:
+        stmt = stmt.where(Event.organizer_id == filters.organizer_id)
+    if filters.location:
+        stmt = stmt.where(Event.location.ilike(f"%{filters.location}%"))
+
+    return stmt
+
+async def get_events_filtered(
+    db: AsyncSession,
+    filters: EventFilter,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.STARTS_AT
+) -> List[Event]:
+    return await paginate(db, query_events_filtered(filters), skip, limit, cursor, sort)
+
+async def get_events(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[EventStatus] = None,
+    category: Optional[Category] = None,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.ID
+) -> List[Event]:
+    return await paginate(db, query_events(status, category), skip, limit, cursor, sort)
+
+class CapacityError(Exception):
+    pass
+
+def _tier_capacity(event_id):
+    return (
+        select(func.coalesce(func.sum(TicketInventory.capacity), 0))
+        .where(TicketInventory.event_id == event_id)
+        .scalar_subquery()
+    )
+
+async def update_event(
+    db: AsyncSession,
+    event_id: int,
+    updated_event: EventUpdate,
+    poster_file: Optional[Path] = None
+) -> Optional[Event]:
+    """Apply the changes, raising CapacityError if the capacity would drop below what is booked or allocated to tiers.
+
+    poster_file, the staged upload behind a new poster_url, is stored before the commit.
+    """
+    stmt = select(Event).where(Event.id == event_id)
+    if updated_event.capacity is not None:
+        # Locked so that tier creation and bookings see this capacity, and it sees theirs
+        stmt = stmt.with_for_update().execution_options(populate_existing=True)
+    db_event = await db.scalar(stmt)
     if not db_event:
         return None
-    
+    if updated_event.capacity is not None:
+        allocated = await db.scalar(select(_tier_capacity(event_id)))
+        if updated_event.capacity < max(allocated, db_event.tickets_sold + db_event.tickets_held):
+            await db.rollback()
+            raise CapacityError("Capacity cannot be lower than the seats booked or allocated to ticket tiers")
+
     # Update only non-None fields
+    old_poster_url = db_event.poster_url
     update_data = updated_event.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_event, field, value)
-    
-    db.commit()
-    db.refresh(db_event)
+    if "poster_url" in update_data and update_data["poster_url"] != old_poster_url:
+        # The old derivatives no longer match; new ones are built in the background
+        db_event.poster_variants = None
+        try:
+            await poster_crud.swap_poster(db, poster_storage, old_poster_url, db_event.poster_url, poster_file)
+        except Exception:
+            await db.rollback()
+            raise
+
+    await db.commit()
+    await db.refresh(db_event)
+    await list_version_crud.events_changed(db, [event_id])
     return db_event
 
-def delete_event(db: Session, event_id: int) -> bool:
-    db_event = get_event(db, event_id)
+def _ids_param(ids: List[int]):
+    # One array parameter instead of an IN list, so the statement shape never changes
+    return any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+
+async def _update_returning_ids(db: AsyncSession, stmt) -> List[int]:
+    result = await db.execute(stmt.returning(Event.id).execution_options(synchronize_session=False))
+    updated_ids = list(result.scalars().all())
+    await db.commit()
+    if updated_ids:
+        await list_version_crud.events_changed(db, updated_ids)
+    return updated_ids
+
+async def update_events(db: AsyncSession, ids: List[int], changes: EventUpdate) -> List[int]:
+    """Apply the same changes to every listed event in one UPDATE and return the ids it touched.
+
+    Events where the change would leave ends_at before starts_at, or the
+    capacity below the seats already sold or held or allocated to ticket
+    tiers, are left untouched.
+    """
+    values = {
+        field: value.value if isinstance(value, (EventStatus, Category)) else value
+        for field, value in changes.model_dump(exclude_unset=True).items()
+    }
+    stmt = update(Event).where(Event.id == _ids_param(ids)).values(**values)
+    if "starts_at" in values or "ends_at" in values:
+        stmt = stmt.where(
+            func.coalesce(values.get("ends_at"), Event.ends_at) > func.coalesce(values.get("starts_at"), Event.starts_at)
+        )
+    if values.get("capacity") is not None:
+        # Lock the rows in id order before checking, as update_event and tier creation do
+        await db.execute(select(Event.id).where(Event.id == _ids_param(ids)).order_by(Event.id).with_for_update())
+        stmt = stmt.where(
+            Event.tickets_sold + Event.tickets_held <= values["capacity"],
+            _tier_capacity(Event.id) <= values["capacity"],
+        )
+    return await _update_returning_ids(db, stmt)
+
+async def transition_events_status(
+    db: AsyncSession,
+    to_status: EventStatus,
+    from_status: Optional[EventStatus] = None,
+    organizer_id: Optional[int] = None,
+    ids: Optional[List[int]] = None
+) -> List[int]:
+    """Move every matching event to to_status in one UPDATE and return the ids it touched.
+
+    Only events in a status STATUS_TRANSITIONS allows for to_status are moved.
+    """
+    sources = [s.value for s in STATUS_TRANSITIONS[to_status] if from_status is None or s == from_status]
+    stmt = update(Event).where(Event.status.in_(sources)).values(status=to_status.value)
+    if organizer_id is not None:
+        stmt = stmt.where(Event.organizer_id == organizer_id)
+    if ids:
+        stmt = stmt.where(Event.id == _ids_param(ids))
+    return await _update_returning_ids(db, stmt)
+
+async def delete_event(db: AsyncSession, event_id: int) -> bool:
+    db_event = await get_event(db, event_id)
     if not db_event:
         return False
-    
-    db.delete(db_event)
-    db.commit()
+
+    # The poster file itself is removed later by garbage collection
+    await poster_crud.swap_poster(db, poster_storage, db_event.poster_url, None)
+    await db.delete(db_event)
+    await db.commit()
+    await list_version_crud.events_changed(db, [event_id])
     return True
 
-def get_events_by_organizer(db: Session, organizer_id: int) -> List[Event]:
-    return db.query(Event).filter(Event.organizer_id == organizer_id).all()
+async def copy_events(db: AsyncSession, events: List[EventCreate]) -> int:
+    """Insert a batch of events through PostgreSQL COPY, in the caller's transaction."""
+    records = [
+        (
+            e.title, e.description, e.category.value, e.status.value, e.location, e.starts_at, e.ends_at,
+            e.capacity, e.organizer_id, e.ga_ticket_price or 0.0, e.vip_ticket_price or 0.0,
+            e.pa_ticket_price or 0.0, e.poster_url,
+        )
+        for e in events
+    ]
+    # Imported rows may reuse stored posters, which then need their references
+    poster_refs = Counter(e.poster_url for e in events if e.poster_url and poster_storage.owns(e.poster_url))
+    for poster_url in sorted(poster_refs):
+        await poster_crud.acquire_poster(db, key_from_url(poster_url), poster_refs[poster_url])
+    connection = await (await db.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(
+        Event.__tablename__, records=records, columns=IMPORT_COLUMNS
+    )
+    return len(records)
+
+async def stream_export_rows(db: AsyncSession, stmt: Select) -> AsyncIterator[list]:
+    """Yield the importable columns of everything stmt matches, a batch of rows at a time."""
+    columns = [Event.id, *[getattr(Event, c) for c in IMPORT_COLUMNS]]
+    stmt = (
+        stmt.with_only_columns(*columns, maintain_column_froms=True)
+        .order_by(Event.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
+
+async def get_existing_user_ids(db: AsyncSession, user_ids: Iterable[int]) -> set:
+    result = await db.scalars(select(User.id).where(User.id.in_(set(user_ids))))
+    return set(result.all())
+
+async def set_poster_variants(db: AsyncSession, event_id: int, poster_url: str, variants: Dict[str, str]) -> bool:
+    """Store the derivatives of poster_url, unless the event's poster changed in the meantime."""
+    result = await db.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.poster_url == poster_url)
+        .values(poster_variants=variants)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await list_version_crud.events_changed(db, [event_id])
+    return result.rowcount > 0
+
+def query_events_by_organizer(organizer_id: int) -> Select:
+    return select(Event).where(Event.organizer_id == organizer_id)
+
+async def get_events_by_organizer(
+    db: AsyncSession,
+    organizer_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    return await paginate(db, query_events_by_organizer(organizer_id), skip, limit, cursor)
 
-def get_upcoming_events(db: Session, current_time: datetime) -> List[Event]:
-    return db.query(Event).filter(
+def query_upcoming_events(current_time: datetime) -> Select:
+    return select(Event).where(
         Event.starts_at > current_time,
         Event.status != EventStatus.CANCELLED.value
-    ).order_by(Event.starts_at.asc()).all()
+    )
 
-def get_past_events(db: Session, current_time: datetime) -> List[Event]:
-    return db.query(Event).filter(
+async def get_upcoming_events(
+    db: AsyncSession,
+    current_time: datetime,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    stmt = query_upcoming_events(current_time)
+    return await paginate(db, stmt, skip, limit, cursor, EventSort.STARTS_AT)
+
+def query_past_events(current_time: datetime) -> Select:
+    return select(Event).where(
         Event.ends_at < current_time
-    ).order_by(Event.ends_at.desc()).all()
+    )
 
-def get_events_by_location(db: Session, location: str) -> List[Event]:
-    return db.query(Event).filter(
+async def get_past_events(
+    db: AsyncSession,
+    current_time: datetime,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    stmt = query_past_events(current_time)
+    return await paginate(db, stmt, skip, limit, cursor, EventSort.ENDS_AT_DESC)
+
+def query_events_by_location(location: str) -> Select:
+    return select(Event).where(
         Event.location.ilike(f"%{location}%")
-    ).all()
+    )
 
-def get_events_by_date_range(db: Session, start_date: datetime, end_date: datetime) -> List[Event]:
-    return db.query(Event).filter(
+async def get_events_by_location(
+    db: AsyncSession,
+    location: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    return await paginate(db, query_events_by_location(location), skip, limit, cursor)
+
+def query_events_by_date_range(start_date: datetime, end_date: datetime) -> Select:
+    return select(Event).where(
         Event.starts_at >= start_date,
         Event.ends_at <= end_date
-    ).order_by(Event.starts_at.asc()).all()
+    )
 
-def get_events_by_capacity(db: Session, min_capacity: int, max_capacity: int) -> List[Event]:
-    return db.query(Event).filter(
+async def get_events_by_date_range(
+    db: AsyncSession,
+    start_date: datetime,
+    end_date: datetime,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    stmt = query_events_by_date_range(start_date, end_date)
+    return await paginate(db, stmt, skip, limit, cursor, EventSort.STARTS_AT)
+
+def query_events_by_capacity(min_capacity: int, max_capacity: int) -> Select:
+    return select(Event).where(
         Event.capacity >= min_capacity,
         Event.capacity <= max_capacity
-    ).all()
+    )
 
-def get_events_by_title_keyword(db: Session, keyword: str) -> List[Event]:
-    return db.query(Event).filter(
+async def get_events_by_capacity(
+    db: AsyncSession,
+    min_capacity: int,
+    max_capacity: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    stmt = query_events_by_capacity(min_capacity, max_capacity)
+    return await paginate(db, stmt, skip, limit, cursor)
+
+def query_events_by_title_keyword(keyword: str) -> Select:
+    return select(Event).where(
         Event.title.ilike(f"%{keyword}%")
-    ).all()
+    )
+
+async def get_events_by_title_keyword(
+    db: AsyncSession,
+    keyword: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Event]:
+    return await paginate(db, query_events_by_title_keyword(keyword), skip, limit, cursor)
+
+def query_search(
+    q: str,
+    status: Optional[EventStatus] = None,
+    category: Optional[Category] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    """Ranked search over title, description and location.
+
+    Matches either the tsvector (GIN) or, for typos and partial words, the
+    trigram indexes on title and location, combined with the filters in one query.
+    """
+    ts_query = func.websearch_to_tsquery("english", q)
+    rank = func.ts_rank_cd(Event.search_vector, ts_query) + func.greatest(
+        func.similarity(Event.title, q),
+        func.similarity(Event.location, q)
+    )
+    stmt = select(Event).where(or_(
+        Event.search_vector.op("@@")(ts_query),
+        Event.title.op("%")(q),
+        Event.location.op("%")(q),
+        Event.title.ilike(f"%{q}%"),
+    ))
+
+    if status:
+        stmt = stmt.where(Event.status == status.value)
+    if category:
+        stmt = stmt.where(Event.category == category.value)
+    if start_date:
+        stmt = stmt.where(Event.starts_at >= start_date)
+    if end_date:
+        stmt = stmt.where(Event.starts_at <= end_date)
+
+    return stmt.order_by(rank.desc(), Event.id)
 
-def get_published_events(db: Session, skip: int = 0, limit: int = 100) -> List[Event]:
-    return db.query(Event).filter(
+async def search_events(
+    db: AsyncSession,
+    q: str,
+    status: Optional[EventStatus] = None,
+    category: Optional[Category] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[Iterable[str]] = None
+) -> List[Event]:
+    stmt = query_search(q, status, category, start_date, end_date)
+    if fields is not None:
+        stmt = load_fields(stmt, fields)
+
+    result = await db.scalars(stmt.offset(skip).limit(limit))
+    return list(result.all())
+
+async def get_published_events(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.ID
+) -> List[Event]:
+    stmt = select(Event).where(
         Event.status == EventStatus.PUBLISHED.value
-    ).offset(skip).limit(limit).all()
+    )
+    return await paginate(db, stmt, skip, limit, cursor, sort)
+
+async def count_exact(db: AsyncSession, stmt: Select) -> int:
+    return await db.scalar(stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None))
+
+async def count_estimate(db: AsyncSession, stmt: Select, unfiltered: bool = False) -> Optional[int]:
+    """Planner row estimate for stmt, or None when the table has never been analyzed.
 
-def get_events_count(db: Session) -> int:
-    return db.query(Event).count()
+    An unfiltered count reads pg_class.reltuples; anything else asks EXPLAIN.
+    """
+    if unfiltered:
+        estimate = await db.scalar(
+            text("SELECT CAST(reltuples AS bigint) FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": Event.__tablename__}
+        )
+        return estimate if estimate is not None and estimate >= 0 else None
+    plan = top_plan(await db.scalar(Explain(stmt.with_only_columns(Event.id, maintain_column_froms=True).order_by(None))))
+    return int(plan["Plan Rows"])
 
-def get_events_by_status_count(db: Session, status: EventStatus) -> int:
-    return db.query(Event).filter(Event.status == status.value).count()
\ No newline at end of file
+async def count_events(
+    db: AsyncSession,
+    stmt: Select,
+    mode: CountMode = CountMode.AUTO,
+    unfiltered: bool = False
+) -> Tuple[int, CountMode]:
+    """Count the rows of stmt in the requested mode; returns the count and the mode actually used."""
+    if mode != CountMode.EXACT:
+        estimate = await count_estimate(db, stmt, unfiltered)
+        if estimate is not None and (mode == CountMode.ESTIMATE or estimate > settings.EXACT_COUNT_THRESHOLD):
+            return estimate, CountMode.ESTIMATE
+    return await count_exact(db, stmt), CountMode.EXACT
+
+async def get_events_count(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count()).select_from(Event))
+
+async def get_events_by_status_count(db: AsyncSession, status: EventStatus) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(Event).where(Event.status == status.value)
+    )
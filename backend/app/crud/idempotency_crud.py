@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+from uuid import uuid4
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from app.models import IdempotencyKey
+
+
+class Claim(NamedTuple):
+    key: str
+    token: str
+
+
+class ClaimLostError(Exception):
+    """Another request took the key over while this one was running."""
+
+
+def claim_key(db: Session, key: str, fingerprint: str, ttl: int, lock_seconds: int) -> Optional[Claim]:
+    """Claim a key for a new request; None if another request holds or has answered it.
+
+    Expired keys are taken over, and so are claims that have been in flight
+    for longer than lock_seconds without their change committing.
+    """
+    token = uuid4().hex
+    stmt = insert(IdempotencyKey).values(
+        key=key,
+        fingerprint=fingerprint,
+        claim_token=token,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={
+            "fingerprint": stmt.excluded.fingerprint,
+            "claim_token": stmt.excluded.claim_token,
+            "resource_id": None,
+            "status_code": None,
+            "response": None,
+            "created_at": func.now(),
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=or_(
+            IdempotencyKey.expires_at <= func.now(),
+            and_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.resource_id.is_(None),
+                IdempotencyKey.created_at <= func.now() - timedelta(seconds=lock_seconds),
+            ),
+        ),
+    ).returning(IdempotencyKey.key)
+    claimed = db.execute(stmt).first() is not None
+    db.commit()
+    return Claim(key, token) if claimed else None
+
+
+def get_key(db: Session, key: str) -> Optional[Row]:
+    row = db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.resource_id,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response,
+        ).where(IdempotencyKey.key == key)
+    ).first()
+    db.rollback()
+    return row
+
+
+def record_resource(db: Session, claim: Claim, resource_id: int) -> None:
+    """Tie the claim to the row its request changed, in the caller's transaction.
+
+    Raises ClaimLostError if the key has been taken over, so that the caller
+    rolls its change back instead of making it a second time.
+    """
+    result = db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == claim.key, IdempotencyKey.claim_token == claim.token)
+        .values(resource_id=resource_id)
+    )
+    if result.rowcount == 0:
+        raise ClaimLostError(f"Idempotency key {claim.key} was taken over by another request")
+
+
+def complete_key(db: Session, key: str, status_code: int, response: bytes, token: Optional[str] = None) -> None:
+    """Store the response to replay; with a token, only while that claim still holds the key."""
+    stmt = update(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+    if token is not None:
+        stmt = stmt.where(IdempotencyKey.claim_token == token)
+    db.execute(stmt.values(status_code=status_code, response=response))
+    db.commit()
+
+
+def release_key(db: Session, claim: Claim) -> None:
+    """Drop a claim whose change never committed, so that a retry runs the request again."""
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.key == claim.key,
+            IdempotencyKey.claim_token == claim.token,
+            IdempotencyKey.status_code.is_(None),
+            IdempotencyKey.resource_id.is_(None),
+        )
+    )
+    db.commit()
+
+
+def purge_expired_keys(db: Session, batch_size: int = 1000) -> int:
+    expired = (
+        select(IdempotencyKey.key)
+        .where(IdempotencyKey.expires_at <= func.now())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.scalar_subquery())))
+    db.commit()
+    return result.rowcount
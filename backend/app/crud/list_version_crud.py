@@ -0,0 +1,41 @@
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.cache import response_cache
+from ..models.list_version import ListVersion
+
+# Everything that changes what an event listing shows, seat counts included
+EVENTS = "events"
+
+
+def _bump(name: str):
+    stmt = insert(ListVersion).values(name=name, version=1)
+    return stmt.on_conflict_do_update(index_elements=[ListVersion.name], set_={"version": ListVersion.version + 1})
+
+
+def bump_version(db: Session, name: str = EVENTS) -> None:
+    """Move the version on once a change has committed.
+
+    It runs in a transaction of its own, so the counter row is locked only
+    for the bump and never for the change; a reader that sees the new
+    version is then sure to see the change too.
+    """
+    db.execute(_bump(name))
+    db.commit()
+
+
+async def bump_version_async(db: AsyncSession, name: str = EVENTS) -> None:
+    await db.execute(_bump(name))
+    await db.commit()
+
+
+async def get_version(db: AsyncSession, name: str = EVENTS) -> int:
+    return await db.scalar(select(ListVersion.version).where(ListVersion.name == name)) or 0
+
+
+async def events_changed(db: AsyncSession, event_ids: Iterable[int] = ()) -> None:
+    """After an event change commits, move the list version on and drop the cached copies."""
+    await bump_version_async(db)
+    await response_cache.invalidate("events", *[f"event:{event_id}" for event_id in event_ids])
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.notification_outbox import OutboxMessage, OutboxStatus
+
+
+async def claim_due_messages(db: AsyncSession, batch_size: int, lease_seconds: int) -> List[Row]:
+    """Lease a batch of due messages to this dispatcher and commit.
+
+    No lock is held while the messages are sent; a message whose dispatcher
+    dies comes due again once its lease runs out.
+    """
+    due = (
+        select(OutboxMessage.id)
+        .where(OutboxMessage.status == OutboxStatus.PENDING.value, OutboxMessage.next_attempt_at <= func.now())
+        .order_by(OutboxMessage.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(OutboxMessage)
+        .where(OutboxMessage.id.in_(due.scalar_subquery()))
+        .values(
+            attempts=OutboxMessage.attempts + 1,
+            next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+        )
+        .returning(
+            OutboxMessage.id, OutboxMessage.channel, OutboxMessage.recipient,
+            OutboxMessage.template, OutboxMessage.payload, OutboxMessage.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    messages = result.all()
+    await db.commit()
+    return messages
+
+
+async def mark_sent(db: AsyncSession, message_ids: List[int]) -> None:
+    if not message_ids:
+        return
+    await db.execute(
+        update(OutboxMessage)
+        .where(OutboxMessage.id.in_(message_ids))
+        .values(status=OutboxStatus.SENT.value, sent_at=func.now(), last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def mark_failed(db: AsyncSession, message_id: int, error: str, retry_in: Optional[int]) -> None:
+    """Schedule the next attempt, or give up on the message when retry_in is None."""
+    values = {"last_error": error}
+    if retry_in is None:
+        values["status"] = OutboxStatus.FAILED.value
+    else:
+        values["next_attempt_at"] = func.now() + timedelta(seconds=retry_in)
+    await db.execute(
+        update(OutboxMessage)
+        .where(OutboxMessage.id == message_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def purge_sent_messages(db: AsyncSession, retention_days: int, batch_size: int = 1000) -> int:
+    old = (
+        select(OutboxMessage.id)
+        .where(
+            OutboxMessage.status == OutboxStatus.SENT.value,
+            OutboxMessage.sent_at < func.now() - timedelta(days=retention_days),
+        )
+        .limit(batch_size)
+    )
+    result = await db.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(old.scalar_subquery())))
+    await db.commit()
+    return result.rowcount
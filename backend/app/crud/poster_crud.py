@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy import case, delete, select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.storage import PosterStorage, key_from_url
+from ..models.poster_blob import PosterBlob
+
+
+async def acquire_poster(db: AsyncSession, key: str, count: int = 1) -> None:
+    """Add references to a poster blob as part of the caller's transaction."""
+    stmt = insert(PosterBlob).values(key=key, ref_count=count)
+    # Waits on a concurrent garbage collection of the same key, then re-creates the row
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[PosterBlob.key],
+        set_={"ref_count": PosterBlob.ref_count + count, "orphaned_at": None},
+    ))
+
+
+async def release_poster(db: AsyncSession, key: str) -> None:
+    """Drop a reference as part of the caller's transaction; unknown keys are ignored."""
+    await db.execute(
+        update(PosterBlob)
+        .where(PosterBlob.key == key, PosterBlob.ref_count > 0)
+        .values(
+            ref_count=PosterBlob.ref_count - 1,
+            # The last reference going away starts the garbage-collection grace period
+            orphaned_at=case((PosterBlob.ref_count == 1, func.now()), else_=None),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_variants(db: AsyncSession, key: str) -> Optional[Dict[str, str]]:
+    return await db.scalar(select(PosterBlob.variants).where(PosterBlob.key == key))
+
+
+async def set_variants(db: AsyncSession, key: str, variants: Dict[str, str]) -> None:
+    await db.execute(
+        update(PosterBlob)
+        .where(PosterBlob.key == key)
+        .values(variants=variants)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def swap_poster(
+    db: AsyncSession,
+    storage: PosterStorage,
+    old_url: Optional[str],
+    new_url: Optional[str],
+    new_file: Optional[Path] = None
+) -> None:
+    """Move an event's reference from old_url to new_url; URLs outside the storage are ignored.
+
+    new_file, the uploaded poster, is stored while the new reference is
+    still uncommitted: garbage collection skips the locked row, so it cannot
+    delete the file in between, and a failed upload rolls the reference back
+    with the rest of the caller's transaction.
+    """
+    if old_url == new_url:
+        return
+    changes = []
+    if new_url and storage.owns(new_url):
+        changes.append((key_from_url(new_url), acquire_poster))
+    if old_url and storage.owns(old_url):
+        changes.append((key_from_url(old_url), release_poster))
+    # Rows are always locked in key order so concurrent swaps cannot deadlock
+    for key, change in sorted(changes, key=lambda c: c[0]):
+        await change(db, key)
+    if new_file is not None and new_url and storage.owns(new_url):
+        await storage.put(key_from_url(new_url), new_file)
+
+
+def variant_keys(key: str, variants: Optional[Dict[str, str]]) -> List[str]:
+    """Storage keys of the derivatives listed in variants, excluding the blob itself."""
+    keys = []
+    for srcset in (variants or {}).values():
+        for entry in srcset.split(","):
+            variant_key = key_from_url(entry.strip().split(" ")[0])
+            if variant_key and variant_key != key:
+                keys.append(variant_key)
+    return keys
+
+
+async def collect_garbage(db: AsyncSession, storage: PosterStorage, grace_seconds: int, batch_size: int = 100) -> int:
+    """Delete one batch of blobs that have been unreferenced for longer than the grace period.
+
+    The rows stay locked while their files are removed, so a concurrent
+    acquire_poster of the same content waits and then re-stores the file.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    blobs = (await db.scalars(
+        select(PosterBlob)
+        .where(PosterBlob.ref_count == 0, PosterBlob.orphaned_at <= cutoff)
+        .order_by(PosterBlob.orphaned_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).all()
+    try:
+        for blob in blobs:
+            for key in [*variant_keys(blob.key, blob.variants), blob.key]:
+                await storage.delete(key)
+        if blobs:
+            await db.execute(delete(PosterBlob).where(PosterBlob.key.in_([b.key for b in blobs])))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return len(blobs)
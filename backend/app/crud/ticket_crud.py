@@ -1,21 +1,61 @@
-from sqlalchemy.orm import Session
-from ..models.ticket import Ticket
+from typing import Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import list_version_crud
+from ..models.event import Event
+from ..models.ticket_inventory import TicketInventory
+from ..schemas.event_schema import TicketTierCreate
 
 
+class DuplicateTierError(Exception):
+    pass
 
 
-def create_ticket(db: Session, ticket_data: dict) -> Ticket:
-    new_ticket = Ticket(
-        event_id=ticket_data['event_id'],
-        ticket_type=ticket_data['ticket_type'],
-        price=ticket_data['price'],
-        quantity_available=ticket_data['quantity_available']
+class TierCapacityError(Exception):
+    pass
+
+
+async def create_ticket(db: AsyncSession, event_id: int, ticket_data: TicketTierCreate) -> Optional[TicketInventory]:
+    """Add a tier to an event, or return None if the event does not exist.
+
+    The event row is locked first, so concurrent tier creations and capacity
+    changes all check the tier total against the same capacity.
+    """
+    capacity = await db.scalar(select(Event.capacity).where(Event.id == event_id).with_for_update())
+    if capacity is None:
+        return None
+    tiers = (await db.execute(
+        select(TicketInventory.tier, TicketInventory.capacity).where(TicketInventory.event_id == event_id)
+    )).all()
+    if any(tier == ticket_data.tier.value for tier, _ in tiers):
+        await db.rollback()
+        raise DuplicateTierError(f"{ticket_data.tier.value} tickets already exist for this event")
+    if sum(c for _, c in tiers) + ticket_data.capacity > capacity:
+        await db.rollback()
+        raise TierCapacityError("Tier capacities cannot exceed the event capacity")
+
+    new_ticket = TicketInventory(
+        event_id=event_id,
+        tier=ticket_data.tier.value,
+        price=ticket_data.price,
+        capacity=ticket_data.capacity,
     )
     db.add(new_ticket)
-    db.commit()
-    db.refresh(new_ticket)
+    # Availability is part of the event representation, so bump its version
+    await db.execute(
+        update(Event).where(Event.id == event_id).values(updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(new_ticket)
+    await list_version_crud.events_changed(db, [event_id])
     return new_ticket
 
-    
-def get_tickets_by_event(db: Session, event_id: int) -> list["Ticket"]:
-    return db.query(Ticket).filter(Ticket.event_id == event_id).all()
\ No newline at end of file
+
+async def get_tickets_by_event(db: AsyncSession, event_id: int) -> list["TicketInventory"]:
+    result = await db.scalars(
+        select(TicketInventory)
+        .where(TicketInventory.event_id == event_id)
+        .order_by(TicketInventory.tier)
+    )
+    return list(result.all())
@@ -14,12 +14,30 @@ from .user import User, UserRole
 # Event depends on User
 from .event import Event, EventStatus, Category
 
+# TicketInventory depends on Event
+from .ticket_inventory import TicketInventory, TicketTier
+
 # Booking depends on User and Event
-from .booking import Booking, BookingStatus, PaymentStatus
+from .booking import Booking, BookingItem, BookingStatus, PaymentStatus
 
 # WishlistItem depends on User and Event
 from .wishlist import WishlistItem
 
+# PosterBlob has no dependencies
+from .poster_blob import PosterBlob
+
+# IdempotencyKey has no dependencies
+from .idempotency_key import IdempotencyKey
+
+# OutboxMessage has no dependencies
+from .notification_outbox import OutboxMessage, OutboxStatus, NotificationChannel
+
+# ListVersion has no dependencies
+from .list_version import ListVersion
+
+# The event_stats view reads events and bookings
+from .event_stats import StatsRefresh, event_stats
+
 # Ticket depends on User
 from .ticket import Ticket, TicketComment, TicketStatus
 
@@ -31,10 +49,21 @@ __all__ = [
     "Event",
     "EventStatus",
     "Category",
+    "TicketInventory",
+    "TicketTier",
     "Booking",
+    "BookingItem",
     "BookingStatus",
     "PaymentStatus",
     "WishlistItem",
+    "PosterBlob",
+    "IdempotencyKey",
+    "OutboxMessage",
+    "OutboxStatus",
+    "NotificationChannel",
+    "ListVersion",
+    "StatsRefresh",
+    "event_stats",
     "Ticket",
     "TicketComment",
     "TicketStatus",
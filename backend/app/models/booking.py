@@ -1,9 +1,9 @@
 from __future__ import annotations
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import ForeignKey, Integer, String, DateTime, Numeric, func
+from sqlalchemy import ForeignKey, Integer, String, DateTime, Numeric, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from app.core.database import Base
 
 if TYPE_CHECKING:
@@ -24,7 +24,15 @@ class PaymentStatus(str, Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
-    
+    __table_args__ = (
+        # Only open checkouts carry a hold, so the sweeper scans a small partial index
+        Index("ix_bookings_pending_hold_expiry", "hold_expires_at", postgresql_where=text("status = 'PENDING'")),
+        # Keyset pagination of booking history, newest first
+        Index("ix_bookings_booked_at_id", "booked_at", "id"),
+        Index("ix_bookings_user_booked_at_id", "user_id", "booked_at", "id"),
+        Index("ix_bookings_event_booked_at_id", "event_id", "booked_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
@@ -34,13 +42,28 @@ class Booking(Base):
     status: Mapped[BookingStatus] = mapped_column(String(20), default=BookingStatus.PENDING.value)
     payment_status: Mapped[PaymentStatus] = mapped_column(String(20), default=PaymentStatus.UNPAID.value)
     booked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    hold_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Notifications go to WhatsApp as well when the attendee gave a number
+    attendee_phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="bookings")
     event: Mapped["Event"] = relationship("Event", back_populates="bookings")
+    items: Mapped[list["BookingItem"]] = relationship("BookingItem", back_populates="booking", cascade="all, delete-orphan")
 
     @property
     def is_confirmed(self) -> bool:
         return self.status == BookingStatus.CONFIRMED.value and self.payment_status in {
             PaymentStatus.PAID.value, PaymentStatus.PARTIAL.value
-        }
\ No newline at end of file
+        }
+
+class BookingItem(Base):
+    __tablename__ = "booking_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    booking_id: Mapped[int] = mapped_column(ForeignKey("bookings.id", ondelete="CASCADE"), index=True)
+    tier: Mapped[str] = mapped_column(String(10))
+    quantity: Mapped[int] = mapped_column(Integer)
+    unit_price: Mapped[float] = mapped_column(Numeric(10, 2))
+
+    booking: Mapped["Booking"] = relationship("Booking", back_populates="items")
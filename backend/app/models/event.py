@@ -1,7 +1,9 @@
 from __future__ import annotations
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Float, func
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Float, Index, Computed, DDL, func, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.event import listen
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 from typing import TYPE_CHECKING, Optional
@@ -10,6 +12,7 @@ if TYPE_CHECKING:
     from .user import User
     from .booking import Booking
     from .wishlist import WishlistItem
+    from .ticket_inventory import TicketInventory
 
 class EventStatus(str, Enum):
     DRAFT = "DRAFT"
@@ -27,17 +30,47 @@ class Category(str, Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination indexes, matching the (starts_at, id) and (id) sort keys
+        Index("ix_events_starts_at_id", "starts_at", "id"),
+        Index("ix_events_status_starts_at_id", "status", "starts_at", "id"),
+        Index("ix_events_status_id", "status", "id"),
+        Index("ix_events_ends_at_id", "ends_at", "id"),
+        # Composite filter indexes for /events/query; the published listing is
+        # by far the most common shape, so it gets its own partial index
+        Index("ix_events_published_starts_at", "starts_at", "id", postgresql_where=text("status = 'PUBLISHED'")),
+        Index("ix_events_category_starts_at", "category", "starts_at", "id"),
+        Index("ix_events_organizer_starts_at", "organizer_id", "starts_at", "id"),
+        Index("ix_events_capacity", "capacity"),
+        Index("ix_events_ga_ticket_price", "ga_ticket_price"),
+        # Full-text and trigram (typo-tolerant / substring) search indexes
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_events_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_events_location_trgm", "location", postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}),
+    )
 
     # Primary Key
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     
     # Event Details
     poster_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # srcset string per image format, filled in once the derivatives are built
+    poster_variants: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     title: Mapped[str] = mapped_column(String(200), index=True)
     description: Mapped[str] = mapped_column(Text)
     category: Mapped[Category] = mapped_column(String(30))
     status: Mapped[EventStatus] = mapped_column(String(20), default=EventStatus.DRAFT.value)
     location: Mapped[str] = mapped_column(String(250))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     # Dates
     starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -45,6 +78,8 @@ class Event(Base):
     
     # Capacity
     capacity: Mapped[int] = mapped_column(Integer)
+    tickets_sold: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    tickets_held: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     # Foreign Key
     organizer_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
@@ -61,4 +96,17 @@ class Event(Base):
     # Relationships
     organizer: Mapped["User"] = relationship("User", back_populates="events")
     bookings: Mapped[list["Booking"]] = relationship("Booking", back_populates="event", cascade="all, delete-orphan")
-    wishlist_items: Mapped[list["WishlistItem"]] = relationship("WishlistItem", back_populates="event", cascade="all, delete-orphan")
\ No newline at end of file
+    wishlist_items: Mapped[list["WishlistItem"]] = relationship("WishlistItem", back_populates="event", cascade="all, delete-orphan")
+    # selectin: a page of events loads all its tiers in one extra query
+    ticket_tiers: Mapped[list["TicketInventory"]] = relationship(
+        "TicketInventory", back_populates="event", cascade="all, delete-orphan",
+        lazy="selectin", order_by="TicketInventory.tier"
+    )
+
+    @property
+    def tickets_available(self) -> int:
+        return max(self.capacity - (self.tickets_sold or 0) - (self.tickets_held or 0), 0)
+
+
+# The trigram indexes need pg_trgm before the events table is created
+listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
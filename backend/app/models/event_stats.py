@@ -0,0 +1,59 @@
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, DDL, DateTime, Integer, MetaData, Numeric, String, Table
+from sqlalchemy.event import listen
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+# Per-event booking and revenue totals for the admin dashboard. A materialized
+# view, so the dashboard never aggregates bookings itself; it is refreshed
+# concurrently by the hold sweeper once older than ADMIN_STATS_MAX_STALENESS_SECONDS.
+EVENT_STATS_VIEW_SQL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS event_stats AS
+SELECT
+    e.id AS event_id,
+    e.title,
+    e.status,
+    e.category,
+    e.capacity,
+    e.tickets_sold,
+    e.tickets_held,
+    COUNT(b.id) FILTER (WHERE b.status = 'CONFIRMED') AS confirmed_bookings,
+    COUNT(b.id) FILTER (WHERE b.status = 'PENDING') AS pending_bookings,
+    COALESCE(SUM(b.amount_total) FILTER (WHERE b.status = 'CONFIRMED'), 0) AS revenue
+FROM events e
+LEFT JOIN bookings b ON b.event_id = e.id
+GROUP BY e.id
+"""
+
+# REFRESH ... CONCURRENTLY needs a unique index on the view
+EVENT_STATS_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS ux_event_stats_event_id ON event_stats (event_id)"
+
+# Kept out of Base.metadata so create_all does not create it as a table
+event_stats = Table(
+    "event_stats",
+    MetaData(),
+    Column("event_id", Integer, primary_key=True),
+    Column("title", String),
+    Column("status", String),
+    Column("category", String),
+    Column("capacity", Integer),
+    Column("tickets_sold", Integer),
+    Column("tickets_held", Integer),
+    Column("confirmed_bookings", Integer),
+    Column("pending_bookings", Integer),
+    Column("revenue", Numeric(12, 2)),
+)
+
+class StatsRefresh(Base):
+    """When each materialized view was last refreshed."""
+    __tablename__ = "stats_refreshes"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+for statement in (EVENT_STATS_VIEW_SQL, EVENT_STATS_INDEX_SQL):
+    listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+# The view depends on events and bookings, so it has to go before they do
+listen(Base.metadata, "before_drop", DDL("DROP MATERIALIZED VIEW IF EXISTS event_stats").execute_if(dialect="postgresql"))
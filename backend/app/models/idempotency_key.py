@@ -0,0 +1,23 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class IdempotencyKey(Base):
+    """A client Idempotency-Key, claimed while its request runs and then holding the response to replay."""
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # sha256 of the method, path and body; a reused key with another request is rejected
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    # New on every claim, so a request whose claim was taken over cannot commit its change
+    claim_token: Mapped[str] = mapped_column(String(32))
+    # Set in the transaction of the change itself, so a committed request is never run again
+    resource_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Both NULL while the request is in flight
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
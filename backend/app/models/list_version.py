@@ -0,0 +1,11 @@
+from __future__ import annotations
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class ListVersion(Base):
+    """A counter per cached listing, moved on after every committed change to what it lists."""
+    __tablename__ = "list_versions"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
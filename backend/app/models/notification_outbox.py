@@ -0,0 +1,37 @@
+from __future__ import annotations
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlalchemy import DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class NotificationChannel(str, Enum):
+    EMAIL = "EMAIL"
+    WHATSAPP = "WHATSAPP"
+
+class OutboxStatus(str, Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+class OutboxMessage(Base):
+    """A notification written in the same transaction as the change it reports, delivered later by the dispatcher."""
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # The dispatcher only ever polls for pending messages that are due
+        Index("ix_notification_outbox_due", "next_attempt_at", postgresql_where=text("status = 'PENDING'")),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    channel: Mapped[NotificationChannel] = mapped_column(String(20))
+    recipient: Mapped[str] = mapped_column(String(255))
+    template: Mapped[str] = mapped_column(String(50))
+    payload: Mapped[dict] = mapped_column(JSONB)
+    status: Mapped[OutboxStatus] = mapped_column(String(20), default=OutboxStatus.PENDING.value)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
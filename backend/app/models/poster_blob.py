@@ -0,0 +1,23 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class PosterBlob(Base):
+    """A content-addressed poster file and the number of events using it."""
+    __tablename__ = "poster_blobs"
+    __table_args__ = (
+        # Garbage collection only ever looks at unreferenced blobs
+        Index("ix_poster_blobs_orphaned_at", "orphaned_at", postgresql_where=text("ref_count = 0")),
+    )
+
+    # sha256 hex digest plus the file extension
+    key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # srcset per format of the resized derivatives, shared by every event using the blob
+    variants: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    orphaned_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+from enum import Enum
+from sqlalchemy import ForeignKey, Integer, Float, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import TYPE_CHECKING
+from app.core.database import Base
+
+if TYPE_CHECKING:
+    from .event import Event
+
+class TicketTier(str, Enum):
+    GA = "GA"
+    VIP = "VIP"
+    PA = "PA"
+
+class TicketInventory(Base):
+    __tablename__ = "ticket_inventory"
+    __table_args__ = (
+        UniqueConstraint("event_id", "tier", name="uq_ticket_inventory_event_tier"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), index=True)
+    tier: Mapped[TicketTier] = mapped_column(String(10))
+    price: Mapped[float] = mapped_column(Float, default=0.0)
+    capacity: Mapped[int] = mapped_column(Integer)
+    sold: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    held: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Relationships
+    event: Mapped["Event"] = relationship("Event", back_populates="ticket_tiers")
+
+    @property
+    def available(self) -> int:
+        return max(self.capacity - (self.sold or 0) - (self.held or 0), 0)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.crud import admin_crud
+from app.schemas.admin_schema import EventStatsPage, EventStatsSort, StatsOverview
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/stats", response_model=StatsOverview)
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
+    """Event counts, bookings, revenue and sell-through by status and category.
+
+    Served from the event_stats view as last refreshed by the stats refresher.
+    """
+    refreshed_at = await admin_crud.get_refreshed_at(db)
+    return StatsOverview(refreshed_at=refreshed_at, **await admin_crud.get_stats_overview(db))
+
+
+@router.get("/stats/events", response_model=EventStatsPage)
+async def get_event_stats(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    sort: EventStatsSort = EventStatsSort.REVENUE,
+    db: AsyncSession = Depends(get_async_db)):
+    refreshed_at = await admin_crud.get_refreshed_at(db)
+    events = await admin_crud.get_event_stats(db, skip, limit, sort)
+    return EventStatsPage(refreshed_at=refreshed_at, events=events)
+
+
+@router.post("/stats/refresh", response_model=StatsOverview)
+async def refresh_stats(db: AsyncSession = Depends(get_async_db)):
+    refreshed_at = await admin_crud.refresh_event_stats(db, settings.ADMIN_STATS_MAX_STALENESS_SECONDS, force=True)
+    return StatsOverview(refreshed_at=refreshed_at, **await admin_crud.get_stats_overview(db))
@@ -1,21 +1,70 @@
-from fastapi import Depends, FastAPI, APIRouter
+import anyio
+from fastapi import Depends, FastAPI, APIRouter, Header, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.schemas.booking_schema import BookingCreate
+from typing import List, Optional
+from app.schemas.booking_schema import BookingCreate, BookingRead, BookingWithDetails
+from app.core.cache import response_cache
 from app.core.database import get_db
+from app.core.idempotency import request_fingerprint, run_idempotent
+from app.crud import booking_crud
+from app.models import Event, User
 
 router = APIRouter(prefix="/bookings",tags=["Bookings"])
 
-@router.get("/")
-async def list_bookings():
-    return {"message": "List of bookings"}
+@router.get("/", response_model=List[BookingWithDetails])
+def list_bookings(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: Session = Depends(get_db)):
+    return _history_page(db, response, None, None, limit, cursor)
 
-@router.post("/")
-def create_booking(booking : BookingCreate, db:Session=Depends(get_db)):
-    return create_booking(db, booking)
+def _seats_changed(event_id: int) -> None:
+    # The routes run in a worker thread, so hop back to the loop the cache lives on
+    anyio.from_thread.run(response_cache.invalidate, "events", f"event:{event_id}")
+
+IDEMPOTENCY_KEY = Header(
+    None, max_length=255,
+    description="Retries with the same key replay the first response instead of repeating the change"
+)
+
+@router.post("/", response_model=BookingRead, status_code=201)
+def create_booking(
+    booking: BookingCreate,
+    request: Request,
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY,
+    db: Session = Depends(get_db)):
+    def create(claim):
+        try:
+            new_booking = booking_crud.create_booking(db, booking, claim)
+        except booking_crud.EventNotFoundError:
+            raise HTTPException(status_code=404, detail="Event not found")
+        except booking_crud.UserNotFoundError:
+            raise HTTPException(status_code=404, detail="User not found")
+        except booking_crud.EventNotPublishedError:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Event is not open for booking", "error_code": "EVENT_NOT_PUBLISHED"},
+            )
+        except booking_crud.SeatsUnavailableError:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Not enough seats available", "error_code": "INSUFFICIENT_SEATS"},
+            )
+        _seats_changed(new_booking.event_id)
+        return new_booking
+    fingerprint = request_fingerprint(request, booking.model_dump_json().encode())
+    return run_idempotent(
+        db, idempotency_key, fingerprint, create, lambda booking_id: booking_crud.booking_read(db, booking_id),
+        BookingRead, status_code=201
+    )
     
-@router.get("/{booking_id}")
-async def get_booking(booking_id: int):
-    return {"message": f"Details of booking {booking_id}"}
+@router.get("/{booking_id}", response_model=BookingRead)
+def get_booking(booking_id: int, db: Session = Depends(get_db)):
+    booking = booking_crud.booking_read(db, booking_id)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return booking
 
 @router.put("/{booking_id}")
 async def update_booking(booking_id: int):
@@ -25,21 +74,66 @@ async def update_booking(booking_id: int):
 async def delete_booking(booking_id: int):
     return {"message": f"Booking {booking_id} deleted"}
 
-@router.get("/user/{user_id}")
-async def list_user_bookings(user_id: int):
-    return {"message": f"List of bookings for user {user_id}"}
+def _history_page(db: Session, response: Response, parent, parent_id: Optional[int], limit: int, cursor: Optional[str], **filters):
+    try:
+        bookings, next_cursor = booking_crud.list_bookings(db, limit=limit, cursor=cursor, **filters)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Only an empty first page needs to tell a missing parent from one without bookings
+    if not bookings and not cursor and parent is not None and db.get(parent, parent_id) is None:
+        raise HTTPException(status_code=404, detail=f"{parent.__name__} not found")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return bookings
+
+@router.get("/user/{user_id}", response_model=List[BookingWithDetails])
+def list_user_bookings(
+    user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: Session = Depends(get_db)):
+    return _history_page(db, response, User, user_id, limit, cursor, user_id=user_id)
 
-@router.get("/event/{event_id}")
-async def list_event_bookings(event_id: int):
-    return {"message": f"List of bookings for event {event_id}"}
+@router.get("/event/{event_id}", response_model=List[BookingWithDetails])
+def list_event_bookings(
+    event_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: Session = Depends(get_db)):
+    return _history_page(db, response, Event, event_id, limit, cursor, event_id=event_id)
 
-@router.post("/{booking_id}/cancel")
-async def cancel_booking(booking_id: int):
-    return {"message": f"Booking {booking_id} cancelled"}
+@router.post("/{booking_id}/cancel", response_model=BookingRead)
+def cancel_booking(booking_id: int, db: Session = Depends(get_db)):
+    try:
+        booking = booking_crud.cancel_booking(db, booking_id)
+    except booking_crud.BookingStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    _seats_changed(booking.event_id)
+    return booking
 
-@router.post("/{booking_id}/confirm")
-async def confirm_booking(booking_id: int):
-    return {"message": f"Booking {booking_id} confirmed"}
+@router.post("/{booking_id}/confirm", response_model=BookingRead)
+def confirm_booking(
+    booking_id: int,
+    request: Request,
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY,
+    db: Session = Depends(get_db)):
+    def confirm(claim):
+        try:
+            booking = booking_crud.confirm_booking(db, booking_id, claim)
+        except booking_crud.BookingStateError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        _seats_changed(booking.event_id)
+        return booking
+    return run_idempotent(
+        db, idempotency_key, request_fingerprint(request), confirm,
+        lambda booking_id: booking_crud.booking_read(db, booking_id), BookingRead
+    )
 
 
 app = FastAPI()
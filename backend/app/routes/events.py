@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Form
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, File, UploadFile, Form, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Awaitable, Callable, Dict, Optional, List, Tuple
+from urllib.parse import urlencode
 from datetime import datetime
-import shutil
-import os
-import uuid
-from pathlib import Path
-from app.core.database import get_db
-from app.crud import event_crud
-from app.schemas.event_schema import EventCreate, EventUpdate, EventResponse
+from app.core.cache import response_cache, pack, unpack
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.event_import import import_events, export_events
+from app.core.poster_variants import generate_poster_variants
+from app.core.storage import poster_storage
+from app.core.read_routing import get_async_read_db, wants_primary
+from app.crud import event_crud, list_version_crud, ticket_crud
+from app.utils.http_cache import make_etag, validator_headers, is_not_modified
+from app.utils.json_encoding import dumps
+from app.utils.uploads import stage_image_upload, StagedUpload, InvalidImageError, UploadTooLargeError
+from app.schemas.event_schema import EventCreate, EventUpdate, EventResponse, EventFilter, EventSort, ResponseFormat, TicketTierCreate, TicketTierAvailability, EVENT_FIELDS, LIST_EVENT_FIELDS, CountMode, DataFormat, EventImportReport, EventBatchUpdate, EventStatusTransition, EventBatchResult
 from app.models import EventStatus, Category
 import json
 
@@ -17,42 +25,31 @@ import json
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-UPLOAD_DIR = Path("uploads/event_posters")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+async def _stage_poster(poster_image: UploadFile) -> StagedUpload:
+    try:
+        return await stage_image_upload(poster_image, poster_storage.staging_dir)
+    except InvalidImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
 
 @router.post("/", response_model=EventResponse, status_code=201)
 async def create_event(
+    background_tasks: BackgroundTasks,
     poster_image: UploadFile = File(None),
     event_data: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     
+    staged = None
     try:
         event_dict = json.loads(event_data)
         # Handle image upload if provided
         poster_url = None
         if poster_image and poster_image.filename:
-            # Validate file type
-            allowed_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-            file_extension = os.path.splitext(poster_image.filename)[1].lower()
-            
-            if file_extension not in allowed_extensions:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
-                )
-            
-            # Generate unique filename
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = UPLOAD_DIR / unique_filename
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(poster_image.file, buffer)
-            
-            # Store relative URL
-            poster_url = f"/uploads/event_posters/{unique_filename}"
+            staged = await _stage_poster(poster_image)
+            poster_url = poster_storage.url(staged.key)
         
         # Add poster_url to event data
         event_dict['poster_url'] = poster_url
@@ -60,97 +57,439 @@ async def create_event(
         # Create event object
         event = EventCreate(**event_dict)
         
-        # Save to database
-        return event_crud.create_event(db, event)
+        # Save to database; the poster is stored before the event commits
+        db_event = await event_crud.create_event(db, event, staged.path if staged else None)
+        if staged:
+            background_tasks.add_task(generate_poster_variants, db_event.id, poster_url)
+        return db_event
         
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON data")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if staged:
+            staged.discard()
+
+FIELDS_DESCRIPTION = "Comma-separated EventResponse fields to return, e.g. id,title,starts_at"
+
+
+def _parse_fields(fields: Optional[str], default: Tuple[str, ...]) -> Tuple[str, ...]:
+    if not fields:
+        return default
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested.difference(EVENT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(f for f in EVENT_FIELDS if f in requested)
+
+
+def _event_dict(event, fields: Tuple[str, ...]) -> dict:
+    row = {}
+    for field in fields:
+        if field == "ticket_tiers":
+            row[field] = [
+                {"tier": t.tier, "price": t.price, "capacity": t.capacity, "available": t.available}
+                for t in event.ticket_tiers
+            ]
+        else:
+            row[field] = getattr(event, field)
+    return row
+
+
+class PageParams:
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+        format: ResponseFormat = Query(ResponseFormat.JSON, description="ndjson streams every match instead of one page"),
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        count: Optional[CountMode] = Query(None, description="Add an X-Total-Count header; estimate uses the query planner, auto is exact only for small results")
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.format = format
+        self.fields = _parse_fields(fields, LIST_EVENT_FIELDS)
+        self.count = count
+
+
+async def _fetch_page(page: PageParams, sort: EventSort, fetch: Callable[..., Awaitable[List]]) -> Tuple[List, Optional[str]]:
+    try:
+        events = await fetch(page.skip, page.limit, page.cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return events, event_crud.next_cursor(events, page.limit, sort)
+
+
+def _query_key(request: Request) -> str:
+    return request.url.path + "?" + urlencode(sorted(request.query_params.multi_items()))
+
+
+async def _cached_json(
+    request: Request,
+    tags: List[str],
+    render: Callable[[], Awaitable[bytes]],
+    version: str = ""
+) -> Response:
+    """Serve a pre-serialized body from the response cache, rendering it on a miss."""
+    if wants_primary(request):
+        # Clients that just wrote must see their own changes
+        value = await render()
+    else:
+        # Keying on the version keeps the body in step with its ETag across workers
+        value = await response_cache.get_or_set(f"{_query_key(request)}#{version}", render, tags)
+    body, headers = unpack(value)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _list_validators(request: Request, db: AsyncSession) -> Tuple[str, Dict[str, str]]:
+    # One primary-key read; every committed change to the events or their seats moves it on
+    version = await list_version_crud.get_version(db)
+    etag = make_etag(_query_key(request), version)
+    return etag, validator_headers(etag, None)
+
+
+async def _total_headers(
+    request: Request,
+    db: AsyncSession,
+    page: PageParams,
+    stmt: Select,
+    cache_key: Optional[str] = None,
+    unfiltered: bool = False
+) -> Dict[str, str]:
+    """X-Total-Count headers for the count mode requested, if any.
+
+    Totals with a cache_key are shared across pages and dropped on event writes.
+    """
+    if page.count is None:
+        return {}
+
+    async def compute() -> bytes:
+        total, mode = await event_crud.count_events(db, stmt, page.count, unfiltered)
+        return f"{total} {mode.value}".encode()
+
+    if cache_key is None or wants_primary(request):
+        value = await compute()
+    else:
+        value = await response_cache.get_or_set(f"events-total:{cache_key}:{page.count.value}", compute, ["events"])
+    total, mode = value.decode().split()
+    return {"X-Total-Count": total, "X-Total-Count-Mode": mode}
+
+
+async def _render_page(db: AsyncSession, page: PageParams, sort: EventSort, stmt: Select) -> bytes:
+    if settings.FAST_JSON_LISTS:
+        # Plain column rows encoded in one pass, skipping ORM objects and Pydantic
+        rows, next_cursor = await _fetch_page(page, sort, lambda skip, limit, cursor: event_crud.get_event_rows(
+            db, stmt, skip, limit, cursor, sort, page.fields))
+        # Drop the id and sort key columns that were only selected for the cursor
+        rows = [{f: row[f] for f in page.fields} for row in rows]
+    else:
+        events, next_cursor = await _fetch_page(page, sort, lambda skip, limit, cursor: event_crud.paginate(
+            db, event_crud.load_fields(stmt, page.fields, sort), skip, limit, cursor, sort))
+        rows = [_event_dict(event, page.fields) for event in events]
+    return pack(dumps(rows), {"X-Next-Cursor": next_cursor} if next_cursor else {})
+
+
+async def _page(
+    request: Request,
+    db: AsyncSession,
+    page: PageParams,
+    sort: EventSort,
+    stmt: Select,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    body, page_headers = unpack(await _render_page(db, page, sort, stmt))
+    page_headers.update(headers or {})
+    page_headers.update(await _total_headers(request, db, page, stmt))
+    return Response(content=body, media_type="application/json", headers=page_headers)
+
+
+def _ndjson(db: AsyncSession, page: PageParams, stmt: Select, sort: EventSort) -> StreamingResponse:
+    stmt = event_crud.load_fields(stmt, page.fields, sort)
+
+    # The request session stays open until the streamed response has finished
+    async def generate():
+        async for event in event_crud.stream_events(db, stmt, sort):
+            yield dumps(_event_dict(event, page.fields)) + b"\n"
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 
 @router.get("/", response_model=List[EventResponse])
-def list_events(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+async def list_events(
+    request: Request,
+    page: PageParams = Depends(),
     status: Optional[EventStatus] = None,
     category: Optional[Category] = None,
-    db: Session = Depends(get_db)):
-    events = event_crud.get_events(db, skip, limit, status, category)
-    return events
+    sort: EventSort = EventSort.ID,
+    db: AsyncSession = Depends(get_async_read_db)):
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events(status, category), sort)
+
+    etag, headers = await _list_validators(request, db)
+    if is_not_modified(request, etag, None):
+        return Response(status_code=304, headers=headers)
+    response = await _cached_json(request, ["events"], lambda: _render_page(
+        db, page, sort, event_crud.query_events(status, category)), etag)
+    response.headers.update(headers)
+    if category is None:
+        # Unfiltered and status-only totals are few enough to cache
+        response.headers.update(await _total_headers(
+            request, db, page, event_crud.query_events(status, None),
+            cache_key=status.value if status else "all", unfiltered=status is None))
+    else:
+        response.headers.update(await _total_headers(request, db, page, event_crud.query_events(status, category)))
+    return response
+
+@router.get("/query", response_model=List[EventResponse])
+async def query_events(
+    request: Request,
+    filters: EventFilter = Depends(),
+    page: PageParams = Depends(),
+    sort: EventSort = EventSort.STARTS_AT,
+    db: AsyncSession = Depends(get_async_read_db)):
+    if filters.starts_after and filters.starts_before and filters.starts_after >= filters.starts_before:
+        raise HTTPException(status_code=400, detail="starts_after must be before starts_before")
+    if filters.min_capacity is not None and filters.max_capacity is not None and filters.min_capacity > filters.max_capacity:
+        raise HTTPException(status_code=400, detail="min_capacity must be less than or equal to max_capacity")
+    if filters.min_price is not None and filters.max_price is not None and filters.min_price > filters.max_price:
+        raise HTTPException(status_code=400, detail="min_price must be less than or equal to max_price")
+
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events_filtered(filters), sort)
+
+    etag, headers = await _list_validators(request, db)
+    if is_not_modified(request, etag, None):
+        return Response(status_code=304, headers=headers)
+    return await _page(request, db, page, sort, event_crud.query_events_filtered(filters), headers)
 
 @router.get("/upcoming", response_model=List[EventResponse])
-def get_upcoming_events(db: Session = Depends(get_db)):
+async def get_upcoming_events(
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
     current_time = datetime.utcnow()
-    events = event_crud.get_upcoming_events(db, current_time)
-    return events
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_upcoming_events(current_time), EventSort.STARTS_AT)
+
+    etag, headers = await _list_validators(request, db)
+    if is_not_modified(request, etag, None):
+        return Response(status_code=304, headers=headers)
+    response = await _cached_json(request, ["events"], lambda: _render_page(
+        db, page, EventSort.STARTS_AT, event_crud.query_upcoming_events(current_time)), etag)
+    response.headers.update(headers)
+    response.headers.update(await _total_headers(request, db, page, event_crud.query_upcoming_events(current_time)))
+    return response
 
 @router.get("/past", response_model=List[EventResponse])
-def get_past_events(db: Session = Depends(get_db)):
+async def get_past_events(
+    request: Request,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
     current_time = datetime.utcnow()
-    events = event_crud.get_past_events(db, current_time)
-    return events
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_past_events(current_time), EventSort.ENDS_AT_DESC)
+
+    etag, headers = await _list_validators(request, db)
+    if is_not_modified(request, etag, None):
+        return Response(status_code=304, headers=headers)
+    return await _page(request, db, page, EventSort.ENDS_AT_DESC, event_crud.query_past_events(current_time), headers)
+
+@router.get("/search", response_model=List[EventResponse])
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[EventStatus] = None,
+    category: Optional[Category] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db)):
+    if start_date and end_date and start_date >= end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    fields = _parse_fields(fields, LIST_EVENT_FIELDS)
+    events = await event_crud.search_events(db, q, status, category, start_date, end_date, skip, limit, fields)
+    return Response(content=dumps([_event_dict(event, fields) for event in events]), media_type="application/json")
 
 @router.get("/search/location", response_model=List[EventResponse])
-def search_events_by_location(
+async def search_events_by_location(
+    request: Request,
     location: str = Query(..., min_length=1),
-    db: Session = Depends(get_db)):
-    events = event_crud.get_events_by_location(db, location)
-    return events
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events_by_location(location), EventSort.ID)
+    return await _page(request, db, page, EventSort.ID, event_crud.query_events_by_location(location))
 
 @router.get("/search/title", response_model=List[EventResponse])
-def search_events_by_title(
+async def search_events_by_title(
+    request: Request,
     keyword: str = Query(..., min_length=1),
-    db: Session = Depends(get_db)):
-    events = event_crud.get_events_by_title_keyword(db, keyword)
-    return events
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events_by_title_keyword(keyword), EventSort.ID)
+    return await _page(request, db, page, EventSort.ID, event_crud.query_events_by_title_keyword(keyword))
 
 @router.get("/search/date-range", response_model=List[EventResponse])
-def get_events_by_date_range(
+async def get_events_by_date_range(
+    request: Request,
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
-    db: Session = Depends(get_db)):
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
     if start_date >= end_date:
         raise HTTPException(status_code=400, detail="start_date must be before end_date")
     
-    events = event_crud.get_events_by_date_range(db, start_date, end_date)
-    return events
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events_by_date_range(start_date, end_date), EventSort.STARTS_AT)
+    return await _page(request, db, page, EventSort.STARTS_AT, event_crud.query_events_by_date_range(start_date, end_date))
 
 @router.get("/search/capacity", response_model=List[EventResponse])
-def get_events_by_capacity(
+async def get_events_by_capacity(
+    request: Request,
     min_capacity: int = Query(..., ge=0),
     max_capacity: int = Query(..., ge=1),
-    db: Session = Depends(get_db)):
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
     if min_capacity > max_capacity:
         raise HTTPException(status_code=400, detail="min_capacity must be less than or equal to max_capacity")
     
-    events = event_crud.get_events_by_capacity(db, min_capacity, max_capacity)
-    return events
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events_by_capacity(min_capacity, max_capacity), EventSort.ID)
+    return await _page(request, db, page, EventSort.ID, event_crud.query_events_by_capacity(min_capacity, max_capacity))
 
 @router.get("/organizer/{organizer_id}", response_model=List[EventResponse])
-def get_events_by_organizer(
+async def get_events_by_organizer(
+    request: Request,
     organizer_id: int,
-    db: Session = Depends(get_db)):
-    events = event_crud.get_events_by_organizer(db, organizer_id)
-    return events
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)):
+    if page.format == ResponseFormat.NDJSON:
+        return _ndjson(db, page, event_crud.query_events_by_organizer(organizer_id), EventSort.ID)
+    return await _page(request, db, page, EventSort.ID, event_crud.query_events_by_organizer(organizer_id))
+
+@router.patch("/batch", response_model=EventBatchResult)
+async def update_events_batch(batch: EventBatchUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Apply the same changes to many events in a single UPDATE."""
+    changes = batch.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given")
+    if "poster_url" in changes:
+        raise HTTPException(status_code=400, detail="poster_url cannot be changed in a batch")
+    if "status" in changes:
+        # Status changes must go through the allowed transitions
+        raise HTTPException(status_code=400, detail="status cannot be changed in a batch; use /events/batch/status")
+    if batch.changes.starts_at and batch.changes.ends_at and batch.changes.starts_at >= batch.changes.ends_at:
+        raise HTTPException(status_code=400, detail="starts_at must be before ends_at")
+
+    updated_ids = await event_crud.update_events(db, batch.ids, batch.changes)
+    return EventBatchResult(updated_ids=updated_ids, skipped_ids=sorted(set(batch.ids) - set(updated_ids)))
+
+@router.post("/batch/status", response_model=EventBatchResult)
+async def transition_events_status(transition: EventStatusTransition, db: AsyncSession = Depends(get_async_db)):
+    """Move a set of events to another status in a single UPDATE, e.g. publish all of an organizer's drafts."""
+    if transition.organizer_id is None and not transition.ids:
+        raise HTTPException(status_code=400, detail="organizer_id or ids is required")
+    allowed = event_crud.STATUS_TRANSITIONS[transition.to_status]
+    if not allowed or (transition.from_status and transition.from_status not in allowed):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Events cannot be moved to {transition.to_status.value}"
+            + (f" from {transition.from_status.value}" if transition.from_status else "")
+        )
+
+    updated_ids = await event_crud.transition_events_status(
+        db, transition.to_status, transition.from_status, transition.organizer_id, transition.ids
+    )
+    skipped_ids = sorted(set(transition.ids) - set(updated_ids)) if transition.ids else []
+    return EventBatchResult(updated_ids=updated_ids, skipped_ids=skipped_ids)
+
+@router.post("/import", response_model=EventImportReport)
+async def import_events_file(
+    request: Request,
+    format: DataFormat = DataFormat.CSV,
+    db: AsyncSession = Depends(get_async_db)):
+    """Bulk-create events from a CSV or NDJSON request body, streamed and loaded in COPY batches."""
+    return await import_events(db, request.stream(), format)
+
+@router.get("/export")
+async def export_events_file(
+    filters: EventFilter = Depends(),
+    format: DataFormat = DataFormat.CSV,
+    db: AsyncSession = Depends(get_async_read_db)):
+    media_type = "text/csv" if format == DataFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        export_events(db, event_crud.query_events_filtered(filters), format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="events.{format.value}"'}
+    )
 
 @router.get("/{event_id}", response_model=EventResponse)
-def read_event(event_id: int, db: Session = Depends(get_db)):
-    event = event_crud.get_event(db, event_id)
-    if not event:
+async def read_event(
+    request: Request,
+    event_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db)):
+    fields = _parse_fields(fields, EVENT_FIELDS)
+    updated_at = await event_crud.get_event_version(db, event_id)
+    if updated_at is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event
+
+    etag = make_etag("event", event_id, updated_at.isoformat())
+    headers = validator_headers(etag, updated_at)
+    # Answer revalidations before loading the event or building the response model
+    if is_not_modified(request, etag, updated_at):
+        return Response(status_code=304, headers=headers)
+
+    async def render() -> bytes:
+        event = await event_crud.get_event(db, event_id, fields)
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        if fields == EVENT_FIELDS:
+            return pack(EventResponse.model_validate(event).model_dump_json().encode())
+        return pack(dumps(_event_dict(event, fields)))
+    response = await _cached_json(request, [f"event:{event_id}"], render, etag)
+    response.headers.update(headers)
+    return response
+
+@router.get("/{event_id}/tickets", response_model=List[TicketTierAvailability])
+async def get_ticket_tiers(event_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    if not await event_crud.get_event(db, event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    return await ticket_crud.get_tickets_by_event(db, event_id)
+
+@router.post("/{event_id}/tickets", response_model=TicketTierAvailability, status_code=201)
+async def create_ticket_tier(
+    event_id: int,
+    ticket_tier: TicketTierCreate,
+    db: AsyncSession = Depends(get_async_db)):
+    try:
+        tier = await ticket_crud.create_ticket(db, event_id, ticket_tier)
+    except ticket_crud.DuplicateTierError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ticket_crud.TierCapacityError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if tier is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return tier
 
 @router.put("/{event_id}", response_model=EventResponse)
 async def update_event(
     event_id: int,
+    background_tasks: BackgroundTasks,
     poster_image: UploadFile = File(None),
     event_data: str = Form(None),
-    db: Session = Depends(get_db)):
+    db: AsyncSession = Depends(get_async_db)):
     """Update an event with optional new poster image"""
     import json
     
     # Get existing event
-    existing_event = event_crud.get_event(db, event_id)
+    existing_event = await event_crud.get_event(db, event_id)
     if not existing_event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -162,46 +501,32 @@ async def update_event(
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid JSON data")
     
-    # Handle new image upload
+    # Handle new image upload; the old poster is released and left to garbage collection
+    staged = None
     if poster_image and poster_image.filename:
-        # Delete old image if exists
-        if existing_event.poster_url:
-            old_file_path = Path(".") / existing_event.poster_url.lstrip("/")
-            if old_file_path.exists():
-                old_file_path.unlink()
-        
-        # Save new image
-        file_extension = os.path.splitext(poster_image.filename)[1].lower()
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = UPLOAD_DIR / unique_filename
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(poster_image.file, buffer)
-        
-        update_dict['poster_url'] = f"/uploads/event_posters/{unique_filename}"
+        staged = await _stage_poster(poster_image)
+        update_dict['poster_url'] = poster_storage.url(staged.key)
     
-    # Update event
-    updated_event = EventUpdate(**update_dict)
-    event = event_crud.update_event(db, event_id, updated_event)
-    
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    try:
+        # Update event
+        updated_event = EventUpdate(**update_dict)
+        try:
+            event = await event_crud.update_event(db, event_id, updated_event, staged.path if staged else None)
+        except event_crud.CapacityError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+    finally:
+        if staged:
+            staged.discard()
+    if update_dict.get('poster_url'):
+        background_tasks.add_task(generate_poster_variants, event.id, update_dict['poster_url'])
     return event
 
 @router.delete("/{event_id}", status_code=204)
-def delete_event(event_id: int, db: Session = Depends(get_db)):
-    # Get event to delete image
-    event = event_crud.get_event(db, event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Delete image file if exists
-    if event.poster_url:
-        file_path = Path(".") / event.poster_url.lstrip("/")
-        if file_path.exists():
-            file_path.unlink()
-    
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
     # Delete event from database
-    success = event_crud.delete_event(db, event_id)
+    success = await event_crud.delete_event(db, event_id)
     if not success:
         raise HTTPException(status_code=404, detail="Event not found")
\ No newline at end of file
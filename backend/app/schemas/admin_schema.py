@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Optional
+from enum import Enum
+
+class EventStatsSort(str, Enum):
+    REVENUE = "revenue"
+    BOOKINGS = "bookings"
+    SELL_THROUGH = "sell_through"
+
+class StatsBucket(BaseModel):
+    events: int
+    confirmed_bookings: int
+    revenue: float
+    tickets_sold: int
+    capacity: int
+    # Share of the capacity sold, 0..1
+    sell_through: float
+
+class StatsOverview(BaseModel):
+    refreshed_at: Optional[datetime] = None
+    totals: StatsBucket
+    by_status: Dict[str, StatsBucket]
+    by_category: Dict[str, StatsBucket]
+
+class EventStatsRow(BaseModel):
+    event_id: int
+    title: str
+    status: str
+    category: str
+    capacity: int
+    tickets_sold: int
+    tickets_held: int
+    confirmed_bookings: int
+    pending_bookings: int
+    revenue: float
+    sell_through: float
+
+class EventStatsPage(BaseModel):
+    refreshed_at: Optional[datetime] = None
+    events: List[EventStatsRow]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 
 class BookingStatus(str, Enum):
@@ -15,6 +15,22 @@ class PaymentStatus(str, Enum):
     PARTIAL = "PARTIAL"
     REFUNDED = "REFUNDED"
 
+class TicketTier(str, Enum):
+    GA = "GA"
+    VIP = "VIP"
+    PA = "PA"
+
+class BookingItemCreate(BaseModel):
+    tier: TicketTier
+    quantity: int = Field(..., gt=0, le=20)
+
+class BookingItemRead(BaseModel):
+    tier: TicketTier
+    quantity: int
+    unit_price: float
+
+    model_config = {"from_attributes": True}
+
 class BookingBase(BaseModel):
     event_id: int = Field(..., gt=0, description="ID of the event to book")
     quantity: int = Field(..., gt=0, le=20, description="Number of tickets (1-20)")
@@ -46,7 +62,21 @@ class BookingBase(BaseModel):
     }
 
 class BookingCreate(BookingBase):
-    pass
+    user_id: int = Field(..., gt=0, description="ID of the user making the booking")
+    items: Optional[List[BookingItemCreate]] = Field(
+        None, description="Per-tier breakdown of the tickets; defaults to GA"
+    )
+
+    @validator("items")
+    def validate_items(cls, v, values):
+        if v is None:
+            return v
+        tiers = [item.tier for item in v]
+        if len(tiers) != len(set(tiers)):
+            raise ValueError("Each ticket tier may only appear once")
+        if "quantity" in values and sum(item.quantity for item in v) != values["quantity"]:
+            raise ValueError("Item quantities must add up to quantity")
+        return v
 
 class BookingRead(BaseModel):
     id: int
@@ -58,6 +88,8 @@ class BookingRead(BaseModel):
     status: BookingStatus = BookingStatus.PENDING
     payment_status: PaymentStatus = PaymentStatus.UNPAID
     booked_at: datetime
+    hold_expires_at: Optional[datetime] = None
+    items: List[BookingItemRead] = []
 
     attendee_name: Optional[str] = None
     attendee_email: Optional[str] = None
@@ -112,19 +144,17 @@ class BookingUpdate(BaseModel):
 class EventSummary(BaseModel):
     id: int
     title: str
-    event_date: datetime
-    venue_name: Optional[str] = None
-    city: Optional[str] = None
-    price: float
-    currency: str = "LKR"
+    starts_at: datetime
+    location: Optional[str] = None
+    status: str
 
     model_config = {"from_attributes": True}
 
 class UserSummary(BaseModel):
     id: int
-    name: str
+    first_name: str
+    last_name: str
     email: str
-    phone: Optional[str] = None
 
     model_config = {"from_attributes": True}
 
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, List
 from enum import Enum
 
 class EventStatus(str, Enum):
@@ -17,6 +17,57 @@ class Category(str, Enum):
     MEETUP = "MEETUP"
     OTHER = "OTHER"
 
+class EventSort(str, Enum):
+    ID = "id"
+    STARTS_AT = "starts_at"
+    ENDS_AT_DESC = "-ends_at"
+
+class ResponseFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    # Planner estimate, replaced by an exact count when it is small
+    AUTO = "auto"
+
+class DataFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class TicketTier(str, Enum):
+    GA = "GA"
+    VIP = "VIP"
+    PA = "PA"
+
+class TicketTierCreate(BaseModel):
+    tier: TicketTier
+    price: float = Field(0.0, ge=0)
+    capacity: int = Field(..., gt=0)
+
+class TicketTierAvailability(BaseModel):
+    tier: TicketTier
+    price: float
+    capacity: int
+    available: int
+
+    model_config = {
+        "from_attributes": True
+    }
+
+class EventFilter(BaseModel):
+    status: Optional[EventStatus] = None
+    category: Optional[Category] = None
+    starts_after: Optional[datetime] = None
+    starts_before: Optional[datetime] = None
+    min_capacity: Optional[int] = Field(None, ge=0)
+    max_capacity: Optional[int] = Field(None, ge=0)
+    min_price: Optional[float] = Field(None, ge=0, description="Minimum GA ticket price")
+    max_price: Optional[float] = Field(None, ge=0, description="Maximum GA ticket price")
+    organizer_id: Optional[int] = None
+    location: Optional[str] = Field(None, min_length=1)
+
 class EventBase(BaseModel):
     title: str
     description: str
@@ -34,6 +85,16 @@ class EventCreate(EventBase):
     organizer_id: int
     status: EventStatus = EventStatus.DRAFT
 
+class EventImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class EventImportReport(BaseModel):
+    imported: int
+    failed: int
+    # Capped at IMPORT_MAX_REPORTED_ERRORS; failed always has the full count
+    errors: List[EventImportError] = []
+
 class EventUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -48,6 +109,22 @@ class EventUpdate(BaseModel):
     pa_ticket_price: Optional[float] = None  
     poster_url: Optional[str] = None  
 
+class EventBatchUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=10000)
+    changes: EventUpdate
+
+class EventStatusTransition(BaseModel):
+    to_status: EventStatus
+    from_status: Optional[EventStatus] = None
+    # At least one of organizer_id / ids must narrow the transition
+    organizer_id: Optional[int] = None
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+
+class EventBatchResult(BaseModel):
+    updated_ids: List[int]
+    # Requested ids that were missing or did not satisfy the update's conditions
+    skipped_ids: List[int] = []
+
 class EventRead(EventBase):
     id: int
     status: EventStatus
@@ -62,7 +139,8 @@ class EventRead(EventBase):
 class EventResponse(BaseModel):
     id: int
     title: str
-    description: str
+    # Left out of list responses unless requested through fields=
+    description: Optional[str] = None
     category: Category
     status: EventStatus
     location: str
@@ -76,6 +154,10 @@ class EventResponse(BaseModel):
     vip_ticket_price: Optional[float] = None
     pa_ticket_price: Optional[float] = None
     poster_url: Optional[str] = None 
+    # Format -> srcset, e.g. {"webp": "/uploads/.../x-320w.webp 320w, ..."}
+    poster_variants: Optional[Dict[str, str]] = None
+    tickets_available: Optional[int] = None
+    ticket_tiers: List[TicketTierAvailability] = []
 
     model_config = {
         "from_attributes": True,
@@ -96,7 +178,20 @@ class EventResponse(BaseModel):
                 "ga_ticket_price": 50.0,
                 "vip_ticket_price": 150.0,
                 "pa_ticket_price": 100.0,
-                "poster_url": "/uploads/event_posters/example.jpg"
+                "poster_url": "/uploads/event_posters/example.jpg",
+                "poster_variants": {
+                    "webp": "/uploads/event_posters/example-320w.webp 320w, /uploads/event_posters/example-640w.webp 640w",
+                    "jpeg": "/uploads/event_posters/example-320w.jpg 320w, /uploads/event_posters/example.jpg 800w"
+                },
+                "tickets_available": 420,
+                "ticket_tiers": [
+                    {"tier": "GA", "price": 50.0, "capacity": 400, "available": 350},
+                    {"tier": "VIP", "price": 150.0, "capacity": 100, "available": 70}
+                ]
             }
         }
-    }
\ No newline at end of file
+    }
+
+# Fields selectable through fields=; list endpoints leave out description by default
+EVENT_FIELDS = tuple(EventResponse.model_fields)
+LIST_EVENT_FIELDS = tuple(f for f in EVENT_FIELDS if f != "description")
@@ -0,0 +1,61 @@
+import logging
+import smtplib
+from email.message import EmailMessage
+from typing import List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class EmailSender:
+    """Delivers one plain-text email; raising marks the attempt as failed."""
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        raise NotImplementedError
+
+
+class SmtpEmailSender(EmailSender):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        timeout: float = 30
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+        await run_in_threadpool(self._deliver, message)
+
+    def _deliver(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+
+class FakeEmailSender(EmailSender):
+    """Records messages instead of sending them, for local development and tests."""
+
+    def __init__(self):
+        self.sent: List[Tuple[str, str, str]] = []
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        self.sent.append((recipient, subject, body))
+        logger.info("Email to %s: %s", recipient, subject)
@@ -0,0 +1,28 @@
+import json
+from typing import Any, Dict
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) over a statement, keeping its parameters bound."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.statement, **kw)
+
+
+def top_plan(result: Any) -> Dict[str, Any]:
+    """The root plan node from the single value EXPLAIN (FORMAT JSON) returns."""
+    # asyncpg hands json back as text, psycopg2 decodes it
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
@@ -0,0 +1,26 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - pinned in requirements.txt; stdlib json is the fallback
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Encode plain Python data (dicts, lists, datetimes) to JSON bytes in one pass."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
@@ -0,0 +1,30 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Build an opaque cursor from the sort key values of the last row of a page."""
+    payload = {
+        "s": sort,
+        "k": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, types: Sequence[type]) -> List[Any]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        if payload["s"] != sort or len(values) != len(types):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,84 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes of the accepted poster formats
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+
+class InvalidImageError(Exception):
+    pass
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+class StagedUpload(NamedTuple):
+    path: Path
+    # sha256 of the content plus the sniffed extension
+    key: str
+    size: int
+
+    def discard(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+
+def sniff_image_extension(head: bytes) -> Optional[str]:
+    """Return the file extension matching the image's magic bytes, or None."""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+async def stage_image_upload(upload: UploadFile, directory: Path, max_bytes: Optional[int] = None) -> StagedUpload:
+    """Stream an uploaded image into a temp file in directory, hashing it on the way.
+
+    Chunks are hashed and written from the thread pool. The caller hands the
+    staged file to the poster storage, which renames it into place under its
+    content key, so readers never see a partial poster.
+    """
+    max_bytes = max_bytes or settings.POSTER_MAX_BYTES
+    head = await upload.read(CHUNK_SIZE)
+    extension = sniff_image_extension(head)
+    if extension is None:
+        raise InvalidImageError("Unsupported image type. Allowed types: JPEG, PNG, GIF, WebP")
+
+    fd, temp_path = await run_in_threadpool(tempfile.mkstemp, dir=directory, suffix=".part")
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            def write(data: bytes) -> None:
+                digest.update(data)
+                buffer.write(data)
+
+            size = 0
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Image exceeds the {max_bytes} byte limit")
+                await run_in_threadpool(write, chunk)
+                chunk = await upload.read(CHUNK_SIZE)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+    return StagedUpload(Path(temp_path), f"{digest.hexdigest()}{extension}", size)
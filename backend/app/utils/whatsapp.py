@@ -0,0 +1,52 @@
+import json
+import logging
+import urllib.request
+from typing import List, Tuple
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class WhatsAppSender:
+    """Delivers one text message to a phone number; raising marks the attempt as failed."""
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        raise NotImplementedError
+
+
+class CloudApiWhatsAppSender(WhatsAppSender):
+    """Sends text messages through the WhatsApp Cloud API."""
+
+    def __init__(self, api_url: str, phone_number_id: str, access_token: str, timeout: float = 30):
+        self.url = f"{api_url.rstrip('/')}/{phone_number_id}/messages"
+        self.access_token = access_token
+        self.timeout = timeout
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": recipient,
+            "type": "text",
+            "text": {"body": f"{subject}\n\n{body}"},
+        }
+        await run_in_threadpool(self._post, json.dumps(payload).encode())
+
+    def _post(self, data: bytes) -> None:
+        request = urllib.request.Request(self.url, data=data, method="POST", headers={
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        })
+        # Non-2xx responses raise HTTPError
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class FakeWhatsAppSender(WhatsAppSender):
+    """Records messages instead of sending them, for local development and tests."""
+
+    def __init__(self):
+        self.sent: List[Tuple[str, str, str]] = []
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        self.sent.append((recipient, subject, body))
+        logger.info("WhatsApp message to %s: %s", recipient, subject)
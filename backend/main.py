@@ -1,10 +1,22 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+import asyncio
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 from app.routes import events
 from app.routes import user_router as User
-from app.core.database import Base, engine
+from app.routes import booking
+from app.routes import admin
+from app.core.config import settings
+from app.core.database import Base, engine, async_engine, ping_database, pool_status
+from app.core.hold_sweeper import run_hold_sweeper
+from app.core.idempotency import run_idempotency_purge
+from app.core.poster_gc import run_poster_gc
+from app.core.poster_variants import shutdown_pool
+from app.core.read_routing import replica_router, READ_YOUR_WRITES_COOKIE
+from app.core.stats_refresher import run_stats_refresher
+from app.core.static_files import CachedStaticFiles
 from app.models.event import Event
 
 app = FastAPI(
@@ -22,12 +34,47 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    # Pin the client's reads to the primary for a short while after it writes
+    if replica_router.engines and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time() + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Turn away oversized poster uploads from the Content-Length header, before the body is read
+    content_length = request.headers.get("content-length")
+    is_form = request.headers.get("content-type", "").startswith("multipart/form-data")
+    if is_form and content_length and content_length.isdigit():
+        if int(content_length) > settings.POSTER_MAX_BYTES + settings.UPLOAD_FORM_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": "Request body too large"})
+    return await call_next(request)
+
 upload_dir = Path("uploads")
 event_posters_dir = upload_dir / "event_posters"
 event_posters_dir.mkdir(parents=True, exist_ok=True)
 
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", CachedStaticFiles(
+    directory="uploads",
+    max_age=settings.STATIC_MAX_AGE_SECONDS,
+    accel_redirect_prefix=settings.UPLOADS_ACCEL_REDIRECT_PREFIX
+), name="uploads")
+
+# Frontend assets (bootstrap css/js); run app.core.precompress to add .gz/.br siblings
+if Path(settings.FRONTEND_STATIC_DIR).is_dir():
+    app.mount("/static", CachedStaticFiles(
+        directory=settings.FRONTEND_STATIC_DIR,
+        max_age=settings.STATIC_MAX_AGE_SECONDS
+    ), name="static")
 
 @app.on_event("startup")
 def startup_event():
@@ -41,8 +88,61 @@ def startup_event():
     print("=" * 50)
 
 
+@app.on_event("startup")
+async def start_hold_sweeper():
+    app.state.hold_sweeper = asyncio.create_task(run_hold_sweeper())
+
+
+@app.on_event("startup")
+async def start_poster_gc():
+    app.state.poster_gc = asyncio.create_task(run_poster_gc())
+
+
+@app.on_event("startup")
+async def start_idempotency_purge():
+    app.state.idempotency_purge = asyncio.create_task(run_idempotency_purge())
+
+
+@app.on_event("startup")
+async def start_stats_refresher():
+    app.state.stats_refresher = asyncio.create_task(run_stats_refresher())
+
+
+@app.on_event("shutdown")
+async def stop_hold_sweeper():
+    app.state.hold_sweeper.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_poster_gc():
+    app.state.poster_gc.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_idempotency_purge():
+    app.state.idempotency_purge.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_stats_refresher():
+    app.state.stats_refresher.cancel()
+
+
+@app.on_event("shutdown")
+def stop_poster_workers():
+    shutdown_pool()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
+    await replica_router.dispose()
+
+
 app.include_router(events.router)
 app.include_router(User.router)
+app.include_router(booking.router)
+app.include_router(admin.router)
 
 @app.get("/")
 def root():
@@ -54,9 +154,27 @@ def root():
     }
 
 @app.get("/health")
-def health_check():
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "upload_directory": str(event_posters_dir.absolute())
-    }
\ No newline at end of file
+async def health_check():
+    try:
+        latency_ms = await asyncio.wait_for(ping_database(), settings.DB_HEALTH_CHECK_TIMEOUT)
+        database = {"status": "connected", "latency_ms": round(latency_ms, 2)}
+    except Exception as e:
+        database = {"status": "unreachable", "error": str(e) or e.__class__.__name__}
+
+    pools = pool_status()
+    utilization = pools["async"]["utilization"]
+    # Report unhealthy before the pool is exhausted so the load balancer can shed traffic;
+    # with unlimited overflow it never is
+    saturated = utilization is not None and utilization >= settings.DB_POOL_SATURATION_THRESHOLD
+    healthy = database["status"] == "connected" and not saturated
+
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "database": database,
+            "pool": pools,
+            "replicas": replica_router.status(),
+            "upload_directory": str(event_posters_dir.absolute())
+        }
+    )
@@ -0,0 +1,197 @@
+"""Fixtures for tests against a disposable PostgreSQL database.
+
+Set TEST_DB_NAME (and TEST_DB_HOST, TEST_DB_PORT, TEST_DB_USER,
+TEST_DB_PASSWORD as needed) to a database the suite may drop and recreate;
+without it every test is skipped.
+"""
+import itertools
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import pytest
+
+TEST_DB_NAME = os.getenv("TEST_DB_NAME")
+
+# Settings are read at import time, so point the app at the test database first
+if TEST_DB_NAME:
+    os.environ["DB_NAME"] = TEST_DB_NAME
+    for name in ("HOST", "PORT", "USER", "PASSWORD"):
+        if f"TEST_DB_{name}" in os.environ:
+            os.environ[f"DB_{name}"] = os.environ[f"TEST_DB_{name}"]
+    os.environ["DB_REPLICA_URLS"] = ""
+    os.environ["CACHE_BACKEND"] = "none"
+
+import httpx
+from sqlalchemy import event as sa_event, text
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, engine, async_engine
+from app.models import Event, User, UserRole
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DB_NAME:
+        return
+    skip = pytest.mark.skip(reason="TEST_DB_NAME is not set")
+    for item in items:
+        item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def database():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(database):
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with database.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+async def async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def client():
+    """Client for the sync routes; async routes need async_client."""
+    from fastapi.testclient import TestClient
+    from main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+async def async_client():
+    from main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    # Pooled asyncpg connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def make_user(db):
+    counter = itertools.count(1)
+
+    def make(**values) -> User:
+        n = next(counter)
+        user = User(**{
+            "email": f"user{n}@example.com",
+            "first_name": "Test",
+            "last_name": f"User {n}",
+            "role": UserRole.CUSTOMER.value,
+            "hashed_password": "not-a-hash",
+            **values,
+        })
+        db.add(user)
+        db.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def make_event(db, make_user):
+    def make(organizer: User = None, **values) -> Event:
+        starts_at = datetime.now(timezone.utc) + timedelta(days=30)
+        event = Event(**{
+            "title": "Test event",
+            "description": "An event created by the test suite",
+            "category": "CONCERT",
+            "status": "PUBLISHED",
+            "location": "Colombo",
+            "starts_at": starts_at,
+            "ends_at": starts_at + timedelta(hours=3),
+            "capacity": 100,
+            "ga_ticket_price": 1000.0,
+            "organizer_id": (organizer or make_user()).id,
+            **values,
+        })
+        db.add(event)
+        db.commit()
+        return event
+    return make
+
+
+@pytest.fixture
+def poster_dir(tmp_path, monkeypatch):
+    """Keep uploaded posters in a temporary directory and skip building their variants."""
+    from app.core.storage import poster_storage
+    monkeypatch.setattr(poster_storage, "root", tmp_path)
+    monkeypatch.setattr(poster_storage, "staging_dir", tmp_path)
+
+    async def no_variants(event_id, poster_url):
+        pass
+    monkeypatch.setattr("app.routes.events.generate_poster_variants", no_variants)
+    return tmp_path
+
+
+SEED_EVENTS_SQL = text("""
+    INSERT INTO events (
+        title, description, category, status, location, starts_at, ends_at, capacity,
+        organizer_id, ga_ticket_price, vip_ticket_price, pa_ticket_price
+    )
+    SELECT
+        (ARRAY['Jazz', 'Rock', 'Data', 'Cloud', 'Cricket', 'Startup', 'Poetry', 'Chess'])[1 + n % 8]
+            || ' ' || (ARRAY['night', 'summit', 'workshop', 'final', 'meetup', 'festival'])[1 + n % 6] || ' ' || n,
+        'Seeded event number ' || n,
+        (ARRAY['CONFERENCE', 'CONCERT', 'WORKSHOP', 'SPORTS', 'MEETUP', 'OTHER'])[1 + n % 6],
+        (ARRAY['PUBLISHED', 'PUBLISHED', 'PUBLISHED', 'DRAFT', 'CANCELLED', 'COMPLETED'])[1 + n % 6],
+        (ARRAY['Colombo', 'Kandy', 'Galle', 'Jaffna', 'Negombo'])[1 + n % 5] || ' hall ' || n % 97,
+        now() + (n % 1460 - 730) * interval '1 day' + n % 24 * interval '1 hour',
+        now() + (n % 1460 - 730) * interval '1 day' + (n % 24 + 3) * interval '1 hour',
+        10 + n::bigint * 7919 % 10000,
+        :organizer_id + n % :organizers,
+        n::bigint * 104729 % 20000 / 4.0, 0, 0
+    FROM generate_series(1, :count) AS n
+""")
+
+
+@pytest.fixture
+def seed_events(database, make_user):
+    """Bulk-insert count varied events from a handful of organizers and vacuum the table."""
+    def seed(count: int, organizers: int = 20) -> int:
+        first = make_user()
+        for _ in range(organizers - 1):
+            make_user()
+        with database.begin() as conn:
+            conn.execute(SEED_EVENTS_SQL, {"count": count, "organizer_id": first.id, "organizers": organizers})
+        # Vacuum too, so plans do not shift when autovacuum later sets the visibility map
+        with database.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE events"))
+        return first.id
+    return seed
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager collecting the SQL statements an engine sends while it is open."""
+    @contextmanager
+    def counting(target=engine):
+        target = getattr(target, "sync_engine", target)
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sa_event.listen(target, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            sa_event.remove(target, "before_cursor_execute", record)
+    return counting
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import text
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.crud import admin_crud
+
+pytestmark = pytest.mark.anyio
+
+
+def test_metadata_drops_and_recreates_the_stats_view():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT to_regclass('event_stats')")) == "event_stats"
+
+
+async def test_stats_requests_do_not_refresh_the_view(async_client, make_event):
+    make_event()
+    response = await async_client.get("/admin/stats")
+    assert response.status_code == 200
+    # Nothing has refreshed the view yet, and the request did not either
+    assert response.json()["refreshed_at"] is None
+
+    async with AsyncSessionLocal() as db:
+        refreshed_at = await admin_crud.refresh_event_stats(db, max_staleness=0)
+    response = await async_client.get("/admin/stats")
+    assert response.json()["refreshed_at"] is not None
+    assert response.json()["totals"]["events"] == 1
+    assert refreshed_at is not None
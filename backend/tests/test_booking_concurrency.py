@@ -0,0 +1,118 @@
+"""Load test for the booking engine: concurrent bookings must never oversell."""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import func, select
+from app.core.database import SessionLocal
+from app.crud import booking_crud
+from app.models import Booking, Event, TicketInventory
+from app.schemas.booking_schema import BookingCreate, BookingItemCreate, TicketTier
+
+# Stays below DB_POOL_SIZE + DB_MAX_OVERFLOW so no thread waits out the pool timeout
+THREADS = int(os.getenv("BOOKING_LOAD_THREADS", "25"))
+ATTEMPTS_PER_THREAD = int(os.getenv("BOOKING_LOAD_ATTEMPTS", "8"))
+
+
+def _run_load(requests):
+    """Fire BookingCreate requests from THREADS threads at once; returns (booked, refused, seconds)."""
+    start = threading.Barrier(THREADS)
+    chunks = [requests[i::THREADS] for i in range(THREADS)]
+
+    def worker(chunk):
+        booked = refused = 0
+        db = SessionLocal()
+        try:
+            start.wait()
+            for request in chunk:
+                try:
+                    booking_crud.create_booking(db, request)
+                    booked += 1
+                except booking_crud.SeatsUnavailableError:
+                    refused += 1
+        finally:
+            db.close()
+        return booked, refused
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(worker, chunks))
+    elapsed = time.perf_counter() - began
+    return sum(r[0] for r in results), sum(r[1] for r in results), elapsed
+
+
+def test_concurrent_bookings_never_oversell(db, make_user, make_event):
+    capacity = THREADS * ATTEMPTS_PER_THREAD // 2
+    event = make_event(capacity=capacity)
+    users = [make_user() for _ in range(THREADS)]
+    requests = [
+        BookingCreate(user_id=users[i % THREADS].id, event_id=event.id, quantity=1 + i % 2)
+        for i in range(THREADS * ATTEMPTS_PER_THREAD)
+    ]
+
+    booked, refused, elapsed = _run_load(requests)
+
+    db.expire_all()
+    event = db.get(Event, event.id)
+    booked_seats = db.scalar(select(func.coalesce(func.sum(Booking.quantity), 0)).where(Booking.event_id == event.id))
+    print(f"\n{booked} bookings, {refused} refused in {elapsed:.2f}s: {len(requests) / elapsed:.0f} requests/s")
+    assert booked + refused == len(requests)
+    assert refused > 0
+    assert event.tickets_sold + event.tickets_held <= event.capacity
+    assert event.tickets_held == booked_seats
+    # Every refusal came when fewer seats were left than it asked for
+    assert event.capacity - event.tickets_held <= 1
+
+
+def test_concurrent_multi_tier_bookings_never_oversell(db, make_user, make_event):
+    event = make_event(capacity=120)
+    db.add_all([
+        TicketInventory(event_id=event.id, tier=TicketTier.GA.value, price=1000, capacity=80),
+        TicketInventory(event_id=event.id, tier=TicketTier.VIP.value, price=5000, capacity=40),
+    ])
+    db.commit()
+    user = make_user()
+    mixes = [
+        [BookingItemCreate(tier=TicketTier.GA, quantity=2)],
+        [BookingItemCreate(tier=TicketTier.VIP, quantity=1), BookingItemCreate(tier=TicketTier.GA, quantity=1)],
+        [BookingItemCreate(tier=TicketTier.GA, quantity=1), BookingItemCreate(tier=TicketTier.VIP, quantity=2)],
+    ]
+    requests = [
+        BookingCreate(user_id=user.id, event_id=event.id, quantity=sum(i.quantity for i in items), items=items)
+        for n in range(THREADS * ATTEMPTS_PER_THREAD)
+        for items in [mixes[n % len(mixes)]]
+    ]
+
+    booked, refused, elapsed = _run_load(requests)
+
+    db.expire_all()
+    print(f"\n{booked} multi-tier bookings, {refused} refused in {elapsed:.2f}s")
+    assert refused > 0
+    for tier in db.scalars(select(TicketInventory).where(TicketInventory.event_id == event.id)):
+        assert tier.sold + tier.held <= tier.capacity
+    event = db.get(Event, event.id)
+    assert event.tickets_sold + event.tickets_held <= event.capacity
+
+
+def test_booking_errors_distinguish_missing_and_unpublished_events(db, make_user, make_event):
+    user = make_user()
+    draft = make_event(status="DRAFT")
+
+    with pytest.raises(booking_crud.EventNotFoundError):
+        booking_crud.create_booking(db, BookingCreate(user_id=user.id, event_id=999_999, quantity=1))
+    with pytest.raises(booking_crud.EventNotPublishedError):
+        booking_crud.create_booking(db, BookingCreate(user_id=user.id, event_id=draft.id, quantity=1))
+    with pytest.raises(booking_crud.UserNotFoundError):
+        booking_crud.create_booking(db, BookingCreate(user_id=999_999, event_id=make_event().id, quantity=1))
+    assert db.scalar(select(func.count()).select_from(Booking)) == 0
+
+
+def test_booking_route_maps_errors(client, make_user, make_event):
+    user = make_user()
+    assert client.post("/bookings/", json={"user_id": user.id, "event_id": 999_999, "quantity": 1}).status_code == 404
+    response = client.post("/bookings/", json={"user_id": user.id, "event_id": make_event(status="DRAFT").id, "quantity": 1})
+    assert response.status_code == 409
+    assert response.json()["detail"]["error_code"] == "EVENT_NOT_PUBLISHED"
+    event = make_event()
+    assert client.post("/bookings/", json={"user_id": 999_999, "event_id": event.id, "quantity": 1}).status_code == 404
@@ -0,0 +1,66 @@
+import pytest
+from app.core.database import engine
+from app.crud import booking_crud
+from app.schemas.booking_schema import BookingCreate
+
+
+@pytest.fixture
+def bookings(db, make_user, make_event):
+    """60 bookings by one user, spread over three events and a second user."""
+    user, other = make_user(), make_user()
+    events = [make_event(capacity=1000) for _ in range(3)]
+    for i in range(60):
+        booking_crud.create_booking(db, BookingCreate(user_id=user.id, event_id=events[i % 3].id, quantity=1))
+    for event in events:
+        booking_crud.create_booking(db, BookingCreate(user_id=other.id, event_id=event.id, quantity=1))
+    return user, events
+
+
+def _history_queries(client, count_statements, path, limit):
+    with count_statements(engine) as statements:
+        response = client.get(path, params={"limit": limit})
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.mark.parametrize("parent", ["user", "event", None])
+def test_history_query_count_does_not_grow_with_the_page(client, bookings, count_statements, parent):
+    user, events = bookings
+    path = {"user": f"/bookings/user/{user.id}", "event": f"/bookings/event/{events[0].id}", None: "/bookings/"}[parent]
+
+    small = _history_queries(client, count_statements, path, 5)
+    large = _history_queries(client, count_statements, path, 20)
+    # The page with its event and user, then every page's items in one IN query
+    assert len(small) == len(large) == 2
+
+
+def test_history_pages_follow_the_cursor(client, bookings):
+    user, _ = bookings
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 25, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/bookings/user/{user.id}", params=params)
+        seen += [booking["id"] for booking in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 60
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_all_bookings_are_paged_newest_first(client, bookings):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 25, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/bookings/", params=params)
+        assert response.status_code == 200
+        seen += [booking["id"] for booking in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == list(range(63, 0, -1))
+
+    assert client.get("/bookings/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import text
+from app.core.database import async_engine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def analyzed(database):
+    def analyze():
+        with database.connect() as conn:
+            conn.execute(text("ANALYZE events"))
+    return analyze
+
+
+async def test_estimates_are_planned_with_bound_parameters(async_client, make_event, analyzed, count_statements):
+    for _ in range(5):
+        make_event(location="Hall 10:30")
+    analyzed()
+    params = {"location": "Hall 10:30", "starts_after": datetime(2020, 1, 1, 12, 30, tzinfo=timezone.utc).isoformat(), "count": "estimate"}
+
+    with count_statements(async_engine) as statements:
+        response = await async_client.get("/events/query", params=params)
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count-Mode"] == "estimate"
+    assert int(response.headers["X-Total-Count"]) >= 1
+
+    explain = next(s for s in statements if s.startswith("EXPLAIN"))
+    assert "10:30" not in explain and "2020" not in explain
+    assert "$1" in explain
+
+
+async def test_auto_counts_small_results_exactly(async_client, make_event, analyzed):
+    for _ in range(3):
+        make_event()
+    make_event(category="SPORTS")
+    analyzed()
+
+    response = await async_client.get("/events/query", params={"category": "SPORTS", "count": "auto"})
+    assert response.headers["X-Total-Count"] == "1"
+    assert response.headers["X-Total-Count-Mode"] == "exact"
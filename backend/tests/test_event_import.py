@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.core.event_import import EXPORT_HEADER, import_events
+from app.models import Event
+from app.schemas.event_schema import DataFormat
+
+pytestmark = pytest.mark.anyio
+
+STARTS = datetime(2030, 5, 1, 18, 0, tzinfo=timezone.utc)
+
+
+def _row(organizer_id, n, **values):
+    return {
+        "title": f"Imported {n}", "description": "From a file", "category": "CONCERT", "location": "Kandy",
+        "starts_at": (STARTS + timedelta(days=n)).isoformat(), "ends_at": (STARTS + timedelta(days=n, hours=2)).isoformat(),
+        "capacity": "50", "organizer_id": str(organizer_id), "ga_ticket_price": "25", **values,
+    }
+
+
+def _csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def _chunks(data: bytes, size: int = 7):
+    # Small chunks split rows, quoted fields and multi-byte characters
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def test_csv_import_loads_good_rows_and_reports_bad_ones(async_client, db, make_user):
+    organizer = make_user()
+    rows = [
+        _row(organizer.id, 1, description="Two lines,\nwith a \"quote\" and ünïcode"),
+        _row(organizer.id, 2, category="NOT_A_CATEGORY"),
+        _row(organizer.id, 3, ends_at=STARTS.isoformat()),
+        _row(organizer.id + 1000, 4),
+        _row(organizer.id, 5, ga_ticket_price=""),
+    ]
+    body = _csv(rows) + b"only,three,columns\n"
+
+    response = await async_client.post("/events/import", content=body)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (2, 4)
+    errors = {error["row"]: error["errors"] for error in report["errors"]}
+    assert errors[2][0].startswith("category:")
+    assert errors[3] == ["ends_at must be after starts_at"]
+    assert errors[4] == [f"organizer_id: user {organizer.id + 1000} does not exist"]
+    assert errors[6] == ["expected 9 columns, got 3"]
+
+    events = db.scalars(select(Event).order_by(Event.id)).all()
+    assert [e.title for e in events] == ["Imported 1", "Imported 5"]
+    assert events[0].description == "Two lines,\nwith a \"quote\" and ünïcode"
+    assert events[0].ga_ticket_price == 25
+    # Empty cells take the schema defaults
+    assert (events[1].status, events[1].ga_ticket_price) == ("DRAFT", 0.0)
+
+
+async def test_ndjson_import_reports_lines_that_are_not_objects(async_client, db, make_user):
+    organizer = make_user()
+    lines = [json.dumps(_row(organizer.id, 1)), "{not json", "[1, 2]", "", json.dumps(_row(organizer.id, 2))]
+
+    response = await async_client.post(
+        "/events/import", params={"format": "ndjson"}, content="\n".join(lines).encode()
+    )
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (2, 2)
+    assert report["errors"][0]["row"] == 2 and report["errors"][0]["errors"][0].startswith("invalid JSON")
+    assert report["errors"][1] == {"row": 3, "errors": ["expected a JSON object"]}
+
+
+async def test_a_rejected_batch_does_not_undo_the_others(async_db, db, make_user):
+    organizer = make_user()
+    # Valid for the schema but longer than the title column, so COPY fails its batch
+    rows = [_row(organizer.id, n) for n in range(1, 6)]
+    rows[3]["title"] = "x" * 300
+
+    report = await import_events(async_db, _chunks(_csv(rows)), DataFormat.CSV, batch_size=2)
+    assert (report.imported, report.failed) == (3, 2)
+    assert {error.row for error in report.errors} == {3, 4}
+    assert all("batch rejected by the database" in error.errors[0] for error in report.errors)
+    assert db.scalars(select(Event.title).order_by(Event.id)).all() == ["Imported 1", "Imported 2", "Imported 5"]
+
+
+@pytest.mark.parametrize("data_format", ["csv", "ndjson"])
+async def test_export_reads_back_through_import(async_client, db, make_user, make_event, data_format):
+    organizer = make_user()
+    for n in range(3):
+        make_event(organizer=organizer, title=f"Exported {n}", description="Line one\nline two, \"quoted\"")
+    make_event(organizer=organizer, title="Draft", status="DRAFT")
+
+    response = await async_client.get("/events/export", params={"format": data_format, "status": "PUBLISHED"})
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == f'attachment; filename="events.{data_format}"'
+    if data_format == "csv":
+        exported = list(csv.DictReader(io.StringIO(response.text)))
+        assert tuple(exported[0]) == EXPORT_HEADER
+    else:
+        exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in exported] == ["Exported 0", "Exported 1", "Exported 2"]
+
+    report = (await async_client.post("/events/import", params={"format": data_format}, content=response.content)).json()
+    assert (report["imported"], report["failed"]) == (3, 0)
+    copies = db.scalars(select(Event).where(Event.title.like("Exported%")).order_by(Event.id)).all()
+    assert len(copies) == 6
+    assert {e.description for e in copies} == {"Line one\nline two, \"quoted\""}
+    assert [(e.starts_at, e.capacity) for e in copies[3:]] == [(e.starts_at, e.capacity) for e in copies[:3]]
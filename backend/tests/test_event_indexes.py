@@ -0,0 +1,63 @@
+"""EXPLAIN checks that each common event filter shape is served by an index."""
+from datetime import datetime, timedelta, timezone
+from app.core.database import engine
+from app.crud import event_crud
+from app.models import EventStatus
+from app.schemas.event_schema import EventFilter, EventSort
+from app.utils.explain import Explain, top_plan
+
+SEEDED_EVENTS = 20000
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _plan_indexes(conn, stmt, sort: EventSort) -> set:
+    """Indexes the first page of stmt reads; fails if any part of it scans the table."""
+    plan = top_plan(conn.scalar(Explain(event_crud._seek(stmt, 0, 20, None, sort))))
+    nodes = list(_nodes(plan))
+    assert "Seq Scan" not in {node["Node Type"] for node in nodes}
+    return {node["Index Name"] for node in nodes if "Index Name" in node}
+
+
+def test_query_filter_shapes_use_their_indexes(seed_events):
+    first_organizer = seed_events(SEEDED_EVENTS)
+    now = datetime.now(timezone.utc)
+    # Where two indexes serve a shape equally well the planner may pick either
+    shapes = [
+        (EventFilter(), {"ix_events_starts_at_id"}),
+        (EventFilter(status="PUBLISHED"), {"ix_events_published_starts_at", "ix_events_status_starts_at_id"}),
+        (EventFilter(status="DRAFT"), {"ix_events_status_starts_at_id"}),
+        (EventFilter(category="SPORTS"), {"ix_events_category_starts_at"}),
+        (
+            EventFilter(category="SPORTS", starts_after=now, starts_before=now + timedelta(days=30)),
+            {"ix_events_category_starts_at", "ix_events_starts_at_id"},
+        ),
+        (EventFilter(organizer_id=first_organizer + 3), {"ix_events_organizer_starts_at"}),
+        (EventFilter(starts_after=now, starts_before=now + timedelta(days=14)), {"ix_events_starts_at_id"}),
+        (EventFilter(min_capacity=5000, max_capacity=5040), {"ix_events_capacity"}),
+        (EventFilter(min_price=100, max_price=110), {"ix_events_ga_ticket_price"}),
+    ]
+    with engine.connect() as conn:
+        for filters, indexes in shapes:
+            used = _plan_indexes(conn, event_crud.query_events_filtered(filters), EventSort.STARTS_AT)
+            assert used & indexes, f"{filters!r} used {used or 'no index'}"
+
+
+def test_listing_endpoints_use_their_indexes(seed_events):
+    seed_events(SEEDED_EVENTS)
+    now = datetime.now(timezone.utc)
+    listings = [
+        (event_crud.query_events(), EventSort.ID, {"events_pkey"}),
+        # Half the events are published, so walking the primary key is as good
+        (event_crud.query_events(EventStatus.PUBLISHED), EventSort.ID, {"ix_events_status_id", "events_pkey"}),
+        (event_crud.query_upcoming_events(now), EventSort.STARTS_AT, {"ix_events_starts_at_id"}),
+        (event_crud.query_past_events(now), EventSort.ENDS_AT_DESC, {"ix_events_ends_at_id"}),
+    ]
+    with engine.connect() as conn:
+        for stmt, sort, indexes in listings:
+            used = _plan_indexes(conn, stmt, sort)
+            assert used & indexes, f"{sort.value} listing used {used or 'no index'}"
@@ -0,0 +1,87 @@
+import pytest
+from app.core.cache import MemoryCache, response_cache
+from app.core.database import async_engine
+from app.crud import booking_crud
+from app.schemas.booking_schema import BookingCreate
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "backend", MemoryCache())
+    return response_cache
+
+
+async def test_revalidating_a_list_reads_only_the_version(async_client, memory_cache, make_event, count_statements):
+    for _ in range(3):
+        make_event()
+    first = await async_client.get("/events/", params={"limit": 2})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    with count_statements(async_engine) as statements:
+        response = await async_client.get("/events/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    [statement] = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert "list_versions" in statement and "events" not in statement.replace("list_versions", "")
+
+    # Other filters share the version but not the validator
+    other = await async_client.get("/events/upcoming", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+async def test_event_writes_change_the_list_validator(async_client, memory_cache, make_event):
+    event = make_event()
+    first = await async_client.get("/events/")
+    etag = first.headers["ETag"]
+
+    response = await async_client.patch("/events/batch", json={"ids": [event.id], "changes": {"title": "Renamed"}})
+    assert response.status_code == 200
+
+    response = await async_client.get("/events/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["title"] == "Renamed"
+
+
+async def test_bookings_change_the_list_validator(async_client, memory_cache, db, make_user, make_event):
+    event = make_event(capacity=10)
+    first = await async_client.get("/events/")
+    etag = first.headers["ETag"]
+    assert first.json()[0]["tickets_available"] == 10
+
+    booking = booking_crud.create_booking(db, BookingCreate(user_id=make_user().id, event_id=event.id, quantity=3))
+    response = await async_client.get("/events/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["tickets_available"] == 7
+
+    booking_crud.cancel_booking(db, booking.id)
+    again = await async_client.get("/events/", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.json()[0]["tickets_available"] == 10
+
+
+async def test_booking_routes_drop_the_cached_event_page(async_client, memory_cache, make_user, make_event):
+    event = make_event(capacity=10)
+    tag = f"event:{event.id}"
+
+    async def available():
+        response = await async_client.get(f"/events/{event.id}")
+        assert tag in memory_cache.backend._tags
+        return response.json()["tickets_available"]
+
+    assert await available() == 10
+    response = await async_client.post("/bookings/", json={"user_id": make_user().id, "event_id": event.id, "quantity": 3})
+    assert response.status_code == 201
+    assert tag not in memory_cache.backend._tags
+    assert await available() == 7
+
+    booking_id = response.json()["id"]
+    assert (await async_client.post(f"/bookings/{booking_id}/confirm")).status_code == 200
+    assert tag not in memory_cache.backend._tags
+    assert await available() == 7
+
+    assert (await async_client.post(f"/bookings/{booking_id}/cancel")).status_code == 200
+    assert tag not in memory_cache.backend._tags
+    assert await available() == 10
@@ -0,0 +1,36 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_publishing_only_moves_drafts(async_client, make_event):
+    draft = make_event(status="DRAFT")
+    cancelled = make_event(status="CANCELLED")
+    completed = make_event(status="COMPLETED")
+    ids = [draft.id, cancelled.id, completed.id]
+
+    response = await async_client.post("/events/batch/status", json={"to_status": "PUBLISHED", "ids": ids})
+    assert response.status_code == 200
+    assert response.json()["updated_ids"] == [draft.id]
+    assert response.json()["skipped_ids"] == [cancelled.id, completed.id]
+
+    statuses = {event["id"]: event["status"] for event in (await async_client.get("/events/")).json()}
+    assert statuses == {draft.id: "PUBLISHED", cancelled.id: "CANCELLED", completed.id: "COMPLETED"}
+
+
+async def test_disallowed_transitions_are_rejected(async_client, make_event):
+    event = make_event()
+    for body in (
+        {"to_status": "PUBLISHED", "from_status": "CANCELLED", "ids": [event.id]},
+        {"to_status": "DRAFT", "ids": [event.id]},
+    ):
+        response = await async_client.post("/events/batch/status", json=body)
+        assert response.status_code == 400
+
+
+async def test_batch_updates_cannot_change_status(async_client, make_event):
+    cancelled = make_event(status="CANCELLED")
+
+    response = await async_client.patch("/events/batch", json={"ids": [cancelled.id], "changes": {"status": "PUBLISHED"}})
+    assert response.status_code == 400
+    assert (await async_client.get(f"/events/{cancelled.id}")).json()["status"] == "CANCELLED"
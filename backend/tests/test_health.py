@@ -0,0 +1,38 @@
+import sqlite3
+import pytest
+from sqlalchemy.pool import QueuePool
+from app.core.pool_metrics import PoolMetrics
+
+pytestmark = pytest.mark.anyio
+
+
+def _pool(max_overflow):
+    return QueuePool(lambda: sqlite3.connect(":memory:"), pool_size=2, max_overflow=max_overflow)
+
+
+def test_utilization_counts_overflow_connections():
+    pool = _pool(max_overflow=2)
+    connections = [pool.connect() for _ in range(3)]
+    snapshot = PoolMetrics().snapshot(pool, 2)
+    assert snapshot["checked_out"] == 3
+    assert snapshot["utilization"] == 0.75
+    for conn in connections:
+        conn.close()
+
+
+def test_unlimited_overflow_has_no_utilization():
+    pool = _pool(max_overflow=-1)
+    connections = [pool.connect() for _ in range(5)]
+    snapshot = PoolMetrics().snapshot(pool, -1)
+    assert snapshot["checked_out"] == 5
+    assert snapshot["utilization"] is None
+    for conn in connections:
+        conn.close()
+
+
+async def test_health_pings_the_database(async_client):
+    response = await async_client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["database"]["status"] == "connected"
+    assert body["pool"]["async"]["utilization"] is not None
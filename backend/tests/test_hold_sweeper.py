@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select, update
+from app.core.database import SessionLocal
+from app.crud import booking_crud
+from app.models import Booking, BookingStatus, Event, TicketInventory
+from app.schemas.booking_schema import BookingCreate, BookingItemCreate, TicketTier
+
+
+def _expire_all_holds(db):
+    db.execute(update(Booking).values(hold_expires_at=func.now() - func.make_interval(0, 0, 0, 0, 0, 1)))
+    db.commit()
+
+
+def test_sweep_releases_tier_and_event_holds(db, make_user, make_event):
+    user = make_user()
+    events = [make_event(capacity=50) for _ in range(3)]
+    for event in events:
+        db.add_all([
+            TicketInventory(event_id=event.id, tier=TicketTier.GA.value, price=10, capacity=30),
+            TicketInventory(event_id=event.id, tier=TicketTier.VIP.value, price=50, capacity=20),
+        ])
+    db.commit()
+    for event in events:
+        booking_crud.create_booking(db, BookingCreate(
+            user_id=user.id, event_id=event.id, quantity=3,
+            items=[BookingItemCreate(tier=TicketTier.VIP, quantity=1), BookingItemCreate(tier=TicketTier.GA, quantity=2)],
+        ))
+    _expire_all_holds(db)
+
+    released_events = set()
+    assert booking_crud.release_expired_holds(db, batch_size=100, released_events=released_events) == 3
+    assert released_events == {event.id for event in events}
+
+    db.expire_all()
+    assert db.scalar(select(func.sum(Event.tickets_held))) == 0
+    assert db.scalar(select(func.sum(TicketInventory.held))) == 0
+    assert set(db.scalars(select(Booking.status))) == {BookingStatus.CANCELLED.value}
+
+
+def test_concurrent_sweeps_and_bookings_do_not_deadlock(db, make_user, make_event):
+    user = make_user()
+    events = [make_event(capacity=1000) for _ in range(5)]
+    for event in events:
+        db.add_all([
+            TicketInventory(event_id=event.id, tier=tier.value, price=10, capacity=500)
+            for tier in (TicketTier.GA, TicketTier.VIP)
+        ])
+    db.commit()
+    user_id, event_ids = user.id, [event.id for event in events]
+    mixed = [BookingItemCreate(tier=TicketTier.VIP, quantity=1), BookingItemCreate(tier=TicketTier.GA, quantity=1)]
+    for n in range(200):
+        booking_crud.create_booking(db, BookingCreate(
+            user_id=user_id, event_id=event_ids[n % len(event_ids)], quantity=2, items=mixed,
+        ))
+    _expire_all_holds(db)
+
+    def sweep(_):
+        session = SessionLocal()
+        try:
+            return sum(booking_crud.release_expired_holds(session, batch_size=7) for _ in range(10))
+        finally:
+            session.close()
+
+    def book(n):
+        session = SessionLocal()
+        try:
+            # Walk the events in the opposite order to the sweeps
+            booking_crud.create_booking(session, BookingCreate(
+                user_id=user_id, event_id=event_ids[-1 - n % len(event_ids)], quantity=2, items=mixed,
+            ))
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(12) as pool:
+        sweeps = [pool.submit(sweep, n) for n in range(6)]
+        bookings = [pool.submit(book, n) for n in range(60)]
+        released = sum(f.result() for f in sweeps)
+        for f in bookings:
+            f.result()
+
+    released += booking_crud.release_expired_holds(db, batch_size=1000)
+    db.expire_all()
+    assert released == 200
+    # The only holds left are the 60 fresh bookings
+    assert db.scalar(select(func.sum(Event.tickets_held))) == 120
+    assert db.scalar(select(func.sum(TicketInventory.held))) == 120
@@ -0,0 +1,78 @@
+import hashlib
+import pytest
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.core.idempotency import purge_idempotency_keys
+from app.crud import booking_crud, idempotency_crud
+from app.models import Booking, Event, IdempotencyKey
+from app.schemas.booking_schema import BookingCreate
+
+
+def _fingerprint(booking: BookingCreate) -> str:
+    # What request_fingerprint computes for POST /bookings/
+    return hashlib.sha256(b"POST /bookings/\n" + booking.model_dump_json().encode()).hexdigest()
+
+
+def _claim(db, key, booking, lock_seconds=60):
+    return idempotency_crud.claim_key(db, key, _fingerprint(booking), ttl=3600, lock_seconds=lock_seconds)
+
+
+@pytest.fixture
+def booking(make_user, make_event):
+    return BookingCreate(user_id=make_user().id, event_id=make_event().id, quantity=2)
+
+
+def _bookings(db) -> int:
+    return db.scalar(select(func.count()).select_from(Booking))
+
+
+def test_retries_replay_the_first_response(client, db, booking):
+    headers = {"Idempotency-Key": "retry"}
+    first = client.post("/bookings/", content=booking.model_dump_json(), headers=headers)
+    second = client.post("/bookings/", content=booking.model_dump_json(), headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert _bookings(db) == 1
+
+
+def test_duplicate_of_a_request_in_flight_is_refused_at_once(client, db, booking):
+    assert _claim(db, "in-flight", booking) is not None
+
+    response = client.post("/bookings/", content=booking.model_dump_json(), headers={"Idempotency-Key": "in-flight"})
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert _bookings(db) == 0
+
+
+def test_committed_request_is_replayed_even_without_a_stored_response(client, db, booking):
+    # The request died after its booking committed but before its response was stored
+    claim = _claim(db, "crashed", booking, lock_seconds=0)
+    created = booking_crud.create_booking(db, booking, claim)
+
+    response = client.post("/bookings/", content=booking.model_dump_json(), headers={"Idempotency-Key": "crashed"})
+    assert response.status_code == 201
+    assert response.json()["id"] == created.id
+    assert _bookings(db) == 1
+
+
+def test_request_that_lost_its_claim_cannot_commit(db, booking):
+    stale = _claim(db, "slow", booking, lock_seconds=0)
+    # A retry takes over the claim while the first request is still running
+    assert _claim(db, "slow", booking, lock_seconds=0) is not None
+
+    with pytest.raises(idempotency_crud.ClaimLostError):
+        booking_crud.create_booking(db, booking, stale)
+    assert _bookings(db) == 0
+    assert db.get(Event, booking.event_id).tickets_held == 0
+
+
+def test_purge_deletes_only_expired_keys_in_batches(db, booking, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_PURGE_BATCH_SIZE", 2)
+    for i in range(5):
+        idempotency_crud.claim_key(db, f"old-{i}", _fingerprint(booking), ttl=-1, lock_seconds=60)
+    _claim(db, "live", booking)
+
+    assert purge_idempotency_keys() == 5
+    assert list(db.scalars(select(IdempotencyKey.key))) == ["live"]
@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.core import notification_dispatcher
+from app.core.config import settings
+from app.crud import booking_crud
+from app.models import NotificationChannel, OutboxMessage, OutboxStatus
+from app.schemas.booking_schema import BookingCreate
+from app.utils.email import EmailSender, FakeEmailSender
+from app.utils.whatsapp import FakeWhatsAppSender
+
+pytestmark = pytest.mark.anyio
+
+
+class FailingEmailSender(EmailSender):
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        raise ConnectionError("SMTP server unavailable")
+
+
+class SlowEmailSender(EmailSender):
+    """Tracks how many sends overlap."""
+
+    def __init__(self):
+        self.active = self.peak = 0
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+
+
+def _senders(email: EmailSender):
+    return {NotificationChannel.EMAIL.value: email}
+
+
+def _queue(db, count: int = 1, **values):
+    for n in range(count):
+        db.add(OutboxMessage(**{
+            "channel": NotificationChannel.EMAIL.value,
+            "recipient": f"guest{n}@example.com",
+            "template": "booking_cancelled",
+            "payload": {"booking_id": n, "event_title": "Test event"},
+            **values,
+        }))
+    db.commit()
+
+
+async def _messages(async_db):
+    return (await async_db.scalars(select(OutboxMessage).order_by(OutboxMessage.id))).all()
+
+
+async def test_confirmation_is_queued_in_the_booking_transaction(db, async_db, make_user, make_event):
+    user = make_user()
+    booking = booking_crud.create_booking(db, BookingCreate(user_id=user.id, event_id=make_event(title="Jazz night").id, quantity=2))
+    expired = booking_crud.create_booking(db, BookingCreate(user_id=user.id, event_id=booking.event_id, quantity=1))
+    expired.hold_expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db.commit()
+
+    booking_crud.confirm_booking(db, booking.id)
+    with pytest.raises(booking_crud.BookingStateError):
+        booking_crud.confirm_booking(db, expired.id)
+
+    # Only the committed confirmation left a message behind
+    [message] = [m for m in await _messages(async_db) if m.template == "booking_confirmed"]
+    assert (message.template, message.recipient, message.status) == ("booking_confirmed", user.email, OutboxStatus.PENDING.value)
+    assert message.payload["booking_id"] == booking.id
+    assert message.payload["event_title"] == "Jazz night"
+
+    email = FakeEmailSender()
+    # Plus the two "booking received" messages
+    assert await notification_dispatcher.dispatch_due(_senders(email)) == 3
+    assert (user.email, "Your booking for Jazz night is confirmed") in [(r, s) for r, s, _ in email.sent]
+    async_db.expire_all()
+    assert {m.status for m in await _messages(async_db)} == {OutboxStatus.SENT.value}
+
+
+async def test_attendees_with_a_phone_are_also_notified_by_whatsapp(db, async_db, make_user, make_event):
+    user = make_user()
+    event = make_event(title="Jazz night")
+    with_phone = booking_crud.create_booking(db, BookingCreate(
+        user_id=user.id, event_id=event.id, quantity=2, attendee_phone="+94771234567",
+    ))
+    booking_crud.create_booking(db, BookingCreate(user_id=user.id, event_id=event.id, quantity=1))
+    booking_crud.cancel_booking(db, with_phone.id)
+
+    queued = [(m.template, m.channel, m.recipient) for m in await _messages(async_db)]
+    assert queued == [
+        ("booking_received", NotificationChannel.EMAIL.value, user.email),
+        ("booking_received", NotificationChannel.WHATSAPP.value, "+94771234567"),
+        ("booking_received", NotificationChannel.EMAIL.value, user.email),
+        ("booking_cancelled", NotificationChannel.EMAIL.value, user.email),
+        ("booking_cancelled", NotificationChannel.WHATSAPP.value, "+94771234567"),
+    ]
+
+    email, whatsapp = FakeEmailSender(), FakeWhatsAppSender()
+    senders = {NotificationChannel.EMAIL.value: email, NotificationChannel.WHATSAPP.value: whatsapp}
+    assert await notification_dispatcher.dispatch_due(senders) == 5
+    assert len(email.sent) == 3
+    # Sent concurrently, so in no particular order
+    assert sorted((recipient, subject) for recipient, subject, _ in whatsapp.sent) == [
+        ("+94771234567", "Your booking for Jazz night was cancelled"),
+        ("+94771234567", "Your tickets for Jazz night are on hold"),
+    ]
+
+
+async def test_failed_sends_back_off_then_give_up(db, async_db):
+    _queue(db)
+    before = datetime.now(timezone.utc)
+    assert await notification_dispatcher.dispatch_due(_senders(FailingEmailSender())) == 1
+
+    [message] = await _messages(async_db)
+    assert message.status == OutboxStatus.PENDING.value
+    assert message.attempts == 1
+    assert "SMTP server unavailable" in message.last_error
+    # Jittered between half and all of the base delay
+    delay = (message.next_attempt_at - before).total_seconds()
+    assert settings.NOTIFICATION_RETRY_BASE_SECONDS * 0.5 - 1 <= delay <= settings.NOTIFICATION_RETRY_BASE_SECONDS + 1
+    # Not due again yet
+    assert await notification_dispatcher.dispatch_due(_senders(FailingEmailSender())) == 0
+
+    message.attempts = settings.NOTIFICATION_MAX_ATTEMPTS - 1
+    message.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await async_db.commit()
+    assert await notification_dispatcher.dispatch_due(_senders(FailingEmailSender())) == 1
+    async_db.expire_all()
+    [message] = await _messages(async_db)
+    assert (message.status, message.attempts) == (OutboxStatus.FAILED.value, settings.NOTIFICATION_MAX_ATTEMPTS)
+
+
+def test_backoff_doubles_up_to_the_cap():
+    for attempts in range(1, 12):
+        expected = min(settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.NOTIFICATION_RETRY_MAX_SECONDS)
+        assert expected * 0.5 - 1 <= notification_dispatcher.retry_delay(attempts) <= expected
+
+
+async def test_sends_are_limited_to_the_configured_concurrency(db, async_db, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "NOTIFICATION_BATCH_SIZE", 10)
+    _queue(db, count=25)
+    email = SlowEmailSender()
+
+    assert await notification_dispatcher.dispatch_due(_senders(email)) == 25
+    assert email.peak == 3
+    assert {m.status for m in await _messages(async_db)} == {OutboxStatus.SENT.value}
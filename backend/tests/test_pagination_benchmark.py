@@ -0,0 +1,45 @@
+"""Keyset pagination keeps deep pages as fast as the first one.
+
+Seeds BENCH_EVENTS events (200,000 by default, 10,000 pages of 20).
+"""
+import os
+import statistics
+import time
+import pytest
+from sqlalchemy import select
+from app.crud import event_crud
+from app.models import Event
+from app.schemas.event_schema import EventSort
+
+pytestmark = [pytest.mark.anyio, pytest.mark.benchmark]
+
+BENCH_EVENTS = int(os.getenv("BENCH_EVENTS", "200000"))
+PAGE_SIZE = 20
+SORT = EventSort.STARTS_AT
+
+
+async def _median_ms(fetch, repeats: int = 20) -> float:
+    timings = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        page = await fetch()
+        timings.append((time.perf_counter() - began) * 1000)
+        assert len(page) == PAGE_SIZE
+    return statistics.median(timings)
+
+
+async def test_keyset_latency_is_flat_from_first_to_last_page(async_db, seed_events):
+    seed_events(BENCH_EVENTS)
+    last_page = BENCH_EVENTS - PAGE_SIZE
+    # The cursor a client holds after paging through to the last page
+    before = (await async_db.scalars(event_crud._seek(select(Event), last_page - 1, 1, None, SORT))).one()
+    cursor = event_crud.next_cursor([before], 1, SORT)
+
+    first = await _median_ms(lambda: event_crud.paginate(async_db, select(Event), 0, PAGE_SIZE, None, SORT))
+    deep = await _median_ms(lambda: event_crud.paginate(async_db, select(Event), 0, PAGE_SIZE, cursor, SORT))
+    offset = await _median_ms(lambda: event_crud.paginate(async_db, select(Event), last_page, PAGE_SIZE, None, SORT), repeats=3)
+
+    pages = BENCH_EVENTS // PAGE_SIZE
+    print(f"\npage 1: {first:.2f}ms, page {pages} by cursor: {deep:.2f}ms, by offset: {offset:.2f}ms")
+    assert deep < first * 3 + 2
+    assert offset > deep * 5
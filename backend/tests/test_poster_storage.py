@@ -0,0 +1,109 @@
+import json
+from datetime import datetime, timedelta, timezone
+import boto3
+import pytest
+from moto import mock_aws
+from sqlalchemy import func, select
+from app.core.storage import S3Storage, poster_storage
+from app.models import Event, PosterBlob
+
+pytestmark = pytest.mark.anyio
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"poster"
+OTHER_PNG = b"\x89PNG\r\n\x1a\n" + b"another poster"
+
+
+@pytest.fixture
+def s3_storage(tmp_path):
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="posters")
+        storage = S3Storage(client, "posters", "https://cdn.example.com/posters/")
+        storage.staging_dir = tmp_path
+        yield storage
+
+
+def _staged(directory, name, content):
+    path = directory / name
+    path.write_bytes(content)
+    return path
+
+
+async def test_s3_storage_round_trip(s3_storage, tmp_path):
+    assert not await s3_storage.exists("abc.png")
+
+    staged = _staged(tmp_path, "first.part", PNG)
+    await s3_storage.put("abc.png", staged)
+    assert not staged.exists()
+    assert await s3_storage.exists("abc.png")
+    assert s3_storage.url("abc.png") == "https://cdn.example.com/posters/abc.png"
+    assert s3_storage.owns("https://cdn.example.com/posters/abc.png")
+
+    # An existing key is never overwritten, but the staged file is still consumed
+    again = _staged(tmp_path, "second.part", OTHER_PNG)
+    await s3_storage.put("abc.png", again)
+    assert not again.exists()
+    fetched = await s3_storage.fetch("abc.png", tmp_path / "copy.png")
+    assert fetched.read_bytes() == PNG
+
+    await s3_storage.delete("abc.png")
+    assert not await s3_storage.exists("abc.png")
+
+
+def _event_form(organizer_id, **values):
+    starts_at = datetime.now(timezone.utc) + timedelta(days=30)
+    return {"event_data": json.dumps({
+        "title": "Poster event", "description": "With a poster", "category": "CONCERT", "location": "Colombo",
+        "starts_at": starts_at.isoformat(), "ends_at": (starts_at + timedelta(hours=3)).isoformat(),
+        "capacity": 100, "organizer_id": organizer_id, **values,
+    })}
+
+
+async def test_identical_posters_share_one_counted_blob(async_client, db, poster_dir, make_user):
+    organizer = make_user()
+    urls = []
+    for _ in range(2):
+        response = await async_client.post(
+            "/events/", data=_event_form(organizer.id), files={"poster_image": ("poster.png", PNG, "image/png")}
+        )
+        assert response.status_code == 201
+        urls.append(response.json()["poster_url"])
+    assert urls[0] == urls[1]
+    key = urls[0].rsplit("/", 1)[-1]
+    assert [p.name for p in poster_dir.iterdir()] == [key]
+    assert db.scalar(select(PosterBlob.ref_count).where(PosterBlob.key == key)) == 2
+
+    # Replacing one event's poster moves its reference to the new blob
+    event_id = response.json()["id"]
+    response = await async_client.put(
+        f"/events/{event_id}", files={"poster_image": ("other.png", OTHER_PNG, "image/png")}
+    )
+    assert response.status_code == 200
+    new_key = response.json()["poster_url"].rsplit("/", 1)[-1]
+    assert {p.name for p in poster_dir.iterdir()} == {key, new_key}
+    counts = dict(db.execute(select(PosterBlob.key, PosterBlob.ref_count)).all())
+    assert counts == {key: 1, new_key: 1}
+
+
+async def test_failed_poster_upload_leaves_no_reference(async_client, db, poster_dir, make_user, make_event, monkeypatch):
+    async def broken_put(key, path):
+        raise OSError("storage unavailable")
+    monkeypatch.setattr(poster_storage, "put", broken_put)
+    organizer = make_user()
+
+    response = await async_client.post(
+        "/events/", data=_event_form(organizer.id), files={"poster_image": ("poster.png", PNG, "image/png")}
+    )
+    assert response.status_code == 500
+    assert db.scalar(select(func.count()).select_from(Event)) == 0
+    assert db.scalar(select(func.count()).select_from(PosterBlob)) == 0
+
+    event = make_event(organizer=organizer)
+    # The update route leaves unexpected errors to the server's 500 handler
+    with pytest.raises(OSError):
+        await async_client.put(f"/events/{event.id}", files={"poster_image": ("poster.png", PNG, "image/png")})
+    db.expire_all()
+    assert db.get(Event, event.id).poster_url is None
+    assert db.scalar(select(func.count()).select_from(PosterBlob)) == 0
+    # Nothing staged is left behind either
+    assert list(poster_dir.iterdir()) == []
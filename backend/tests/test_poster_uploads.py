@@ -0,0 +1,91 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.models import Event
+from app.utils.uploads import CHUNK_SIZE
+
+pytestmark = pytest.mark.anyio
+
+BOUNDARY = "poster-boundary"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _event_data(organizer_id):
+    starts_at = datetime.now(timezone.utc) + timedelta(days=30)
+    return json.dumps({
+        "title": "Poster event", "description": "With a poster", "category": "CONCERT", "location": "Colombo",
+        "starts_at": starts_at.isoformat(), "ends_at": (starts_at + timedelta(hours=3)).isoformat(),
+        "capacity": 100, "organizer_id": organizer_id,
+    })
+
+
+async def _streamed_form(event_data, content, chunk_size=64 * 1024):
+    """A multipart body sent in chunks without a Content-Length, as a streaming client would."""
+    yield (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="event_data"\r\n\r\n{event_data}\r\n'
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="poster_image"; filename="poster.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode()
+    for start in range(0, len(content), chunk_size):
+        yield content[start:start + chunk_size]
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _post_streamed(async_client, event_data, content):
+    return async_client.post(
+        "/events/", content=_streamed_form(event_data, content),
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+
+
+def _events(db) -> int:
+    return db.scalar(select(func.count()).select_from(Event))
+
+
+async def test_oversized_upload_is_refused_from_its_content_length(async_client, db, poster_dir, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "POSTER_MAX_BYTES", 4096)
+    monkeypatch.setattr(settings, "UPLOAD_FORM_OVERHEAD_BYTES", 1024)
+
+    response = await async_client.post(
+        "/events/", data={"event_data": _event_data(make_user().id)},
+        files={"poster_image": ("poster.png", PNG_SIGNATURE + b"\0" * 8192, "image/png")},
+    )
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+    assert _events(db) == 0
+
+
+async def test_oversized_stream_is_cut_off_while_staging(async_client, db, poster_dir, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "POSTER_MAX_BYTES", 100 * 1024)
+
+    response = await _post_streamed(async_client, _event_data(make_user().id), PNG_SIGNATURE + b"\0" * 200 * 1024)
+    assert response.status_code == 413
+    assert _events(db) == 0
+    # The partial staging file is removed
+    assert list(poster_dir.iterdir()) == []
+
+
+async def test_uploads_are_checked_by_their_magic_bytes(async_client, db, poster_dir, make_user):
+    response = await async_client.post(
+        "/events/", data={"event_data": _event_data(make_user().id)},
+        files={"poster_image": ("poster.png", b"<svg xmlns='http://www.w3.org/2000/svg'/>", "image/png")},
+    )
+    assert response.status_code == 400
+    assert "Unsupported image type" in response.json()["detail"]
+    assert _events(db) == 0
+    assert list(poster_dir.iterdir()) == []
+
+
+async def test_streamed_upload_is_stored_under_its_content_hash(async_client, db, poster_dir, make_user):
+    # Several staging chunks long
+    content = PNG_SIGNATURE + bytes(range(256)) * (CHUNK_SIZE * 2 // 256 + 7)
+
+    response = await _post_streamed(async_client, _event_data(make_user().id), content)
+    assert response.status_code == 201
+    key = f"{hashlib.sha256(content).hexdigest()}.png"
+    assert response.json()["poster_url"].endswith(f"/{key}")
+    assert [p.name for p in poster_dir.iterdir()] == [key]
+    assert (poster_dir / key).read_bytes() == content
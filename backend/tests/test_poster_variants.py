@@ -0,0 +1,18 @@
+from PIL import Image
+from app.core.poster_variants import build_variants
+
+
+def test_variants_are_built_in_webp_and_the_original_format(tmp_path):
+    source = tmp_path / "poster.png"
+    Image.new("RGBA", (800, 400), (200, 30, 30, 255)).save(source)
+
+    original_format, width, outputs = build_variants(str(source), str(tmp_path), "poster", (320, 640, 1280))
+
+    assert (original_format, width) == ("png", 800)
+    # Never upscaled past the original width
+    assert outputs == [
+        ("poster-320w.webp", "webp", 320), ("poster-320w.png", "png", 320),
+        ("poster-640w.webp", "webp", 640), ("poster-640w.png", "png", 640),
+    ]
+    with Image.open(tmp_path / "poster-640w.webp") as image:
+        assert image.size == (640, 320)
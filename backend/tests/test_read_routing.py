@@ -0,0 +1,90 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.read_routing import READ_YOUR_WRITES_COOKIE, ReplicaRouter, replica_router
+
+pytestmark = pytest.mark.anyio
+
+PRIMARY_URL = async_engine.url.render_as_string(hide_password=False)
+
+
+@pytest.fixture
+async def hanging_replica():
+    """A replica that accepts connections but never answers."""
+    server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"postgresql+asyncpg://postgres@127.0.0.1:{port}/replica"
+    server.close()
+
+
+async def _bound_to(db):
+    return (await db.connection()).engine
+
+
+async def test_unreachable_replicas_are_ejected(hanging_replica, monkeypatch):
+    monkeypatch.setattr(settings, "DB_REPLICA_CONNECT_TIMEOUT_SECONDS", 0.2)
+    router = ReplicaRouter(["postgresql+asyncpg://postgres@127.0.0.1:1/refused", hanging_replica, PRIMARY_URL])
+    try:
+        started = time.monotonic()
+        db = await router.session()
+        # The refused and the hanging replica are skipped within the timeout
+        assert time.monotonic() - started < 5
+        assert await _bound_to(db) is router.engines[2]
+        await db.close()
+        assert [s["ejected"] for s in router.status()] == [True, True, False]
+
+        # Ejected replicas are not tried again until their time is up
+        for _ in range(3):
+            db = await router.session()
+            assert await _bound_to(db) is router.engines[2]
+            await db.close()
+
+        db = await router.session(use_primary=True)
+        assert (await _bound_to(db)).url == async_engine.url
+        await db.close()
+    finally:
+        await router.dispose()
+        # Pooled asyncpg connections belong to this test's event loop
+        await async_engine.dispose()
+
+
+@pytest.fixture
+async def routed_reads(monkeypatch):
+    """Route the app's reads through a replica (the test database itself) and record where each one went."""
+    router = ReplicaRouter([PRIMARY_URL])
+    for name in ("engines", "sessionmakers", "_ejected_until"):
+        monkeypatch.setattr(replica_router, name, getattr(router, name))
+    calls = []
+    session = replica_router.session
+
+    async def recording_session(use_primary=False):
+        calls.append("primary" if use_primary else "replica")
+        return await session(use_primary)
+    monkeypatch.setattr(replica_router, "session", recording_session)
+    yield calls
+    await router.dispose()
+
+
+async def test_writers_read_from_the_primary_until_the_cookie_expires(async_client, routed_reads, make_event):
+    event = make_event()
+    assert (await async_client.get(f"/events/{event.id}")).status_code == 200
+
+    # A rejected write does not pin the client
+    response = await async_client.patch("/events/batch", json={"ids": [event.id], "changes": {}})
+    assert response.status_code == 400
+    assert READ_YOUR_WRITES_COOKIE not in response.cookies
+
+    response = await async_client.patch("/events/batch", json={"ids": [event.id], "changes": {"title": "Renamed"}})
+    assert response.status_code == 200
+    until = float(response.cookies[READ_YOUR_WRITES_COOKIE])
+    assert time.time() < until <= time.time() + settings.READ_YOUR_WRITES_SECONDS
+    assert f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}" in response.headers["set-cookie"]
+
+    assert (await async_client.get(f"/events/{event.id}")).json()["title"] == "Renamed"
+
+    for value in (str(time.time() - 1), "not-a-time"):
+        async_client.cookies.set(READ_YOUR_WRITES_COOKIE, value)
+        assert (await async_client.get(f"/events/{event.id}")).status_code == 200
+    assert routed_reads == ["replica", "primary", "replica", "replica"]
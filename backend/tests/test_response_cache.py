@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from fakeredis import FakeAsyncRedis
+from app.core.cache import CacheBackend, MemoryCache, RedisCache, ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+def test_backends_must_implement_the_interface():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+async def test_concurrent_misses_share_one_computation():
+    cache = ResponseCache(MemoryCache(), ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return b"body"
+
+    results = await asyncio.gather(*(cache.get_or_set("key", compute) for _ in range(10)))
+    assert results == [b"body"] * 10
+    assert calls == 1
+
+
+async def test_cancelled_first_caller_does_not_fail_the_waiters():
+    cache = ResponseCache(MemoryCache(), ttl=60)
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(0.05)
+        return b"body"
+
+    first = asyncio.create_task(cache.get_or_set("key", compute))
+    await started.wait()
+    waiters = [asyncio.create_task(cache.get_or_set("key", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await asyncio.gather(*waiters) == [b"body"] * 3
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    # The shared computation still stored its result
+    assert await cache.backend.get("key") == b"body"
+
+
+async def test_redis_backend_sets_and_invalidates_by_tag():
+    client = FakeAsyncRedis()
+    cache = ResponseCache(RedisCache(client), ttl=60)
+
+    async def compute():
+        return b"body"
+
+    assert await cache.backend.get("page") is None
+    await cache.get_or_set("page", compute, tags=["events", "event:1"])
+    await cache.get_or_set("other", compute, tags=["event:2"])
+    assert await cache.backend.get("page") == b"body"
+    assert 0 < await client.ttl("ems:cache:page") <= 60
+
+    await cache.invalidate("event:1")
+    assert await cache.backend.get("page") is None
+    assert await cache.backend.get("other") == b"body"
+    assert not await client.exists("ems:cache:tag:event:1")
@@ -0,0 +1,61 @@
+"""Search stays indexed and fast on a large table.
+
+Seeds BENCH_SEARCH_EVENTS events (1,000,000 by default) and needs the
+pg_trgm extension, without which the trigram indexes cannot exist.
+"""
+import os
+import statistics
+import time
+import pytest
+from sqlalchemy import text
+from app.core.database import engine
+from app.crud import event_crud
+from app.models import EventStatus
+from app.utils.explain import Explain, top_plan
+
+pytestmark = [pytest.mark.anyio, pytest.mark.benchmark]
+
+BENCH_SEARCH_EVENTS = int(os.getenv("BENCH_SEARCH_EVENTS", "1000000"))
+# Median latency a search page may take on the seeded table
+BUDGET_MS = float(os.getenv("BENCH_SEARCH_BUDGET_MS", "500"))
+PAGE_SIZE = 20
+QUERIES = {
+    "word": ("cricket", {}),
+    "phrase": ("jazz festival", {}),
+    "typo": ("Crikcet final", {}),
+    "substring": ("tartu", {}),
+    "filtered": ("cloud summit", {"status": EventStatus.PUBLISHED}),
+}
+
+
+@pytest.fixture(autouse=True)
+def requires_pg_trgm(database):
+    with database.connect() as conn:
+        if not conn.scalar(text("SELECT count(*) FROM pg_opclass WHERE opcname = 'gin_trgm_ops'")):
+            pytest.skip("pg_trgm is not installed")
+
+
+def _indexes(plan) -> set:
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= _indexes(child)
+    return found
+
+
+async def test_search_uses_the_gin_indexes_at_scale(async_db, seed_events):
+    seed_events(BENCH_SEARCH_EVENTS)
+    with engine.connect() as conn:
+        for name, (q, filters) in QUERIES.items():
+            plan = top_plan(conn.scalar(Explain(event_crud.query_search(q, **filters).limit(PAGE_SIZE))))
+            used = _indexes(plan)
+            assert used & {"ix_events_search_vector", "ix_events_title_trgm", "ix_events_location_trgm"}, f"{name} used {used}"
+
+    for name, (q, filters) in QUERIES.items():
+        timings = []
+        for _ in range(5):
+            began = time.perf_counter()
+            await event_crud.search_events(async_db, q, limit=PAGE_SIZE, **filters)
+            timings.append((time.perf_counter() - began) * 1000)
+        median = statistics.median(timings)
+        print(f"\n{name} ({q!r}) over {BENCH_SEARCH_EVENTS} events: {median:.1f}ms")
+        assert median < BUDGET_MS
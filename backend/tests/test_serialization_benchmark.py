@@ -0,0 +1,48 @@
+"""List serialization through the ORM and Pydantic against the column-row fast path."""
+import json
+import statistics
+import time
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from app.crud import event_crud
+from app.models import Event
+from app.schemas.event_schema import EventResponse, EventSort
+from app.utils.json_encoding import dumps
+
+pytestmark = [pytest.mark.anyio, pytest.mark.benchmark]
+
+SIZES = (100, 1000, 10000)
+REPEATS = 5
+
+
+async def _orm_and_pydantic(db, limit: int) -> bytes:
+    # What response_model=List[EventResponse] did: ORM entities, validation, then encoding
+    events = await event_crud.paginate(db, select(Event), 0, limit, None, EventSort.ID)
+    return json.dumps(jsonable_encoder([EventResponse.model_validate(event) for event in events])).encode()
+
+
+async def _fast_path(db, limit: int) -> bytes:
+    return dumps(await event_crud.get_event_rows(db, select(Event), 0, limit, None, EventSort.ID))
+
+
+async def _median_ms(db, render, limit: int) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        # Start every run from an empty identity map
+        db.expunge_all()
+        began = time.perf_counter()
+        body = await render(db, limit)
+        timings.append((time.perf_counter() - began) * 1000)
+    assert len(json.loads(body)) == limit
+    return statistics.median(timings)
+
+
+async def test_fast_path_beats_orm_and_pydantic(async_db, seed_events):
+    seed_events(max(SIZES))
+    for size in SIZES:
+        orm = await _median_ms(async_db, _orm_and_pydantic, size)
+        fast = await _median_ms(async_db, _fast_path, size)
+        print(f"\n{size} rows: ORM + Pydantic {orm:.1f}ms, fast path {fast:.1f}ms ({orm / fast:.1f}x)")
+        if size >= 1000:
+            assert fast < orm
@@ -0,0 +1,84 @@
+import gzip
+import os
+import brotli
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from app.core.precompress import precompress
+from app.core.static_files import IMMUTABLE_CACHE_CONTROL, CachedStaticFiles
+
+pytestmark = pytest.mark.anyio
+
+CSS = b"body { margin: 0; padding: 0; }\n" * 200
+POSTER_KEY = "ab" * 32 + "-640w.webp"
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "app.css").write_bytes(CSS)
+    (tmp_path / POSTER_KEY).write_bytes(b"RIFF....WEBP")
+    return tmp_path
+
+
+def _client(directory, **options):
+    app = Starlette(routes=[Mount("/static", CachedStaticFiles(directory=directory, max_age=600, **options))])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_cache_headers_and_revalidation(static_dir):
+    async with _client(static_dir) as client:
+        poster = await client.get(f"/static/{POSTER_KEY}")
+        assert poster.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+        css = await client.get("/static/app.css", headers={"Accept-Encoding": "identity"})
+        assert css.headers["Cache-Control"] == "public, max-age=600"
+        assert css.headers["Vary"] == "Accept-Encoding"
+        assert css.content == CSS
+
+        again = await client.get("/static/app.css", headers={"If-None-Match": css.headers["ETag"], "Accept-Encoding": "identity"})
+        assert again.status_code == 304
+
+        part = await client.get("/static/app.css", headers={"Range": "bytes=0-3", "Accept-Encoding": "identity"})
+        assert part.status_code == 206
+        assert part.content == CSS[:4]
+
+
+async def test_precompressed_siblings_are_served_to_clients_that_accept_them(static_dir):
+    assert precompress(static_dir) == 2
+
+    async with _client(static_dir) as client:
+        for accept, encoding in (("gzip, deflate, br", "br"), ("gzip", "gzip"), ("identity", None)):
+            response = await client.get("/static/app.css", headers={"Accept-Encoding": accept})
+            assert response.headers.get("Content-Encoding") == encoding
+            # httpx decodes br and gzip, so the body always comes back as the original
+            assert response.content == CSS
+            if encoding:
+                assert int(response.headers["Content-Length"]) < len(CSS)
+
+
+async def test_accel_redirect_leaves_the_bytes_to_the_proxy(static_dir):
+    async with _client(static_dir, accel_redirect_prefix="/internal/uploads/") as client:
+        response = await client.get(f"/static/{POSTER_KEY}")
+    assert response.status_code == 200
+    assert response.headers["X-Accel-Redirect"] == f"/internal/uploads/{POSTER_KEY}"
+    assert response.content == b""
+
+
+def test_precompress_skips_binaries_incompressible_and_up_to_date_files(static_dir):
+    (static_dir / "tiny.js").write_bytes(b"x")
+    assert precompress(static_dir) == 2
+    assert gzip.decompress((static_dir / "app.css.gz").read_bytes()) == CSS
+    assert brotli.decompress((static_dir / "app.css.br").read_bytes()) == CSS
+    # Compressing would not shrink it, and posters are not text
+    assert not (static_dir / "tiny.js.gz").exists()
+    assert not (static_dir / f"{POSTER_KEY}.gz").exists()
+
+    assert precompress(static_dir) == 0
+
+    # An edited source is compressed again
+    (static_dir / "app.css").write_bytes(CSS + CSS)
+    stat = (static_dir / "app.css.gz").stat()
+    os.utime(static_dir / "app.css", (stat.st_atime + 10, stat.st_mtime + 10))
+    assert precompress(static_dir) == 2
+    assert gzip.decompress((static_dir / "app.css.gz").read_bytes()) == CSS + CSS
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import pytest
+from sqlalchemy import func, select
+from app.core.database import AsyncSessionLocal
+from app.crud import event_crud, ticket_crud
+from app.models import TicketInventory
+from app.schemas.event_schema import EventUpdate, TicketTierCreate, TicketTier
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_tier(event_id, tier, capacity):
+    async with AsyncSessionLocal() as db:
+        try:
+            return await ticket_crud.create_ticket(db, event_id, TicketTierCreate(tier=tier, price=10, capacity=capacity))
+        except ticket_crud.TierCapacityError:
+            return None
+
+
+async def test_concurrent_tier_creation_stays_within_capacity(async_client, db, make_event):
+    event = make_event(capacity=100)
+    created = await asyncio.gather(*(
+        _create_tier(event.id, tier, 60) for tier in (TicketTier.GA, TicketTier.VIP, TicketTier.PA)
+    ))
+    assert sum(tier is not None for tier in created) == 1
+    assert db.scalar(select(func.sum(TicketInventory.capacity)).where(TicketInventory.event_id == event.id)) == 60
+
+
+async def test_tier_route_rejects_duplicates_and_overallocation(async_client, make_event):
+    event = make_event(capacity=100)
+    url = f"/events/{event.id}/tickets"
+    assert (await async_client.post(url, json={"tier": "GA", "price": 10, "capacity": 80})).status_code == 201
+    assert (await async_client.post(url, json={"tier": "GA", "price": 10, "capacity": 5})).status_code == 409
+    assert (await async_client.post(url, json={"tier": "VIP", "price": 10, "capacity": 30})).status_code == 400
+    assert (await async_client.post("/events/999999/tickets", json={"tier": "GA", "price": 10, "capacity": 1})).status_code == 404
+
+
+async def test_capacity_cannot_drop_below_tier_total(async_client, make_event):
+    event, other = make_event(capacity=100), make_event(capacity=100)
+    await _create_tier(event.id, TicketTier.GA, 70)
+
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(event_crud.CapacityError):
+            await event_crud.update_event(session, event.id, EventUpdate(capacity=50))
+        assert (await event_crud.update_event(session, event.id, EventUpdate(capacity=70))).capacity == 70
+    response = await async_client.put(f"/events/{event.id}", data={"event_data": json.dumps({"capacity": 10})})
+    assert response.status_code == 400
+
+    response = await async_client.patch("/events/batch", json={"ids": [event.id, other.id], "changes": {"capacity": 60}})
+    assert response.json() == {"updated_ids": [other.id], "skipped_ids": [event.id]}